@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+"""
+쿼리 실행 계획 점검 스크립트
+
+임시 SQLite 데이터베이스에 샘플 데이터를 넣고 모든 라우터 엔드포인트를 호출하면서
+실행된 SELECT/UPDATE/DELETE 문을 수집한 뒤, 각 문에 EXPLAIN QUERY PLAN을 실행해
+인덱스 없이 테이블 전체를 읽는 단계(SCAN <table>)를 표시합니다.
+인덱스를 추가/변경하거나 새 쿼리를 작성한 뒤 회귀 확인용으로 사용합니다.
+
+    python audit_query_plans.py                 # 결과 출력
+    python audit_query_plans.py --json out.json # 결과를 JSON으로 저장
+    python audit_query_plans.py --strict        # 전체 스캔이 있으면 종료 코드 1
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+from collections import OrderedDict
+
+# 현재 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# 설정 모듈이 import 되기 전에 임시 데이터베이스로 전환
+_TMP_DIR = tempfile.mkdtemp(prefix="audit_query_plans_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP_DIR, 'audit.db')}"
+os.environ["UPLOAD_DIR"] = os.path.join(_TMP_DIR, "uploads")
+
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from database import engine
+from benchmarks.bench_enhanced_dashboard import seed
+import main
+
+# 경로 파라미터 샘플 값 (시드 데이터 기준)
+SAMPLE_PATH_PARAMS = {
+    "project_id": "1",
+    "project_name": "프로젝트0001",
+    "task_id": "1",
+    "report_id": "1",
+    "week": "2024-W10",
+    "assignee_name": "담당자01",
+    "job_id": "0",
+}
+
+# 응답이 끝나지 않는 스트리밍(SSE) 경로는 호출하지 않음
+SKIP_PATHS = {"/changes/stream"}
+
+# 경로만으로는 실행되지 않는 필터/정렬 조합
+EXTRA_REQUESTS = [
+    ("GET", "/detailed-tasks/?project=프로젝트0001"),
+    ("GET", "/detailed-tasks/?assignee=담당자01"),
+    ("GET", "/detailed-tasks/?current_status=completed"),
+    ("GET", "/detailed-tasks/?has_risk=true"),
+    ("GET", "/detailed-tasks/?planned_start_date=2024-01-01&planned_end_date=2024-03-31"),
+    ("GET", "/detailed-tasks/?stage=개발"),
+    ("GET", "/weekly-reports/?project=프로젝트0001"),
+    ("GET", "/weekly-reports/?week=2024-W10"),
+    ("GET", "/weekly-reports/?start_week=2024-W05&end_week=2024-W10"),
+    ("GET", "/export/detailed-tasks.csv?assignee=담당자01"),
+    ("GET", "/export/weekly-reports.csv?week=2024-W10"),
+    ("GET", "/wbs-tasks/1?depth=2"),
+    ("GET", "/wbs-tasks/1?from=2024-02-01&to=2024-02-14"),
+    ("PUT", "/detailed-tasks/2", {"progress_rate": 50}),
+    ("PUT", "/weekly-reports/2", {"issues_risks": "점검"}),
+]
+
+_SCAN_PATTERN = re.compile(r"^SCAN (\w+)(.*)$")
+_AUDITED_PREFIXES = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+
+def collect_statements(client: TestClient):
+    """모든 엔드포인트를 호출하면서 실행된 SQL 문과 첫 번째 파라미터, 호출 경로를 수집합니다.
+
+    (statements, 5xx 응답 경로 목록)을 반환합니다.
+    """
+    statements = OrderedDict()
+    errors = []
+    current = {"route": None}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(_AUDITED_PREFIXES):
+            return
+        if statement.lstrip().upper().startswith("SELECT") and "sqlite_master" in statement:
+            return
+        if statement not in statements:
+            params = parameters[0] if executemany and parameters else parameters
+            statements[statement] = {"params": params, "routes": []}
+        if current["route"] not in statements[statement]["routes"]:
+            statements[statement]["routes"].append(current["route"])
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+
+    requests = []
+    for route in main.app.routes:
+        if isinstance(route, APIRoute) and "GET" in route.methods and route.path not in SKIP_PATHS:
+            path = route.path
+            for name, value in SAMPLE_PATH_PARAMS.items():
+                path = path.replace("{" + name + "}", value)
+            if "{" not in path:
+                requests.append(("GET", path))
+    requests.extend(EXTRA_REQUESTS)
+
+    try:
+        for request in requests:
+            method, path = request[0], request[1]
+            current["route"] = f"{method} {path}"
+            if method == "GET":
+                response = client.get(path)
+            else:
+                response = client.request(method, path, json=request[2])
+            if response.status_code >= 500:
+                errors.append(f"{current['route']} → {response.status_code}")
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return statements, errors
+
+
+def explain(statements):
+    """각 SQL 문의 실행 계획을 조회하고 전체 테이블 스캔 단계를 표시합니다."""
+    results = []
+    with engine.connect() as conn:
+        for statement, info in statements.items():
+            raw = conn.connection.driver_connection
+            params = info["params"] if info["params"] is not None else ()
+            try:
+                plan = [row[3] for row in raw.execute(f"EXPLAIN QUERY PLAN {statement}", params).fetchall()]
+            except Exception as e:
+                plan = [f"(실행 계획 조회 실패: {e})"]
+
+            # 재귀 CTE 작업 테이블 (MATERIALIZE/CO-ROUTINE 단계에 이름이 나옴)
+            cte_names = {step.split()[1] for step in plan if step.startswith(("MATERIALIZE ", "CO-ROUTINE "))}
+            full_scans = []
+            for step in plan:
+                match = _SCAN_PATTERN.match(step.strip())
+                # anon_* 는 서브쿼리/CTE 결과를 읽는 단계이므로 제외
+                if (
+                    match
+                    and "INDEX" not in match.group(2)
+                    and not match.group(1).startswith("anon_")
+                    and match.group(1) not in cte_names
+                    and step.strip() != "SCAN CONSTANT ROW"  # FROM 없는 SELECT
+                ):
+                    full_scans.append(match.group(1))
+
+            results.append(
+                {
+                    "statement": " ".join(statement.split()),
+                    "routes": info["routes"],
+                    "plan": plan,
+                    "full_scans": full_scans,
+                }
+            )
+    return results
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="라우터 쿼리 실행 계획 점검")
+    parser.add_argument("--tasks", type=int, default=5000, help="시드 상세 업무 수")
+    parser.add_argument("--json", dest="json_path", help="결과 JSON 저장 경로")
+    parser.add_argument("--strict", action="store_true", help="전체 테이블 스캔이 있으면 종료 코드 1")
+    args = parser.parse_args()
+
+    print(f"🗄️ 임시 데이터베이스: {_TMP_DIR}")
+    seed(engine, args.tasks)
+    with engine.begin() as conn:
+        # 실제 운영 DB와 비슷한 선택도로 계획을 세우도록 통계 수집
+        conn.execute(text("ANALYZE"))
+
+    # 엔드포인트 자체 오류는 점검을 멈추지 않고 경로만 기록
+    client = TestClient(main.app, raise_server_exceptions=False)
+    statements, errors = collect_statements(client)
+    results = explain(statements)
+    flagged = [result for result in results if result["full_scans"]]
+
+    print(f"\n🔍 점검한 쿼리: {len(results)}개, 전체 스캔 포함: {len(flagged)}개\n")
+    for result in flagged:
+        print(f"⚠️  SCAN {', '.join(sorted(set(result['full_scans'])))}")
+        print(f"   경로: {', '.join(result['routes'])}")
+        print(f"   SQL : {result['statement'][:300]}")
+        for step in result["plan"]:
+            print(f"         {step}")
+        print()
+
+    if errors:
+        print("❗ 서버 오류로 끝난 요청 (해당 경로의 쿼리는 일부만 점검됨):")
+        for error in errors:
+            print(f"   {error}")
+        print()
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2, default=str)
+        print(f"📄 결과 저장: {args.json_path}")
+
+    return not (args.strict and flagged)
+
+
+if __name__ == "__main__":
+    success = main_cli()
+    sys.exit(0 if success else 1)
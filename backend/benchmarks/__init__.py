@@ -0,0 +1,6 @@
+"""
+성능 벤치마크 모음
+
+각 스크립트는 backend 디렉토리에서 모듈로 실행합니다.
+    python -m benchmarks.bench_enhanced_dashboard
+"""
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+
+"""
+전체 엔드포인트 부하 벤치마크
+
+합성 데이터(benchmarks.dataset)를 채운 SQLite 파일에 대해 모든 GET 라우터 엔드포인트를
+프로세스 내 ASGI 클라이언트로 반복 호출하고, 엔드포인트별로
+p50/p95/p99 응답 시간, 요청당 SQL 쿼리 수, 최대 RSS를 측정합니다.
+결과를 JSON으로 저장해 두면 --compare로 커밋 간 회귀를 비교할 수 있습니다.
+
+    python -m benchmarks.bench_endpoints --preset small --json base.json
+    python -m benchmarks.bench_endpoints --db /tmp/large.db --json head.json --compare base.json --max-regression 20
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import re
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 경로 파라미터 샘플 값 (benchmarks.dataset 데이터 기준)
+SAMPLE_PATH_PARAMS = {
+    "project_id": "1",
+    "project_name": "프로젝트0001",
+    "task_id": "1",
+    "report_id": "1",
+    "week": "2024-W10",
+    "assignee_name": "담당자01",
+    "job_id": "0",
+}
+
+# 응답이 끝나지 않는 스트리밍(SSE) 경로는 측정하지 않음
+SKIP_PATHS = {"/changes/stream"}
+
+# 경로만으로는 실행되지 않는 필터/페이지 조합
+EXTRA_PATHS = [
+    "/detailed-tasks/?project=프로젝트0001",
+    "/detailed-tasks/?assignee=담당자01",
+    "/detailed-tasks/?has_risk=true&limit=500",
+    "/detailed-tasks/?offset=5000&limit=100",
+    "/detailed-tasks/?cursor=<offset 5000>&limit=100",
+    "/weekly-reports/?week=2024-W10",
+    "/weekly-reports/?start_week=2024-W05&end_week=2024-W10",
+    "/wbs-tasks/1?from=2024-02-01&to=2024-02-14",
+]
+
+# 커서 자리표시가 있는 경로 → 커서를 얻을 경로 (응답의 X-Next-Cursor로 같은 깊이의 키셋 페이지를 측정)
+# 표시/비교용 경로는 자리표시 그대로 두어 데이터가 바뀌어도 실행 간 비교가 가능하도록 함
+CURSOR_SOURCES = {
+    "/detailed-tasks/?cursor=<offset 5000>&limit=100": "/detailed-tasks/?offset=4900&limit=100",
+}
+
+
+def _percentile(values, ratio):
+    values = sorted(values)
+    return values[min(len(values) - 1, max(int(round(len(values) * ratio)) - 1, 0))]
+
+
+def _reset_peak_rss() -> bool:
+    """리눅스에서 프로세스 최대 RSS(VmHWM)를 현재 값으로 초기화합니다. 지원하지 않으면 False."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # 초기화할 수 없는 환경에서는 프로세스 시작 이후 최대값 (macOS는 바이트, 리눅스는 KiB)
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def collect_paths(app, only=None, skip=None):
+    """앱의 GET 라우트를 샘플 파라미터로 채운 호출 경로 목록을 만듭니다."""
+    from fastapi.routing import APIRoute
+
+    paths = []
+    for route in app.routes:
+        if isinstance(route, APIRoute) and "GET" in route.methods and route.path not in SKIP_PATHS:
+            path = route.path
+            for name, value in SAMPLE_PATH_PARAMS.items():
+                path = path.replace("{" + name + "}", value)
+            if "{" not in path:
+                paths.append(path)
+    paths.extend(EXTRA_PATHS)
+
+    if only:
+        paths = [path for path in paths if re.search(only, path)]
+    if skip:
+        paths = [path for path in paths if not re.search(skip, path)]
+    return paths
+
+
+async def measure(client, path: str, requests: int, concurrency: int):
+    """한 경로를 requests번 호출하고 응답 시간/쿼리 수/상태 코드를 수집합니다."""
+    from database import QueryStats, current_query_stats
+
+    from services.pagination import NEXT_CURSOR_HEADER
+
+    request_path = path
+    if path in CURSOR_SOURCES:
+        cursor = (await client.get(CURSOR_SOURCES[path])).headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            print(f"⚠️ 커서를 얻을 수 없어 첫 페이지를 측정합니다 (데이터 부족): {path}")
+        request_path = re.sub(r"cursor=<[^>]*>&?", f"cursor={cursor}&" if cursor else "", path)
+
+    timings, queries, statuses = [], [], {}
+
+    async def call():
+        # 태스크마다 별도 컨텍스트 → 동시 요청끼리 쿼리 수가 섞이지 않음
+        stats = QueryStats(path)
+        current_query_stats.set(stats)
+        started = time.perf_counter()
+        response = await client.get(request_path)
+        await response.aread()
+        timings.append((time.perf_counter() - started) * 1000)
+        queries.append(stats.count)
+        status = str(response.status_code)
+        statuses[status] = statuses.get(status, 0) + 1
+
+    await call()  # 워밍업 (캐시/첫 연결 비용 제외)
+    timings.clear()
+    queries.clear()
+    statuses.clear()
+
+    rss_resettable = _reset_peak_rss()
+    remaining = requests
+    while remaining > 0:
+        batch = min(concurrency, remaining)
+        await asyncio.gather(*(asyncio.create_task(call()) for _ in range(batch)))
+        remaining -= batch
+
+    return {
+        "path": path,
+        "status": statuses,
+        "requests": len(timings),
+        "p50_ms": round(_percentile(timings, 0.50), 2),
+        "p95_ms": round(_percentile(timings, 0.95), 2),
+        "p99_ms": round(_percentile(timings, 0.99), 2),
+        "max_ms": round(max(timings), 2),
+        "queries": max(queries),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "peak_rss_per_endpoint": rss_resettable,
+    }
+
+
+async def run_all(app, paths, requests: int, concurrency: int, on_result):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        results = []
+        for path in paths:
+            result = await measure(client, path, requests, concurrency)
+            on_result(result)
+            results.append(result)
+        return results
+
+
+def compare(results, meta: dict, baseline_path: str, max_regression: float) -> bool:
+    """기준 결과와 비교해 p95 증가율/쿼리 수 증가를 출력합니다. 허용치를 넘는 회귀가 있으면 False."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline_report = json.load(f)
+    baseline = {result["path"]: result for result in baseline_report["results"]}
+
+    print(f"\n📊 기준 결과와 비교: {baseline_path} ({baseline_report['meta'].get('git_revision')} → {meta['git_revision']})")
+    for key in ("db", "preset", "dataset", "requests", "concurrency"):
+        if baseline_report["meta"].get(key) != meta.get(key):
+            print(f"⚠️ 측정 조건이 다릅니다: {key} {baseline_report['meta'].get(key)} → {meta.get(key)}")
+    passed = True
+    for result in results:
+        before = baseline.get(result["path"])
+        if before is None:
+            continue
+        p95_change = (result["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 if before["p95_ms"] else 0.0
+        query_change = result["queries"] - before["queries"]
+        regressed = (max_regression is not None and p95_change > max_regression) or query_change > 0
+        if regressed:
+            passed = False
+        if regressed or abs(p95_change) >= 10 or query_change:
+            marker = "❗" if regressed else "  "
+            print(
+                f"{marker} {result['path'][:60]:<60} p95 {before['p95_ms']:>8.1f} → {result['p95_ms']:>8.1f}ms "
+                f"({p95_change:+.0f}%), queries {before['queries']} → {result['queries']}"
+            )
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전체 엔드포인트 응답 시간/쿼리 수/메모리 벤치마크")
+    parser.add_argument("--db", help="benchmarks.dataset으로 만든 SQLite 파일 (없으면 --preset으로 임시 생성)")
+    parser.add_argument("--preset", default="small", choices=["small", "medium", "large"], help="임시 데이터 규모 (small/medium/large)")
+    parser.add_argument("--requests", type=int, default=20, help="엔드포인트별 측정 요청 수")
+    parser.add_argument("--concurrency", type=int, default=1, help="동시에 보낼 요청 수")
+    parser.add_argument("--only", help="이 정규식과 일치하는 경로만 측정")
+    parser.add_argument("--skip", help="이 정규식과 일치하는 경로 제외")
+    parser.add_argument("--json", dest="json_path", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 기준 결과 JSON")
+    parser.add_argument("--max-regression", type=float, help="p95 허용 증가율(%%), 초과 또는 쿼리 수 증가 시 종료 코드 1")
+    args = parser.parse_args()
+
+    # 앱 모듈이 import 되기 전에 벤치마크용 데이터베이스로 전환
+    tmp_dir = tempfile.mkdtemp(prefix="bench_endpoints_")
+    db_path = args.db or os.path.join(tmp_dir, "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["UPLOAD_DIR"] = os.path.join(tmp_dir, "uploads")
+    os.environ["QUERY_METRICS"] = "false"  # 요청별 집계는 아래에서 직접 설치 (미들웨어 컨텍스트와 분리)
+
+    from benchmarks import dataset
+    from database import configure_query_metrics, engine
+
+    dataset_counts = None
+    if not args.db:
+        print(f"🏗️ 임시 데이터 생성 ({args.preset}): {db_path}")
+        dataset_counts = dataset.generate(engine, **dataset.PRESETS[args.preset])
+
+    configure_query_metrics(engine, 0)
+    import main as app_main
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # 요청마다 남는 접근 로그 제외
+
+    paths = collect_paths(app_main.app, args.only, args.skip)
+    print(f"\n{'path':<60} {'p50':>8} {'p95':>8} {'p99':>8} {'queries':>8} {'rss(MB)':>8}  status")
+
+    def print_result(result):
+        print(
+            f"{result['path'][:60]:<60} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} "
+            f"{result['queries']:>8} {result['peak_rss_mb']:>8.1f}  {result['status']}"
+        )
+
+    results = asyncio.run(run_all(app_main.app, paths, args.requests, args.concurrency, print_result))
+
+    meta = {
+        "git_revision": _git_revision(),
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "db": args.db,
+        "preset": None if args.db else args.preset,
+        "dataset": dataset_counts,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+    }
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n📄 결과 저장: {args.json_path}")
+
+    if args.compare:
+        return compare(results, meta, args.compare, args.max_regression)
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+"""
+/summary/enhanced-dashboard 벤치마크
+
+행 수를 늘려가며 엔드포인트 한 번 호출에 필요한 쿼리 수와 응답 시간을 측정합니다.
+운영 데이터베이스를 건드리지 않도록 임시 SQLite 파일에서 실행합니다.
+
+    python -m benchmarks.bench_enhanced_dashboard --sizes 1000 10000 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 설정 모듈이 import 되기 전에 임시 데이터베이스로 전환
+_TMP_DIR = tempfile.mkdtemp(prefix="bench_dashboard_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_TMP_DIR, 'default.db')}")
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import ProjectDB, WeeklyReportDB, DetailedTaskDB, TaskStatus
+from routers.summary import get_enhanced_dashboard
+from services import report_completion
+
+STATUSES = list(TaskStatus)
+ASSIGNEES = [f"담당자{i:02d}" for i in range(40)]
+STAGES = ["요구사항분석", "설계", "개발", "테스트", "배포"]
+
+
+def seed(engine, task_count: int, project_count: int = 50, seed_value: int = 42):
+    """벤치마크용 프로젝트/보고서/상세 업무 데이터를 일괄 삽입합니다."""
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+
+    with engine.begin() as conn:
+        conn.execute(
+            insert(ProjectDB),
+            [{"name": f"프로젝트{i:04d}", "created_at": now, "updated_at": now} for i in range(project_count)],
+        )
+
+        reports = []
+        for project_id in range(1, project_count + 1):
+            for week in range(1, 21):
+                reports.append(
+                    report_completion.classify_row(
+                        {
+                            "project_id": project_id,
+                            "week": f"2024-W{week:02d}",
+                            "stage": rng.choice(STAGES),
+                            "this_week_work": "작업 내용",
+                            "next_week_plan": rng.choice(["계속 진행", "마무리 예정", None]),
+                            "issues_risks": rng.choice(["", "일정 지연", None]),
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                    )
+                )
+        conn.execute(insert(WeeklyReportDB), reports)
+
+        batch = []
+        for i in range(task_count):
+            progress = rng.choice([0.0, 0.0, 25.0, 50.0, 75.0, 100.0])
+            batch.append(
+                {
+                    "project_id": rng.randint(1, project_count),
+                    "stage": rng.choice(STAGES),
+                    "task_item": f"업무 {i}",
+                    "assignee": rng.choice(ASSIGNEES + [None, ""]),
+                    "current_status": rng.choice(STATUSES),
+                    "has_risk": rng.random() < 0.1,
+                    "progress_rate": progress,
+                    "created_at": now,
+                    "updated_at": now - timedelta(seconds=i),
+                }
+            )
+            if len(batch) >= 10000:
+                conn.execute(insert(DetailedTaskDB), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(DetailedTaskDB), batch)
+
+
+def run(task_count: int, repeat: int):
+    db_path = os.path.join(_TMP_DIR, f"dashboard_{task_count}.db")
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    seed(engine, task_count)
+
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    Session = sessionmaker(bind=engine, autoflush=False)
+    timings = []
+    for _ in range(repeat):
+        statements.clear()
+        with Session() as db:
+            started = time.perf_counter()
+            get_enhanced_dashboard(db=db)
+            timings.append((time.perf_counter() - started) * 1000)
+
+    engine.dispose()
+    os.remove(db_path)
+
+    timings.sort()
+    return {
+        "rows": task_count,
+        "queries": len(statements),
+        "min_ms": timings[0],
+        "median_ms": timings[len(timings) // 2],
+        "max_ms": timings[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="enhanced-dashboard 쿼리 수/응답 시간 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000, 200000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'queries':>8} {'min(ms)':>10} {'median(ms)':>11} {'max(ms)':>10}")
+    for size in args.sizes:
+        result = run(size, args.repeat)
+        print(
+            f"{result['rows']:>10} {result['queries']:>8} {result['min_ms']:>10.1f} "
+            f"{result['median_ms']:>11.1f} {result['max_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
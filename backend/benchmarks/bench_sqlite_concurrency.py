@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+"""
+SQLite 동시성 벤치마크 (기본 설정 vs 성능 프로필)
+
+gunicorn 워커처럼 여러 프로세스가 같은 SQLite 파일에 동시에 읽기/쓰기를 할 때
+초당 처리량과 "database is locked" 오류 수를 비교합니다.
+성능 프로필은 database.sqlite_pragmas()가 Settings(SQLITE_*)에서 만드는 PRAGMA 목록을 그대로 사용합니다.
+
+    python -m benchmarks.bench_sqlite_concurrency --workers 1 4 8 --seconds 5
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 설정 모듈이 import 되기 전에 임시 데이터베이스로 전환
+_TMP_DIR = tempfile.mkdtemp(prefix="bench_sqlite_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_TMP_DIR, 'default.db')}")
+
+from sqlalchemy import create_engine, desc, func, insert, select, update
+from sqlalchemy.exc import OperationalError
+
+from database import Base, configure_sqlite_engine, sqlite_pragmas
+from models import DetailedTaskDB, TaskStatus
+from benchmarks.bench_enhanced_dashboard import seed
+
+STATUSES = list(TaskStatus)
+
+
+def make_engine(db_path: str, pragmas):
+    # 기존 database.py와 같은 방식으로 엔진을 만들고 프로필만 다르게 적용
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    configure_sqlite_engine(engine, pragmas)
+    return engine
+
+
+def worker(db_path: str, pragmas, seconds: float, write_ratio: float, task_count: int, seed_value: int, queue):
+    """제한 시간 동안 읽기(목록/집계)와 쓰기(생성/수정)를 섞어 실행하고 결과를 queue로 보냅니다."""
+    rng = random.Random(seed_value)
+    engine = make_engine(db_path, pragmas)
+    stats = {"reads": 0, "writes": 0, "locked": 0, "read_ms": [], "write_ms": []}
+
+    deadline = time.perf_counter() + seconds
+    sequence = 0
+    while time.perf_counter() < deadline:
+        is_write = rng.random() < write_ratio
+        started = time.perf_counter()
+        try:
+            if is_write:
+                sequence += 1
+                now = datetime.utcnow()
+                with engine.begin() as conn:
+                    conn.execute(
+                        insert(DetailedTaskDB),
+                        {
+                            "project_id": rng.randint(1, 50),
+                            "task_item": f"bench-{seed_value}-{sequence}",
+                            "current_status": rng.choice(STATUSES),
+                            "progress_rate": 0.0,
+                            "created_at": now,
+                            "updated_at": now,
+                        },
+                    )
+                    conn.execute(
+                        update(DetailedTaskDB)
+                        .where(DetailedTaskDB.id == rng.randint(1, task_count))
+                        .values(progress_rate=rng.choice([0.0, 50.0, 100.0]), updated_at=now)
+                    )
+                stats["writes"] += 1
+                stats["write_ms"].append((time.perf_counter() - started) * 1000)
+            else:
+                with engine.connect() as conn:
+                    # 상세 업무 목록 첫 페이지 + 상태별 집계 (대시보드 유형)
+                    conn.execute(
+                        select(DetailedTaskDB.id, DetailedTaskDB.task_item)
+                        .order_by(desc(DetailedTaskDB.updated_at), desc(DetailedTaskDB.id))
+                        .limit(50)
+                    ).all()
+                    conn.execute(
+                        select(DetailedTaskDB.current_status, func.count())
+                        .where(DetailedTaskDB.project_id == rng.randint(1, 50))
+                        .group_by(DetailedTaskDB.current_status)
+                    ).all()
+                stats["reads"] += 1
+                stats["read_ms"].append((time.perf_counter() - started) * 1000)
+        except OperationalError as e:
+            if "locked" in str(e) or "busy" in str(e):
+                stats["locked"] += 1
+            else:
+                raise
+
+    engine.dispose()
+    queue.put(stats)
+
+
+def _percentile(values, ratio):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * ratio))]
+
+
+def run(profile: str, workers: int, seconds: float, write_ratio: float, task_count: int):
+    db_path = os.path.join(_TMP_DIR, f"{profile}_{workers}.db")
+    pragmas = sqlite_pragmas() if profile == "tuned" else []
+
+    # 프로필마다 새 파일 사용 (journal_mode=WAL은 파일에 유지되므로)
+    engine = make_engine(db_path, pragmas)
+    Base.metadata.create_all(bind=engine)
+    seed(engine, task_count)
+    engine.dispose()
+
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(db_path, pragmas, seconds, write_ratio, task_count, index, queue))
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    results = [queue.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+    read_ms = [value for result in results for value in result["read_ms"]]
+    write_ms = [value for result in results for value in result["write_ms"]]
+    reads = sum(result["reads"] for result in results)
+    writes = sum(result["writes"] for result in results)
+    return {
+        "profile": profile,
+        "workers": workers,
+        "reads_per_sec": round(reads / seconds, 1),
+        "writes_per_sec": round(writes / seconds, 1),
+        "locked_errors": sum(result["locked"] for result in results),
+        "read_p95_ms": round(_percentile(read_ms, 0.95), 2),
+        "write_p95_ms": round(_percentile(write_ms, 0.95), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite 기본 설정 vs 성능 프로필 동시성 벤치마크")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seconds", type=float, default=5.0, help="워커 구성별 측정 시간")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="전체 작업 중 쓰기 비율")
+    parser.add_argument("--tasks", type=int, default=20000, help="시드 상세 업무 수")
+    parser.add_argument("--json", dest="json_path", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    print(f"PRAGMA 프로필: {sqlite_pragmas() or '(SQLITE_TUNING=false)'}\n")
+    print(
+        f"{'profile':>8} {'workers':>8} {'reads/s':>10} {'writes/s':>10} {'locked':>8} "
+        f"{'read p95':>10} {'write p95':>10}"
+    )
+
+    results = []
+    for workers in args.workers:
+        for profile in ("stock", "tuned"):
+            result = run(profile, workers, args.seconds, args.write_ratio, args.tasks)
+            results.append(result)
+            print(
+                f"{result['profile']:>8} {result['workers']:>8} {result['reads_per_sec']:>10.1f} "
+                f"{result['writes_per_sec']:>10.1f} {result['locked_errors']:>8} "
+                f"{result['read_p95_ms']:>8.2f}ms {result['write_p95_ms']:>8.2f}ms"
+            )
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
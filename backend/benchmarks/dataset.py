@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+
+"""
+운영 규모 합성 데이터 생성기
+
+프로젝트 / 주간 보고서 / 상세 업무 / WBS 트리 / 보고서-업무 연결을 지정한 규모로 일괄 삽입합니다.
+같은 seed와 규모면 항상 같은 데이터가 만들어지므로 커밋 간 벤치마크 비교에 사용할 수 있습니다.
+
+    python -m benchmarks.dataset --db /tmp/large.db --preset large
+    python -m benchmarks.dataset --db /tmp/custom.db --projects 3000 --tasks 1000000 --wbs-depth 6
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 설정 모듈이 import 되기 전에 임시 데이터베이스로 전환 (운영 DB 보호)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='dataset_'), 'default.db')}")
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, configure_sqlite_engine, sqlite_pragmas
+from models import (
+    DetailedTaskDB,
+    ProjectDB,
+    ProjectPriority,
+    ProjectStatus,
+    TaskStatus,
+    WBSTaskDB,
+    WeeklyReportDB,
+    weekly_report_detailed_tasks,
+)
+from services import name_index, report_completion, rollups, search_index, wbs_schedule, wbs_tree
+
+# 규모 프리셋 (projects: 프로젝트 수, tasks: 상세 업무 수, weeks: 프로젝트당 보고 주차 수,
+# wbs_depth/wbs_fanout: 프로젝트당 WBS 트리 깊이/자식 수, links_per_task: 업무당 연결 보고서 수)
+PRESETS: Dict[str, Dict[str, int]] = {
+    "small": {"projects": 50, "tasks": 10_000, "weeks": 20, "wbs_depth": 3, "wbs_fanout": 3, "links_per_task": 1},
+    "medium": {"projects": 500, "tasks": 200_000, "weeks": 30, "wbs_depth": 4, "wbs_fanout": 4, "links_per_task": 2},
+    "large": {"projects": 3000, "tasks": 2_000_000, "weeks": 52, "wbs_depth": 5, "wbs_fanout": 4, "links_per_task": 3},
+}
+
+INSERT_BATCH_SIZE = 10_000
+STATUSES = list(TaskStatus)
+PROJECT_STATUSES = list(ProjectStatus)
+PRIORITIES = list(ProjectPriority)
+ASSIGNEES = [f"담당자{i:02d}" for i in range(200)]
+STAGES = ["요구사항분석", "설계", "개발", "테스트", "배포"]
+BASE_DATE = date(2024, 1, 1)
+
+
+def _batches(rows: Iterator[dict], size: int = INSERT_BATCH_SIZE) -> Iterator[List[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert(conn, target, rows: Iterator[dict]) -> int:
+    count = 0
+    for batch in _batches(rows):
+        conn.execute(insert(target), batch)
+        count += len(batch)
+    return count
+
+
+def _project_rows(rng, count: int, now: datetime):
+    for i in range(count):
+        start = BASE_DATE + timedelta(days=rng.randint(0, 180))
+        yield {
+            "id": i + 1,
+            "name": f"프로젝트{i:04d}",
+            "description": "합성 데이터",
+            "start_date": start,
+            "end_date": start + timedelta(days=rng.randint(60, 540)),
+            "status": rng.choice(PROJECT_STATUSES),
+            "priority": rng.choice(PRIORITIES),
+            "manager": rng.choice(ASSIGNEES),
+            "created_at": now,
+            "updated_at": now,
+        }
+
+
+def _report_rows(rng, project_count: int, weeks: int, now: datetime):
+    report_id = 0
+    for project_id in range(1, project_count + 1):
+        for week in range(1, weeks + 1):
+            report_id += 1
+            yield report_completion.classify_row(
+                {
+                    "id": report_id,
+                    "project_id": project_id,
+                    "week": f"2024-W{week:02d}",
+                    "stage": STAGES[(week - 1) * len(STAGES) // weeks],  # (프로젝트, 주차, 단계) 중복 없음
+                    "this_week_work": f"{week}주차 작업 내용",
+                    "next_week_plan": rng.choice(["계속 진행", "마무리 예정", None]),
+                    "issues_risks": rng.choice(["", "일정 지연", "인력 부족", None]),
+                    "created_at": now,
+                    "updated_at": now - timedelta(minutes=report_id),
+                }
+            )
+
+
+def _task_rows(rng, task_count: int, project_count: int, now: datetime):
+    for i in range(task_count):
+        status = rng.choice(STATUSES)
+        planned_end = BASE_DATE + timedelta(days=rng.randint(0, 720))
+        yield {
+            "id": i + 1,
+            "project_id": rng.randint(1, project_count),
+            "stage": rng.choice(STAGES),
+            "task_item": f"업무 {i}",
+            "assignee": rng.choice(ASSIGNEES + [None]),
+            "current_status": status,
+            "has_risk": rng.random() < 0.1,
+            "description": rng.choice(["", "요청사항 정리", "외부 연동 확인 필요", None]),
+            "planned_end_date": planned_end,
+            "actual_end_date": planned_end if status == TaskStatus.COMPLETED else None,
+            "progress_rate": 100.0 if status == TaskStatus.COMPLETED else rng.choice([0.0, 25.0, 50.0, 75.0]),
+            "created_at": now,
+            "updated_at": now - timedelta(seconds=i),
+        }
+
+
+def _link_rows(rng, task_count: int, weeks: int, links_per_task: int, task_projects: List[int]):
+    """업무마다 같은 프로젝트의 보고서 links_per_task개를 연결합니다."""
+    for task_id in range(1, task_count + 1):
+        project_id = task_projects[task_id - 1]
+        for week in rng.sample(range(1, weeks + 1), min(links_per_task, weeks)):
+            yield {"weekly_report_id": (project_id - 1) * weeks + week, "detailed_task_id": task_id}
+
+
+def _wbs_rows(rng, project_count: int, depth: int, fanout: int):
+    """프로젝트마다 깊이 depth, 노드당 자식 fanout개인 WBS 트리를 만듭니다. (부모가 먼저 삽입되도록 너비 우선)"""
+    wbs_id = 0
+    for project_id in range(1, project_count + 1):
+        level = [(None, BASE_DATE, BASE_DATE + timedelta(days=fanout**depth * 7))]
+        for level_index in range(depth):
+            next_level = []
+            for parent_id, parent_start, parent_end in level:
+                span = max((parent_end - parent_start).days // fanout, 1)
+                for order in range(fanout):
+                    wbs_id += 1
+                    start = parent_start + timedelta(days=span * order)
+                    end = start + timedelta(days=span - 1)
+                    yield {
+                        "id": wbs_id,
+                        "text": f"WBS {level_index + 1}-{order + 1}",
+                        "start_date": start,
+                        "end_date": end,
+                        "progress": rng.choice([0, 20, 50, 80, 100]),
+                        "sort_order": order,
+                        "project_id": project_id,
+                        "parent_id": parent_id,
+                    }
+                    next_level.append((wbs_id, start, end))
+            level = next_level
+
+
+def generate(
+    engine,
+    projects: int,
+    tasks: int,
+    weeks: int = 20,
+    wbs_depth: int = 3,
+    wbs_fanout: int = 3,
+    links_per_task: int = 1,
+    seed_value: int = 42,
+) -> Dict[str, int]:
+    """빈 데이터베이스에 합성 데이터를 삽입하고 집계 테이블을 다시 계산합니다. 테이블별 삽입 행 수를 반환합니다."""
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+    Base.metadata.create_all(bind=engine)
+
+    counts = {}
+    with engine.begin() as conn:
+        counts["projects"] = _insert(conn, ProjectDB, _project_rows(rng, projects, now))
+        counts["weekly_reports"] = _insert(conn, WeeklyReportDB, _report_rows(rng, projects, weeks, now))
+
+        task_projects = []
+
+        def tasks_with_projects():
+            for row in _task_rows(rng, tasks, projects, now):
+                task_projects.append(row["project_id"])
+                yield row
+
+        counts["detailed_tasks"] = _insert(conn, DetailedTaskDB, tasks_with_projects())
+        counts["weekly_report_detailed_tasks"] = _insert(
+            conn,
+            weekly_report_detailed_tasks,
+            _link_rows(rng, tasks, weeks, links_per_task, task_projects),
+        )
+        counts["wbs_tasks"] = _insert(conn, WBSTaskDB, _wbs_rows(rng, projects, wbs_depth, wbs_fanout))
+
+    Session = sessionmaker(bind=engine, autoflush=False)
+    with Session() as db:
+        rollups.rebuild_all(db)
+        wbs_tree.rebuild_paths(db)
+        db.commit()
+        wbs_schedule.backfill_missing_rollups(db)
+
+    # 전문 검색 색인/이름 사전은 삽입 후 한 번에 생성 (행마다 트리거로 색인하는 것보다 빠름)
+    search_index.ensure_search_index(engine)
+    name_index.ensure_name_index(engine)
+
+    with engine.begin() as conn:
+        # 실제 운영 DB와 비슷한 선택도로 계획을 세우도록 통계 수집
+        conn.execute(text("ANALYZE"))
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="운영 규모 합성 데이터 생성")
+    parser.add_argument("--db", required=True, help="생성할 SQLite 파일 경로 (비어 있어야 함)")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--projects", type=int)
+    parser.add_argument("--tasks", type=int)
+    parser.add_argument("--weeks", type=int)
+    parser.add_argument("--wbs-depth", type=int)
+    parser.add_argument("--wbs-fanout", type=int)
+    parser.add_argument("--links-per-task", type=int)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if os.path.exists(args.db):
+        print(f"❌ 이미 존재하는 파일입니다: {args.db}")
+        return False
+
+    spec = dict(PRESETS[args.preset])
+    for key in spec:
+        value = getattr(args, key)
+        if value is not None:
+            spec[key] = value
+
+    engine = create_engine(f"sqlite:///{args.db}", connect_args={"check_same_thread": False})
+    configure_sqlite_engine(engine, sqlite_pragmas())
+
+    print(f"🏗️ 합성 데이터 생성 중: {spec}")
+    started = time.perf_counter()
+    counts = generate(engine, seed_value=args.seed, **spec)
+    engine.dispose()
+
+    for table, count in counts.items():
+        print(f"   {table:<30} {count:>12,}")
+    print(f"✅ 완료 ({time.perf_counter() - started:.1f}s): {args.db}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -26,10 +26,38 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     RELOAD: bool = False  # 개발 중에만 True
 
+    # 🗄️ SQLite 성능 프로필 (모든 연결에 PRAGMA 적용, SQLite가 아니면 무시)
+    SQLITE_TUNING: bool = True
+    SQLITE_JOURNAL_MODE: str = "WAL"  # 읽기와 쓰기가 서로를 막지 않도록
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # WAL에서는 NORMAL로도 손상 없이 안전 (전원 장애 시 마지막 커밋만 유실 가능)
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # 잠금 대기 시간 (즉시 "database is locked" 방지)
+    SQLITE_CACHE_SIZE_KB: int = 65536  # 연결당 페이지 캐시 크기
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # 메모리 맵 I/O 크기 (0이면 사용 안 함)
+    SQLITE_TEMP_STORE: str = "MEMORY"  # 정렬/임시 테이블을 메모리에서 처리
+
+    # 📊 SQL 계측 (요청별 쿼리 수/DB 시간 응답 헤더 + 느린 쿼리 로그)
+    QUERY_METRICS: bool = False  # False면 엔진 이벤트를 등록하지 않아 오버헤드 없음
+    SLOW_QUERY_MS: float = 200.0  # 이 시간 이상 걸린 SQL을 경로와 함께 경고 로그로 기록 (0이면 기록 안 함)
+
+    # 📈 Prometheus 지표 (/metrics), 멀티 워커 합산은 PROMETHEUS_MULTIPROC_DIR 환경 변수로 활성화
+    METRICS_ENABLED: bool = True
+
+    # 🗂️ 프로젝트명 ↔ ID 캐시 (프로세스별 LRU, 워커 간 일관성은 cache_versions 버전으로 확인)
+    PROJECT_CACHE_SIZE: int = 4096  # 최대 항목 수 (0이면 캐시 사용 안 함)
+
+    # 📡 변경 이벤트 스트림 (/changes/stream, 워커마다 change_log 테이블을 주기적으로 읽어 전달)
+    CHANGE_FEED_POLL_SECONDS: float = 1.0  # change_log 확인 주기
+    CHANGE_FEED_HEARTBEAT_SECONDS: float = 15.0  # 이벤트가 없을 때 연결 유지용 주석 전송 주기
+    CHANGE_LOG_RETENTION_HOURS: int = 72  # 이보다 오래된 변경 기록은 정리 (재접속 시 이어받을 수 있는 범위)
+
     # 📁 파일 업로드 설정
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
     UPLOAD_DIR: str = "./uploads"
 
+    # 📥 일괄 등록 백그라운드 작업 설정
+    IMPORT_WORKERS: int = 2  # 프로세스당 작업 스레드 수
+    IMPORT_JOB_STALE_SECONDS: int = 600  # 이 시간 동안 갱신이 없으면 중단된 작업으로 보고 재시작
+
     # 🔐 보안 설정
     SECRET_KEY: Optional[str] = None
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
@@ -75,6 +103,7 @@ class Settings(BaseSettings):
 ├── 서버: {self.HOST}:{self.PORT}
 ├── CORS Origins: {len(self.cors_origins_list)}개
 ├── 로그 레벨: {self.LOG_LEVEL}
+├── SQL 계측: {f'켜짐 (느린 쿼리 ≥ {self.SLOW_QUERY_MS:g}ms)' if self.QUERY_METRICS else '꺼짐'}
 └── Workers: {self.WORKERS}개
         """.strip()
 
@@ -125,6 +154,7 @@ class DevelopmentSettings(Settings):
     DEBUG: bool = True
     RELOAD: bool = True
     LOG_LEVEL: str = "DEBUG"
+    QUERY_METRICS: bool = True
     CORS_ORIGINS: str = "http://localhost:3000,http://127.0.0.1:3000,http://localhost:3001"
 
 
@@ -1,7 +1,11 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
+import logging
+import time
+from contextvars import ContextVar
+from typing import List, Optional
 
 # 🎉 설정 분리: 하드코딩 제거!
 from config import settings
@@ -11,10 +15,97 @@ SQLALCHEMY_DATABASE_URL = settings.effective_database_url
 
 print(f"📍 데이터베이스 연결: {SQLALCHEMY_DATABASE_URL}")
 
+
+def sqlite_pragmas(config=settings) -> List[str]:
+    """설정의 SQLite 성능 프로필을 PRAGMA 문 목록으로 변환합니다."""
+    if not config.SQLITE_TUNING:
+        return []
+    return [
+        f"PRAGMA journal_mode={config.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA busy_timeout={int(config.SQLITE_BUSY_TIMEOUT_MS)}",
+        f"PRAGMA cache_size={-int(config.SQLITE_CACHE_SIZE_KB)}",  # 음수는 KiB 단위
+        f"PRAGMA mmap_size={int(config.SQLITE_MMAP_SIZE)}",
+        f"PRAGMA temp_store={config.SQLITE_TEMP_STORE}",
+    ]
+
+
+def configure_sqlite_engine(target_engine, pragmas: List[str]):
+    """엔진이 새 연결을 열 때마다 PRAGMA를 적용합니다. (PRAGMA는 연결 단위 설정)"""
+    if target_engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    # 메모리 DB는 WAL을 쓸 수 없으므로 journal_mode 제외
+    if target_engine.url.database in (None, "", ":memory:"):
+        pragmas = [pragma for pragma in pragmas if "journal_mode" not in pragma]
+
+    @event.listens_for(target_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("slow_query")
+
+
+class QueryStats:
+    """요청 하나에서 실행된 SQL 문 수와 누적 실행 시간"""
+
+    __slots__ = ("route", "count", "duration_ms")
+
+    def __init__(self, route: str = "-"):
+        self.route = route
+        self.count = 0
+        self.duration_ms = 0.0
+
+
+# 현재 요청의 집계 대상 (요청 밖에서 실행되는 쿼리는 None)
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def configure_query_metrics(target_engine, slow_query_ms: float):
+    """SQL 실행 전후 이벤트로 요청별 쿼리 수/시간을 집계하고 느린 쿼리를 기록합니다.
+
+    비활성화 시에는 이 함수를 호출하지 않으므로 이벤트 자체가 등록되지 않습니다.
+    """
+
+    @event.listens_for(target_engine, "before_cursor_execute")
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(target_engine, "after_cursor_execute")
+    def record_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_started_at"].pop()) * 1000
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.duration_ms += elapsed_ms
+
+        if slow_query_ms and elapsed_ms >= slow_query_ms:
+            slow_query_logger.warning(
+                f"🐢 느린 쿼리 {elapsed_ms:.1f}ms [{stats.route if stats else '-'}] {' '.join(statement.split())[:1000]}"
+            )
+
+    @event.listens_for(target_engine, "handle_error")
+    def discard_query_timer(exception_context):
+        # 실패한 문은 after_cursor_execute가 호출되지 않으므로 시작 시각만 정리
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started_at"):
+            conn.info["query_started_at"].pop()
+
+
 # SQLite 연결을 위한 엔진 생성
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {}
 )
+configure_sqlite_engine(engine, sqlite_pragmas())
+if settings.QUERY_METRICS:
+    configure_query_metrics(engine, settings.SLOW_QUERY_MS)
 
 # 세션 로컬 클래스 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -41,4 +132,61 @@ def create_tables():
     import models
 
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
+    create_missing_indexes()
     print("✅ 데이터베이스 테이블 준비 완료")
+
+
+def add_missing_columns():
+    """모델에 새로 추가된 nullable 컬럼을 기존 테이블에 추가합니다. (create_all은 컬럼을 추가하지 않음)
+
+    값 채우기(backfill)는 컬럼을 사용하는 쪽에서 처리합니다.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            if not column.nullable:
+                print(f"⚠️ NOT NULL 컬럼은 자동 추가할 수 없습니다: {table.name}.{column.name}")
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            with engine.begin() as conn:
+                conn.exec_driver_sql(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}')
+            print(f"🔧 컬럼 추가: {table.name}.{column.name}")
+
+
+class UniqueIndexCreationError(RuntimeError):
+    """기존 데이터의 중복 때문에 unique 인덱스를 만들 수 없음 (중복 방지가 인덱스에만 의존하므로 시작 중단)"""
+
+
+def create_missing_indexes():
+    """모델에 선언된 인덱스 중 기존 DB에 없는 것을 생성합니다.
+
+    create_all은 이미 존재하는 테이블에 새로 추가된 인덱스를 만들지 않으므로 따로 확인합니다.
+    생성/수정 API의 중복 방지는 unique 인덱스에 의존하므로, unique 인덱스를 만들 수 없으면
+    UniqueIndexCreationError를 발생시킵니다. (중복 행을 정리한 뒤 다시 시작해야 함)
+    """
+    existing_tables = set(inspect(engine).get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue  # 새 테이블은 create_all이 인덱스와 함께 생성
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except Exception as e:
+                reason = getattr(e, "orig", e)
+                if index.unique:
+                    # 기존 데이터에 중복이 있으면 unique 인덱스를 만들 수 없음 → 중복 방지 없이 실행되지 않도록 중단
+                    columns = ", ".join(column.name for column in index.columns)
+                    message = (
+                        f"unique 인덱스 {index.name}를 만들 수 없습니다 ({reason}). "
+                        f"{table.name} 테이블의 ({columns}) 중복 행을 정리한 뒤 다시 시작하세요."
+                    )
+                    logger.error(f"❌ {message}")
+                    raise UniqueIndexCreationError(message) from e
+                logger.warning(f"⚠️ 인덱스 생성 실패: {index.name} ({reason})")
@@ -0,0 +1,12 @@
+"""
+Gunicorn 설정 훅 (startup.sh 프로덕션 모드에서 --config로 사용)
+
+서버 옵션은 startup.sh 명령행 인자로 지정하고, 여기에는 워커 수명 주기 훅만 둡니다.
+"""
+
+
+def child_exit(server, worker):
+    # 종료된(--max-requests 재시작 포함) 워커의 처리 중 요청 게이지를 /metrics 합산에서 제외
+    from services import metrics
+
+    metrics.mark_process_dead(worker.pid)
@@ -17,6 +17,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from database import engine, Base, SQLALCHEMY_DATABASE_URL
 from models import ProjectDB, WeeklyReportDB, WBSTaskDB # WBSTaskDB 추가
+from services import report_completion
 
 
 def clear_database():
@@ -161,6 +162,7 @@ def insert_sample_data():
         ]
 
         for report in sample_reports:
+            report_completion.classify(report)
             db.add(report)
         db.commit()
 
@@ -1,17 +1,34 @@
 import os
 import logging
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import inspect
-from database import engine, Base
+from sqlalchemy import inspect, text
+from database import engine, Base, SessionLocal, add_missing_columns, create_missing_indexes, UniqueIndexCreationError
 
 # 🎉 설정 분리: 하드코딩 제거!
 from config import settings, validate_settings
 
-from routers import tasks, summary, export, projects, detailed_tasks, wbs_tasks
+from routers import tasks, summary, export, projects, detailed_tasks, wbs_tasks, import_jobs, changes, search
+from services import import_jobs as import_job_service
+from services import name_index, report_completion, search_index, wbs_schedule, wbs_tree
+from services import metrics
+from services.query_metrics import QueryMetricsMiddleware, DB_QUERIES_HEADER, SERVER_TIMING_HEADER
 
 # 모델들을 import해야 Base.metadata에 등록됨
-from models import ProjectDB, WeeklyReportDB, DetailedTaskDB, WBSTaskDB
+from models import (
+    ProjectDB,
+    WeeklyReportDB,
+    DetailedTaskDB,
+    WBSTaskDB,
+    WBSDependencyDB,
+    ProjectRollupDB,
+    WeekRollupDB,
+    AssigneeRollupDB,
+    ImportJobDB,
+    CacheVersionDB,
+    ChangeLogDB,
+    NameTermDB,
+)
 
 # 🔧 동적 로깅 설정 (환경 변수 기반)
 logging.basicConfig(
@@ -36,7 +53,21 @@ def ensure_database_initialized():
         inspector = inspect(engine)
         existing_tables = inspector.get_table_names()
 
-        required_tables = ["projects", "weekly_reports", "detailed_tasks", "weekly_report_detailed_tasks", "wbs_tasks"]
+        required_tables = [
+            "projects",
+            "weekly_reports",
+            "detailed_tasks",
+            "weekly_report_detailed_tasks",
+            "wbs_tasks",
+            "project_rollups",
+            "week_rollups",
+            "assignee_rollups",
+            "import_jobs",
+            "wbs_dependencies",
+            "cache_versions",
+            "change_log",
+            "name_terms",
+        ]
         missing_tables = [table for table in required_tables if table not in existing_tables]
 
         if missing_tables:
@@ -52,6 +83,37 @@ def ensure_database_initialized():
         else:
             logger.info(f"모든 테이블이 존재합니다: {existing_tables}")
 
+        # 기존 테이블에 새로 선언된 컬럼/인덱스 생성
+        add_missing_columns()
+        create_missing_indexes()
+
+        # 보고서/상세 업무 전문 검색 색인 (없던 색인은 기존 데이터로 채움)
+        indexed = search_index.ensure_search_index(engine)
+        if indexed:
+            logger.info(f"🔍 전문 검색 색인을 만들었습니다: {indexed}")
+        # 프로젝트명/매니저/단계/담당자 부분 일치 필터·자동 완성용 이름 사전 (trigram)
+        if name_index.ensure_name_index(engine):
+            logger.info("🔤 이름 사전(trigram 색인)을 만들었습니다")
+
+        # WBS 구체화 경로가 비어 있는 기존 데이터 채우기
+        db = SessionLocal()
+        try:
+            filled = wbs_tree.backfill_missing_paths(db)
+            if filled:
+                logger.info(f"🌳 WBS 경로 {filled}개를 채웠습니다")
+            rolled_up = wbs_schedule.backfill_missing_rollups(db)
+            if rolled_up:
+                logger.info(f"📅 WBS 일정 집계 {rolled_up}개를 채웠습니다")
+            # 완료 여부가 비어 있는 기존 보고서 판정 (해당 프로젝트 완료율 집계도 다시 계산)
+            classified = report_completion.backfill_missing_flags(db)
+            if classified:
+                logger.info(f"🏁 보고서 완료 여부 {classified}건을 판정했습니다")
+        finally:
+            db.close()
+
+    except UniqueIndexCreationError:
+        # 중복 방지 인덱스 없이 실행하면 중복 데이터가 계속 쌓이므로 시작하지 않음
+        raise
     except Exception as e:
         logger.error(f"데이터베이스 초기화 확인 중 오류: {e}")
         # 그래도 테이블 생성 시도
@@ -81,8 +143,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified", DB_QUERIES_HEADER, SERVER_TIMING_HEADER],  # 커서 페이지네이션, SQL 계측
 )
 
+# 📈 Prometheus 지표 (경로별 응답 시간, 처리 중 요청 수, 커넥션 풀 대기 시간)
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+    metrics.instrument_pool(engine)
+
+# 📊 요청별 SQL 쿼리 수/DB 시간 응답 헤더 (QUERY_METRICS=true일 때만)
+if settings.QUERY_METRICS:
+    app.add_middleware(QueryMetricsMiddleware)
+
 # 라우터 등록
 app.include_router(projects.router)
 app.include_router(tasks.router)  # /weekly-reports
@@ -90,6 +162,28 @@ app.include_router(detailed_tasks.router)  # /detailed-tasks
 app.include_router(wbs_tasks.router) # /wbs-tasks
 app.include_router(summary.router)  # /summary
 app.include_router(export.router)  # /export
+app.include_router(import_jobs.router)  # /import-jobs
+app.include_router(changes.router)  # /changes
+app.include_router(search.router)  # /search
+
+
+@app.on_event("startup")
+def resume_import_jobs():
+    """이전 프로세스에서 끝나지 않은 일괄 등록 작업을 다시 실행합니다."""
+    db = SessionLocal()
+    try:
+        resumed = import_job_service.recover_jobs(db)
+        if resumed:
+            logger.info(f"📥 일괄 등록 작업 {resumed}개를 다시 실행합니다")
+    except Exception as e:
+        logger.error(f"일괄 등록 작업 복구 중 오류: {e}")
+    finally:
+        db.close()
+
+
+@app.on_event("shutdown")
+def stop_import_jobs():
+    import_job_service.shutdown()
 
 
 @app.get("/")
@@ -104,11 +198,29 @@ def read_root():
 
 
 @app.get("/health")
-def health_check():
-    """서버 상태 확인"""
+def health_check(response: Response):
+    """서버 상태 확인 (DB에 실제로 질의해 연결 상태를 확인)"""
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        database_status = "connected"
+    except Exception as e:
+        logger.error(f"헬스 체크 DB 연결 실패: {e}")
+        database_status = "disconnected"
+        response.status_code = 503
+
     return {
-        "status": "healthy",
+        "status": "healthy" if database_status == "connected" else "unhealthy",
         "environment": "development" if settings.is_development else "production",
-        "database": "connected",
+        "database": database_status,
         "cors_origins": len(settings.cors_origins_list),
     }
+
+
+if settings.METRICS_ENABLED:
+
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics():
+        """Prometheus 수집용 지표 (gunicorn 멀티 워커 모드에서는 모든 워커 합산)"""
+        content, content_type = metrics.render_latest()
+        return Response(content=content, headers={"Content-Type": content_type})
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Enum, ForeignKey, Float, Boolean, Table
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Enum, ForeignKey, Float, Boolean, Table, Index
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel, Field, field_serializer, model_serializer
 from datetime import date, datetime
@@ -14,6 +14,8 @@ weekly_report_detailed_tasks = Table(
     Base.metadata,
     Column("weekly_report_id", Integer, ForeignKey("weekly_reports.id"), primary_key=True),
     Column("detailed_task_id", Integer, ForeignKey("detailed_tasks.id"), primary_key=True),
+    # 기본키는 (weekly_report_id, detailed_task_id) 순서이므로 업무 기준 조회용 인덱스 추가
+    Index("ix_weekly_report_detailed_tasks_task", "detailed_task_id"),
 )
 
 
@@ -62,12 +64,13 @@ class WeeklyReportDB(Base):
     __tablename__ = "weekly_reports"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False, index=True)  # ✨ Integer FK
-    week = Column(String(10), nullable=False, index=True)  # YYYY-WXX 형식
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)  # ✨ Integer FK
+    week = Column(String(10), nullable=False)  # YYYY-WXX 형식
     stage = Column(String(100), nullable=False)
     this_week_work = Column(Text, nullable=False)
     next_week_plan = Column(Text)
     issues_risks = Column(Text)
+    is_completion = Column(Boolean)  # 완료 여부 (쓰기 시점에 services/report_completion으로 판정)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -77,6 +80,15 @@ class WeeklyReportDB(Base):
         "DetailedTaskDB", secondary=weekly_report_detailed_tasks, back_populates="weekly_reports"
     )
 
+    # 인덱스 (project_id, week 단일 인덱스는 아래 복합 인덱스의 선두 컬럼으로 대체)
+    __table_args__ = (
+        # 프로젝트-주차-단계 중복 방지 (생성/수정 시 사전 조회 대신 제약 위반으로 처리)
+        Index("uq_weekly_reports_project_week_stage", "project_id", "week", "stage", unique=True),
+        # 목록 API 정렬/키셋 페이지네이션 (week DESC, updated_at DESC, id DESC), 주차별 집계
+        Index("ix_weekly_reports_week_updated_id", "week", "updated_at", "id"),
+        Index("ix_weekly_reports_project_week_updated_id", "project_id", "week", "updated_at", "id"),
+    )
+
     # ✨ API 호환성은 라우터 레벨에서 처리 (property 제거)
 
 
@@ -94,7 +106,7 @@ class DetailedTaskDB(Base):
     __tablename__ = "detailed_tasks"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False, index=True)  # ✨ Integer FK
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)  # ✨ Integer FK
     stage = Column(String(100))  # 단계/단위
     task_item = Column(String(255), nullable=False)  # 업무 항목
     assignee = Column(String(100))  # 담당자
@@ -113,9 +125,147 @@ class DetailedTaskDB(Base):
         "WeeklyReportDB", secondary=weekly_report_detailed_tasks, back_populates="detailed_tasks"
     )
 
+    # 인덱스 (project_id 단일 인덱스는 아래 복합 인덱스의 선두 컬럼으로 대체)
+    __table_args__ = (
+        # 프로젝트-업무항목 중복 방지 (생성/수정 시 사전 조회 대신 제약 위반으로 처리)
+        Index("uq_detailed_tasks_project_task_item", "project_id", "task_item", unique=True),
+        # 목록 API 정렬/키셋 페이지네이션 (updated_at DESC, id DESC) 및 필터별 동일 정렬
+        Index("ix_detailed_tasks_updated_id", "updated_at", "id"),
+        Index("ix_detailed_tasks_project_updated_id", "project_id", "updated_at", "id"),
+        Index("ix_detailed_tasks_assignee_updated_id", "assignee", "updated_at", "id"),
+        Index("ix_detailed_tasks_status_updated_id", "current_status", "updated_at", "id"),
+        Index("ix_detailed_tasks_risk_updated_id", "has_risk", "updated_at", "id"),
+        # 종료예정일 범위 필터
+        Index("ix_detailed_tasks_planned_end_date", "planned_end_date"),
+    )
+
     # ✨ API 호환성은 라우터 레벨에서 처리 (property 제거)
 
 
+# --------------------------------------------------------------------------
+# 집계(rollup) 테이블: 쓰기 시점에 갱신되어 요약 API가 원본 행을 다시 읽지 않도록 함
+# --------------------------------------------------------------------------
+
+
+# 프로젝트별 주간 보고서 집계
+class ProjectRollupDB(Base):
+    __tablename__ = "project_rollups"
+
+    project_id = Column(Integer, ForeignKey("projects.id"), primary_key=True)
+    report_count = Column(Integer, default=0)
+    week_count = Column(Integer, default=0)
+    latest_week = Column(String(10))
+    issue_count = Column(Integer, default=0)  # 이슈/리스크가 기재된 보고서 수
+    completed_report_count = Column(Integer, default=0)  # 완료 보고서 수 (is_completion)
+    stages = Column(Text)  # JSON 배열
+    weeks = Column(Text)  # JSON 배열 (최신순)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+# 주차별 주간 보고서 집계
+class WeekRollupDB(Base):
+    __tablename__ = "week_rollups"
+
+    week = Column(String(10), primary_key=True)
+    report_count = Column(Integer, default=0)
+    project_count = Column(Integer, default=0)
+    projects_with_issues = Column(Integer, default=0)
+    issue_count = Column(Integer, default=0)
+    project_list = Column(Text)  # JSON 배열 (프로젝트명순)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+# 담당자별 상세 업무 집계
+class AssigneeRollupDB(Base):
+    __tablename__ = "assignee_rollups"
+
+    assignee = Column(String(100), primary_key=True)
+    task_count = Column(Integer, default=0)
+    completed_count = Column(Integer, default=0)
+    in_progress_count = Column(Integer, default=0)
+    not_started_count = Column(Integer, default=0)
+    risk_count = Column(Integer, default=0)
+    avg_progress = Column(Float, default=0.0)
+    project_breakdown = Column(Text)  # JSON 객체 {프로젝트명: 통계}
+    status_breakdown = Column(Text)  # JSON 객체 {상태: 개수}
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+# 파일 일괄 등록 백그라운드 작업
+class ImportJobDB(Base):
+    __tablename__ = "import_jobs"
+
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    kind = Column(String(30), nullable=False)  # detailed_tasks / projects
+    status = Column(String(20), nullable=False, default="queued", index=True)  # queued/running/completed/failed
+    filename = Column(String(255))  # 업로드된 원본 파일명
+    file_path = Column(String(500))  # UPLOAD_DIR 아래 저장 경로
+    total_rows = Column(Integer, default=0)
+    processed_rows = Column(Integer, default=0)
+    successful_rows = Column(Integer, default=0)
+    failed_rows = Column(Integer, default=0)
+    failures = Column(Text)  # JSON 배열 (행 단위 실패 사유)
+    resume_row = Column(Integer)  # 마지막으로 커밋된 배치의 마지막 행 번호 (DataFrame index, 재실행 시 다음 행부터)
+    error = Column(Text)  # 작업 전체 실패 사유
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)  # 진행 중 마지막 갱신 시각 (중단된 작업 감지용)
+
+
+class CacheVersionDB(Base):
+    """데이터 묶음별 변경 버전 (services/change_versions.py)
+
+    프로세스 로컬 캐시의 워커 간 무효화와 조회 API의 ETag/Last-Modified 계산에 사용합니다.
+    """
+
+    __tablename__ = "cache_versions"
+
+    key = Column(String(50), primary_key=True)  # 데이터 묶음 이름 (예: projects, weekly_reports, wbs:1)
+    version = Column(Integer, nullable=False, default=0)  # 원본 데이터가 바뀔 때마다 1 증가
+    updated_at = Column(DateTime)  # 마지막으로 버전이 바뀐 시각 (UTC)
+
+
+class ChangeLogDB(Base):
+    """데이터 변경 이벤트 기록 (services/change_feed.py)
+
+    쓰기와 같은 트랜잭션에 기록되며, 각 워커가 id 순으로 읽어 SSE 구독자에게 전달합니다.
+    id는 AUTOINCREMENT라 오래된 행을 지워도 재사용되지 않습니다. (클라이언트의 마지막 이벤트 id 기준)
+    """
+
+    __tablename__ = "change_log"
+
+    id = Column(Integer, primary_key=True)
+    entity = Column(String(30), nullable=False)  # project / weekly_report / detailed_task / wbs_task / wbs_dependency
+    action = Column(String(10), nullable=False)  # created / updated / deleted
+    entity_id = Column(Integer, nullable=False)
+    project_id = Column(Integer)  # 프로젝트 단위 구독 필터용 (프로젝트 자신이면 entity_id와 같음)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # 보관 기간이 지난 행 정리
+        Index("ix_change_log_created_at", "created_at"),
+        {"sqlite_autoincrement": True},
+    )
+
+
+class NameTermDB(Base):
+    """부분 문자열 필터/자동 완성용 이름 사전 (services/name_index.py)
+
+    프로젝트명/매니저/단계/담당자의 서로 다른 값과 참조 행 수를 원본 테이블 트리거로 유지하며,
+    FTS5 trigram 색인(name_terms_fts)이 이 테이블을 원본으로 합니다.
+    """
+
+    __tablename__ = "name_terms"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(20), nullable=False)  # project / manager / stage / assignee
+    value = Column(String(255), nullable=False)
+    refs = Column(Integer, nullable=False, default=0)  # 이 값을 가진 원본 행 수 (0이 되면 삭제)
+
+    __table_args__ = (Index("uq_name_terms_kind_value", "kind", "value", unique=True),)
+
+
 # Pydantic 모델들
 
 
@@ -219,6 +369,7 @@ class WeeklyReportUpdate(BaseModel):
 
 class WeeklyReportResponse(WeeklyReportBase):
     id: int
+    is_completion: bool = False  # 다음 주 계획 기준 완료 여부 (완료율 집계와 같은 기준)
     created_at: datetime
     updated_at: datetime
 
@@ -332,6 +483,14 @@ class WeeklyReportDetailedTasksUpdate(BaseModel):
     detailed_task_ids: List[int] = Field(..., description="연결할 상세 업무 ID 목록")
 
 
+class WeeklyReportLinkSet(WeeklyReportDetailedTasksUpdate):
+    weekly_report_id: int = Field(..., description="주간 보고서 ID")
+
+
+class WeeklyReportLinksBulkUpdate(BaseModel):
+    reports: List[WeeklyReportLinkSet] = Field(..., min_length=1, max_length=1000, description="보고서별 연결할 상세 업무 목록")
+
+
 # --------------------------------------------------------------------------
 # WBS / Gantt Chart Task 모델
 # --------------------------------------------------------------------------
@@ -352,14 +511,57 @@ class WBSTaskDB(Base):
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     parent_id = Column(Integer, ForeignKey("wbs_tasks.id"), nullable=True)
 
+    # 구체화 경로: 최상위부터 자신까지 "정렬키.id/" 구간을 이어 붙인 값 (services/wbs_tree.py에서 유지)
+    # 경로 순 정렬 = 깊이 우선 순서, 하위 트리 = 경로 접두사 범위
+    tree_path = Column(String(1500))
+    tree_depth = Column(Integer)  # 최상위 = 1
+
+    # 일정 집계 (services/wbs_schedule.py에서 유지): 말단은 자신의 값, 상위 태스크는 하위 태스크로부터 집계
+    rollup_start_date = Column(Date)
+    rollup_end_date = Column(Date)
+    rollup_progress = Column(Float)  # 기간(일) 가중 평균 진행률
+    rollup_weight = Column(Integer)  # 하위 말단 태스크 기간(일) 합계
+
     project = relationship("ProjectDB", back_populates="wbs_tasks")
     parent = relationship("WBSTaskDB", remote_side=[id], back_populates="children")
     children = relationship("WBSTaskDB", back_populates="parent", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # 프로젝트별 WBS 목록 (sort_order 정렬)
+        Index("ix_wbs_tasks_project_sort", "project_id", "sort_order"),
+        # 하위 태스크 조회/삭제
+        Index("ix_wbs_tasks_parent", "parent_id"),
+        # 깊이 우선 순서 조회, 하위 트리 범위 조회/삭제
+        Index("ix_wbs_tasks_project_path", "project_id", "tree_path"),
+        # 간트 차트 기간(뷰포트) 조회
+        Index("ix_wbs_tasks_project_dates", "project_id", "start_date", "end_date"),
+    )
+
 # ProjectDB에 wbs_tasks 관계 추가
 ProjectDB.wbs_tasks = relationship("WBSTaskDB", back_populates="project", cascade="all, delete-orphan")
 
 
+# WBS 태스크 선후행 관계 (선행 태스크 종료 + lag_days 후에 후행 태스크 시작, Finish-to-Start)
+class WBSDependencyDB(Base):
+    __tablename__ = "wbs_dependencies"
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    predecessor_id = Column(Integer, ForeignKey("wbs_tasks.id"), nullable=False)
+    successor_id = Column(Integer, ForeignKey("wbs_tasks.id"), nullable=False)
+    lag_days = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("uq_wbs_dependencies_pair", "predecessor_id", "successor_id", unique=True),
+        Index("ix_wbs_dependencies_successor", "successor_id"),
+        Index("ix_wbs_dependencies_project", "project_id"),
+    )
+
+
+ProjectDB.wbs_dependencies = relationship("WBSDependencyDB", cascade="all, delete-orphan")
+
+
 # WBS 태스크 Pydantic 모델
 class WBSTaskBase(BaseModel):
     text: str
@@ -377,7 +579,8 @@ class WBSTaskBase(BaseModel):
 
 
 class WBSTaskCreate(WBSTaskBase):
-    pass
+    # 트리 경로의 고정 폭 정렬키가 숫자 순서대로 정렬되는 범위 (32비트 정수, services/wbs_tree.SORT_KEY_OFFSET)
+    sort_order: Optional[int] = Field(0, ge=-(2**31), lt=2**31)
 
 
 class WBSTaskUpdate(BaseModel):
@@ -388,12 +591,64 @@ class WBSTaskUpdate(BaseModel):
     deliverables: Optional[str] = None
     remarks: Optional[str] = None
     parent_id: Optional[int] = None
-    sort_order: Optional[int] = None
+    sort_order: Optional[int] = Field(None, ge=-(2**31), lt=2**31)
 
 
 class WBSTaskResponse(WBSTaskBase):
     id: int
     children: List['WBSTaskResponse'] = []
+    has_children: Optional[bool] = None  # 깊이 제한 조회에서 잘린 노드도 펼칠 수 있는지 표시
+    rollup_start_date: Optional[date] = None  # 하위 태스크 포함 시작일
+    rollup_end_date: Optional[date] = None  # 하위 태스크 포함 종료일
+    rollup_progress: Optional[float] = None  # 기간 가중 진행률
+
+
+class WBSTaskMove(BaseModel):
+    task_id: int
+    parent_id: Optional[int] = None  # 생략하면 현재 상위 태스크 유지, null이면 최상위
+    after_id: Optional[int] = None  # 이 형제 태스크 바로 뒤에 배치
+    before_id: Optional[int] = None  # 이 형제 태스크 바로 앞에 배치 (둘 다 없으면 맨 뒤)
+
+
+class WBSBulkMoveRequest(BaseModel):
+    moves: List[WBSTaskMove] = Field(..., min_length=1, max_length=1000)
+
+
+class WBSDependencyCreate(BaseModel):
+    predecessor_id: int
+    successor_id: int
+    lag_days: int = Field(0, ge=0)
+
+
+class WBSDependencyResponse(WBSDependencyCreate):
+    id: int
+    project_id: int
+
+    class Config:
+        from_attributes = True
+
+
+class WBSScheduleNode(BaseModel):
+    id: int
+    parent_id: Optional[int] = None
+    start_date: date  # 집계 시작일
+    end_date: date  # 집계 종료일
+    progress: float  # 기간 가중 진행률
+    early_start: date
+    early_finish: date
+    late_start: date
+    late_finish: date
+    slack_days: int  # 총 여유 (프로젝트 종료일을 늦추지 않고 밀릴 수 있는 일수)
+    is_critical: bool
+
+
+class WBSScheduleResponse(BaseModel):
+    project_id: int
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    progress: float = 0.0
+    critical_path: List[int] = []  # 말단 태스크 id (선후행 순서)
+    tasks: List[WBSScheduleNode] = []
 
 # 재귀적 모델을 위한 참조 업데이트
 # WBSTaskResponse.model_rebuild()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+"""
+요약 집계 테이블 재계산 스크립트
+
+project_rollups / week_rollups / assignee_rollups 테이블을 비우고
+주간 보고서와 상세 업무 원본 데이터로부터 다시 계산합니다.
+집계 값이 원본과 어긋났을 때(드리프트) 복구용으로 사용합니다.
+주간 보고서 완료 여부(is_completion)도 현재 키워드 기준으로 다시 판정합니다.
+
+    python rebuild_rollups.py
+"""
+
+import os
+import sys
+
+# 현재 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import SessionLocal, engine, Base, add_missing_columns
+from services import report_completion, rollups
+
+
+def main():
+    print("🔄 요약 집계 테이블 재계산 중...")
+
+    # 집계 테이블이 없으면 생성
+    Base.metadata.create_all(bind=engine)
+    add_missing_columns()
+
+    db = SessionLocal()
+    try:
+        reclassified = report_completion.reclassify_all(db)
+        print(f"🏁 보고서 완료 여부 {reclassified}건을 다시 판정했습니다")
+        result = rollups.rebuild_all(db)
+        print(f"✅ 프로젝트 {result['projects']}개, 주차 {result['weeks']}개, 담당자 {result['assignees']}명 집계 완료")
+        return True
+    except Exception as e:
+        db.rollback()
+        print(f"❌ 집계 재계산 중 오류: {e}")
+        return False
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,151 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional, Set
+
+from database import get_db
+from models import DetailedTaskDB, ProjectDB, ProjectResponse, WeeklyReportDB, WeeklyReportResponse
+from services import change_feed, delta_sync, task_links
+from services.batching import id_chunks
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+# 변경분 동기화(GET /changes)로 현재 값을 돌려줄 수 있는 대상
+SYNC_ENTITIES = (change_feed.PROJECT, change_feed.WEEKLY_REPORT, change_feed.DETAILED_TASK)
+
+
+def parse_entities(entities: Optional[str], allowed) -> Optional[Set[str]]:
+    """콤마로 구분한 대상 목록을 검증합니다. 비어 있으면 None(전체)."""
+    if not entities:
+        return None
+    entity_filter = {entity.strip() for entity in entities.split(",") if entity.strip()}
+    unknown = entity_filter - set(allowed)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 대상입니다: {', '.join(sorted(unknown))}")
+    return entity_filter
+
+
+def _load(db: Session, query, column, ids: List[int]) -> list:
+    rows = []
+    for chunk in id_chunks(ids):
+        rows.extend(query.filter(column.in_(chunk)).all())
+    return rows
+
+
+def _projects(db: Session, ids: List[int]) -> list:
+    return [ProjectResponse.model_validate(project).model_dump() for project in _load(db, db.query(ProjectDB), ProjectDB.id, ids)]
+
+
+def _weekly_reports(db: Session, ids: List[int]) -> list:
+    reports = _load(db, db.query(WeeklyReportDB).options(joinedload(WeeklyReportDB.project_obj)), WeeklyReportDB.id, ids)
+    return [
+        WeeklyReportResponse(
+            id=report.id,
+            project=report.project_obj.name if report.project_obj else "Unknown",
+            week=report.week,
+            stage=report.stage,
+            this_week_work=report.this_week_work,
+            next_week_plan=report.next_week_plan,
+            issues_risks=report.issues_risks,
+            is_completion=bool(report.is_completion),
+            created_at=report.created_at,
+            updated_at=report.updated_at,
+        ).model_dump()
+        for report in reports
+    ]
+
+
+def _detailed_tasks(db: Session, ids: List[int]) -> list:
+    """상세 업무 목록 API(/detailed-tasks/)와 같은 형식 (연결된 주간 보고서 포함)"""
+    tasks = _load(db, db.query(DetailedTaskDB).options(joinedload(DetailedTaskDB.project_obj)), DetailedTaskDB.id, ids)
+    linked_reports = task_links.linked_reports_by_task(db, [task.id for task in tasks])
+    return [
+        {
+            "id": task.id,
+            "project": task.project_obj.name,
+            "stage": task.stage,
+            "task_item": task.task_item,
+            "assignee": task.assignee,
+            "current_status": task.current_status.value,
+            "has_risk": task.has_risk,
+            "description": task.description,
+            "planned_end_date": task.planned_end_date.strftime("%Y-%m-%d") if task.planned_end_date else None,
+            "actual_end_date": task.actual_end_date.strftime("%Y-%m-%d") if task.actual_end_date else None,
+            "progress_rate": task.progress_rate,
+            "created_at": task.created_at.isoformat() if task.created_at else None,
+            "updated_at": task.updated_at.isoformat() if task.updated_at else None,
+            "linked_weekly_reports": linked_reports.get(task.id, []),
+        }
+        for task in tasks
+    ]
+
+
+_LOADERS = {
+    change_feed.PROJECT: _projects,
+    change_feed.WEEKLY_REPORT: _weekly_reports,
+    change_feed.DETAILED_TASK: _detailed_tasks,
+}
+
+
+@router.get("/version")
+def get_change_version(db: Session = Depends(get_db)):
+    """현재 변경 버전을 반환합니다. 전체 목록을 받기 전에 받아 두었다가 GET /changes?since=로 이어받습니다."""
+    return {"version": delta_sync.current_version(db)}
+
+
+@router.get("/")
+def get_changes(
+    since: int = Query(..., ge=0, description="이전 응답(또는 /changes/version)의 version 값"),
+    entities: Optional[str] = Query(None, description="콤마로 구분한 대상 (project, weekly_report, detailed_task)"),
+    project_id: Optional[int] = Query(None, description="이 프로젝트의 변경만 조회"),
+    limit: int = Query(1000, ge=1, le=delta_sync.MAX_CHANGES, description="한 번에 읽을 최대 변경 기록 수"),
+    db: Session = Depends(get_db),
+):
+    """since 버전 이후 바뀐 행(현재 값)과 삭제된 id를 대상별로 반환합니다.
+
+    has_more가 true이면 응답의 version으로 다시 요청합니다.
+    변경 기록 보관 기간이 지났으면 410을 반환하며, 이때는 전체 목록을 다시 조회해야 합니다.
+    """
+    entity_filter = parse_entities(entities, SYNC_ENTITIES) or set(SYNC_ENTITIES)
+    try:
+        version, has_more, changes = delta_sync.collect_changes(db, since, sorted(entity_filter), project_id, limit)
+    except delta_sync.VersionExpiredError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+
+    result = {"version": version, "has_more": has_more}
+    for entity, changed in changes.items():
+        upserted = _LOADERS[entity](db, changed["upserted"])
+        # 조회 시점에 이미 없어진 행은 삭제로 처리
+        missing = set(changed["upserted"]) - {row["id"] for row in upserted}
+        result[entity] = {"upserted": upserted, "deleted": changed["deleted"] + sorted(missing)}
+    return result
+
+
+@router.get("/stream")
+async def stream_changes(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0, description="이 ID 이후의 변경부터 전송 (Last-Event-ID 헤더가 우선)"),
+    entities: Optional[str] = Query(
+        None, description="콤마로 구분한 대상 (project, weekly_report, detailed_task, wbs_task, wbs_dependency)"
+    ),
+    project_id: Optional[int] = Query(None, description="이 프로젝트의 변경만 전송"),
+):
+    """변경 이벤트를 Server-Sent Events로 전송합니다.
+
+    각 이벤트의 id를 기억했다가 재접속 시 Last-Event-ID로 보내면 끊긴 동안의 변경을 이어받습니다.
+    이어받을 수 없으면 `event: reset`이 오며, 이때는 화면 데이터를 다시 조회하면 됩니다.
+    """
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id:
+        try:
+            since = int(last_event_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Last-Event-ID 헤더는 정수여야 합니다.")
+
+    entity_filter = parse_entities(entities, change_feed.ENTITIES)
+
+    return StreamingResponse(
+        change_feed.stream(since, entity_filter, project_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
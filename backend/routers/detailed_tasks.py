@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import or_, desc
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 import pandas as pd
 import io
 import json
+from collections import Counter
 from datetime import datetime, date
 from database import get_db
 from models import (
@@ -16,26 +18,22 @@ from models import (
     DetailedTaskFilter,
     WeeklyReportDB,
     WeeklyReportDetailedTasksUpdate,
+    WeeklyReportLinksBulkUpdate,
     TaskStatus,
     weekly_report_detailed_tasks,
-    ProjectDB,
 )
+from services import rollups, detailed_task_import, pagination, task_links, project_cache, change_feed, batching
+from routers import import_jobs
 
 router = APIRouter(prefix="/detailed-tasks", tags=["detailed-tasks"])
 
 
-def get_project_by_name(db: Session, project_name: str) -> ProjectDB:
-    """프로젝트명으로 프로젝트 객체를 조회합니다."""
-    project = db.query(ProjectDB).filter(ProjectDB.name == project_name).first()
-    if not project:
-        raise HTTPException(status_code=404, detail=f"프로젝트 '{project_name}'를 찾을 수 없습니다.")
-    return project
-
-
 def get_project_id_by_name(db: Session, project_name: str) -> int:
-    """프로젝트명으로 프로젝트 ID를 조회합니다."""
-    project = get_project_by_name(db, project_name)
-    return project.id
+    """프로젝트명으로 프로젝트 ID를 조회합니다. (프로젝트 캐시 사용)"""
+    project_id = project_cache.project_id_for_name(db, project_name)
+    if project_id is None:
+        raise HTTPException(status_code=404, detail=f"프로젝트 '{project_name}'를 찾을 수 없습니다.")
+    return project_id
 
 
 # 상세 업무 생성
@@ -46,17 +44,6 @@ def create_detailed_task(task: DetailedTaskCreate, db: Session = Depends(get_db)
     # 프로젝트명을 project_id로 변환
     project_id = get_project_id_by_name(db, task.project)
 
-    # 동일한 프로젝트-업무항목 조합이 이미 존재하는지 확인
-    existing_task = (
-        db.query(DetailedTaskDB)
-        .filter(DetailedTaskDB.project_id == project_id)
-        .filter(DetailedTaskDB.task_item == task.task_item)
-        .first()
-    )
-
-    if existing_task:
-        raise HTTPException(status_code=400, detail="동일한 프로젝트에 같은 업무 항목이 이미 존재합니다.")
-
     # 날짜 변환
     planned_end_date = None
     actual_end_date = None
@@ -94,6 +81,16 @@ def create_detailed_task(task: DetailedTaskCreate, db: Session = Depends(get_db)
     )
 
     db.add(db_task)
+
+    # 동일한 프로젝트-업무항목 조합은 unique 인덱스로 거부됨
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="동일한 프로젝트에 같은 업무 항목이 이미 존재합니다.")
+
+    rollups.refresh_for_tasks(db, [db_task.assignee])
+    change_feed.record(db, change_feed.DETAILED_TASK, change_feed.CREATED, db_task.id, db_task.project_id)
     db.commit()
     db.refresh(db_task)
 
@@ -126,6 +123,7 @@ def create_detailed_task(task: DetailedTaskCreate, db: Session = Depends(get_db)
 # 상세 업무 목록 조회 (필터링 포함)
 @router.get("/", response_model=List[dict])
 def get_detailed_tasks(
+    response: Response,
     project: Optional[str] = None,
     stage: Optional[str] = None,
     assignee: Optional[str] = None,
@@ -135,18 +133,24 @@ def get_detailed_tasks(
     planned_end_date: Optional[str] = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값 (지정 시 offset 무시)"),
+    include_links: bool = Query(True, description="False이면 linked_weekly_reports를 조회/포함하지 않음"),
     db: Session = Depends(get_db),
 ):
-    """상세 업무 목록을 조회합니다. (필터링 지원)"""
+    """상세 업무 목록을 조회합니다. (필터링 지원)
+
+    다음 페이지가 있으면 X-Next-Cursor 헤더로 커서를 반환하며,
+    cursor로 조회하면 페이지 깊이와 무관하게 일정한 비용으로 조회됩니다.
+    """
 
     # 기본 쿼리 (✨ relationship으로 project 정보도 함께 로드)
     query = db.query(DetailedTaskDB).options(joinedload(DetailedTaskDB.project_obj))
 
     # ✨ 프로젝트 필터링 (프로젝트명으로)
     if project:
-        project_obj = db.query(ProjectDB).filter(ProjectDB.name == project).first()
-        if project_obj:
-            query = query.filter(DetailedTaskDB.project_id == project_obj.id)
+        project_id = project_cache.project_id_for_name(db, project)
+        if project_id is not None:
+            query = query.filter(DetailedTaskDB.project_id == project_id)
         else:
             # 존재하지 않는 프로젝트면 빈 결과 반환
             return []
@@ -173,18 +177,29 @@ def get_detailed_tasks(
         except ValueError:
             pass
 
-    # 정렬 및 페이징
-    query = query.order_by(desc(DetailedTaskDB.updated_at))
-    tasks = query.offset(offset).limit(limit).all()
+    # 정렬 및 페이징 (updated_at, id 키셋 / 동일 시각은 id로 순서 고정)
+    query = query.order_by(desc(DetailedTaskDB.updated_at), desc(DetailedTaskDB.id))
+    if cursor:
+        try:
+            sort_columns = [DetailedTaskDB.updated_at, DetailedTaskDB.id]
+            query = pagination.apply_keyset(query, sort_columns, "detailed_tasks", cursor)
+        except pagination.InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        query = query.offset(offset)
+
+    tasks = query.limit(limit + 1).all()
+
+    next_cursor = pagination.next_cursor(tasks, limit, "detailed_tasks", lambda task: (task.updated_at, task.id))
+    if next_cursor:
+        response.headers[pagination.NEXT_CURSOR_HEADER] = next_cursor
+    tasks = tasks[:limit]
+
+    # ✨ 주간 보고서 연결 정보는 페이지 전체를 한 번에 조회 (업무마다 지연 로딩하지 않음)
+    linked_reports = task_links.linked_reports_by_task(db, [task.id for task in tasks]) if include_links else None
 
-    # ✨ 주간 보고서 연결 정보도 포함 (relationship 활용)
     result = []
     for task in tasks:
-        # ✨ relationship으로 연결된 주간 보고서 정보 조회
-        linked_reports = [
-            {"id": report.id, "week": report.week, "stage": report.stage} for report in task.weekly_reports
-        ]
-
         task_dict = {
             "id": task.id,
             "project": task.project_obj.name,
@@ -199,8 +214,9 @@ def get_detailed_tasks(
             "progress_rate": task.progress_rate,
             "created_at": task.created_at.isoformat() if task.created_at else None,
             "updated_at": task.updated_at.isoformat() if task.updated_at else None,
-            "linked_weekly_reports": linked_reports,
         }
+        if include_links:
+            task_dict["linked_weekly_reports"] = linked_reports.get(task.id, [])
         result.append(task_dict)
 
     return result
@@ -211,22 +227,17 @@ def get_detailed_tasks_by_project(project_name: str, db: Session = Depends(get_d
     """특정 프로젝트의 모든 상세 업무를 조회합니다."""
 
     # ✨ 프로젝트명을 project_id로 변환
-    project = get_project_by_name(db, project_name)
+    project_id = get_project_id_by_name(db, project_name)
 
-    # ✨ relationship으로 간단하게 조회 (eager loading)
-    tasks = (
-        db.query(DetailedTaskDB)
-        .options(joinedload(DetailedTaskDB.project_obj))
-        .filter(DetailedTaskDB.project_id == project.id)
-        .all()
-    )
+    # ✨ 프로젝트명은 이미 알고 있으므로 project 조인 없이 조회
+    tasks = db.query(DetailedTaskDB).filter(DetailedTaskDB.project_id == project_id).all()
 
     # ✨ 수동으로 응답 객체들 구성
     result = []
     for task in tasks:
         response_data = {
             "id": task.id,
-            "project": task.project_obj.name,
+            "project": project_name,
             "stage": task.stage,
             "task_item": task.task_item,
             "assignee": task.assignee,
@@ -251,10 +262,10 @@ def get_detailed_tasks_by_project_and_stage(
     """프로젝트별, 단계별 상세 업무를 조회합니다."""
 
     # ✨ 프로젝트명을 project_id로 변환
-    project = get_project_by_name(db, project_name)
+    project_id = get_project_id_by_name(db, project_name)
 
     # ✨ relationship 기반 쿼리
-    query = db.query(DetailedTaskDB).filter(DetailedTaskDB.project_id == project.id)
+    query = db.query(DetailedTaskDB).filter(DetailedTaskDB.project_id == project_id)
 
     if stage:
         query = query.filter(DetailedTaskDB.stage == stage)
@@ -348,27 +359,26 @@ def update_detailed_task(task_id: int, task_update: DetailedTaskUpdate, db: Sess
                 except ValueError:
                     raise HTTPException(status_code=400, detail=f"{date_field} 형식이 올바르지 않습니다. (YYYY-MM-DD)")
 
-    # 중복 체크 (프로젝트나 업무항목이 변경되는 경우)
-    if "project_id" in update_data or "task_item" in update_data:
-        project_id = update_data.get("project_id", db_task.project_id)
-        task_item = update_data.get("task_item", db_task.task_item)
-
-        existing_task = (
-            db.query(DetailedTaskDB)
-            .filter(DetailedTaskDB.project_id == project_id)
-            .filter(DetailedTaskDB.task_item == task_item)
-            .filter(DetailedTaskDB.id != task_id)  # 현재 업무는 제외
-            .first()
-        )
-
-        if existing_task:
-            raise HTTPException(status_code=400, detail="동일한 프로젝트에 같은 업무 항목이 이미 존재합니다.")
+    previous_assignee = db_task.assignee
+    previous_project_id = db_task.project_id
 
     # 필드 업데이트
     for field, value in update_data.items():
         setattr(db_task, field, value)
 
     db_task.updated_at = datetime.utcnow()
+
+    # 프로젝트-업무항목 중복은 unique 인덱스로 거부됨
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="동일한 프로젝트에 같은 업무 항목이 이미 존재합니다.")
+
+    rollups.refresh_for_tasks(db, [previous_assignee, db_task.assignee])
+    # 다른 프로젝트로 옮긴 경우 이전 프로젝트 구독자에게도 알림
+    for project_id in dict.fromkeys([previous_project_id, db_task.project_id]):
+        change_feed.record(db, change_feed.DETAILED_TASK, change_feed.UPDATED, task_id, project_id)
     db.commit()
     db.refresh(db_task)
 
@@ -414,73 +424,84 @@ def delete_detailed_task(task_id: int, db: Session = Depends(get_db)):
     # cascade 설정에 의해 관련 연결들이 자동으로 정리됨
 
     task_item = db_task.task_item
-    project_name = db_task.project_obj.name  # property로 프로젝트명 반환
+    project_name = project_cache.project_name_for_id(db, db_task.project_id)
 
     db.delete(db_task)
+    rollups.refresh_for_tasks(db, [db_task.assignee])
+    change_feed.record(db, change_feed.DETAILED_TASK, change_feed.DELETED, task_id, db_task.project_id)
     db.commit()
 
     return {"message": f"상세 업무 '{task_item}' (프로젝트: {project_name})가 성공적으로 삭제되었습니다."}
 
 
+def _check_detailed_tasks_exist(db: Session, task_ids: set):
+    """요청한 상세 업무가 모두 있는지 id만 한 번에 조회해 확인합니다."""
+    if not task_ids:
+        return
+    found_ids = {
+        row[0]
+        for chunk in batching.id_chunks(task_ids)
+        for row in db.query(DetailedTaskDB.id).filter(DetailedTaskDB.id.in_(chunk))
+    }
+    missing_ids = task_ids - found_ids
+    if missing_ids:
+        print(f"❌ 누락된 상세 업무 IDs: {missing_ids}")
+        raise HTTPException(status_code=404, detail=f"다음 상세 업무 ID들을 찾을 수 없습니다: {missing_ids}")
+
+
+def _record_link_changes(db: Session, results: dict):
+    """연결이 실제로 바뀐 주간 보고서와 상세 업무(연결 보고서 목록이 바뀜)를 변경 이벤트로 기록합니다."""
+    changed_ids = [report_id for report_id, result in results.items() if result["added"] or result["removed"]]
+    if not changed_ids:
+        return
+    task_ids = {task_id for result in results.values() for task_id in result["added"] + result["removed"]}
+    for model, entity, ids in (
+        (WeeklyReportDB, change_feed.WEEKLY_REPORT, changed_ids),
+        (DetailedTaskDB, change_feed.DETAILED_TASK, sorted(task_ids)),
+    ):
+        by_project = {}
+        for chunk in batching.id_chunks(ids):
+            for entity_id, project_id in db.query(model.id, model.project_id).filter(model.id.in_(chunk)):
+                by_project.setdefault(project_id, []).append(entity_id)
+        for project_id, entity_ids in by_project.items():
+            change_feed.record(db, entity, change_feed.UPDATED, entity_ids, project_id)
+
+
 # 주간 보고서에 상세 업무 연결
 @router.post("/weekly-reports/{report_id}/link")
 def link_detailed_tasks_to_weekly_report(
-    report_id: int, task_links: WeeklyReportDetailedTasksUpdate, db: Session = Depends(get_db)
+    report_id: int, links_update: WeeklyReportDetailedTasksUpdate, db: Session = Depends(get_db)
 ):
-    """주간 보고서에 상세 업무들을 연결합니다."""
+    """주간 보고서에 상세 업무들을 연결합니다. (요청한 목록으로 교체, 바뀐 연결만 추가/삭제)"""
     try:
-        # 입력 데이터 로깅
-        print(f"🔗 주간 보고서 {report_id}에 상세 업무 연결 요청")
-        print(f"📋 요청된 상세 업무 IDs: {task_links.detailed_task_ids}")
-
-        # 주간 보고서 존재 확인 (project 정보와 함께 로드)
-        weekly_report = (
-            db.query(WeeklyReportDB)
-            .options(joinedload(WeeklyReportDB.project_obj))
-            .filter(WeeklyReportDB.id == report_id)
-            .first()
-        )
-        if not weekly_report:
+        print(f"🔗 주간 보고서 {report_id}에 상세 업무 연결 요청: {len(links_update.detailed_task_ids)}개")
+
+        weekly_report_exists = db.query(WeeklyReportDB.id).filter(WeeklyReportDB.id == report_id).first()
+        if not weekly_report_exists:
             print(f"❌ 주간 보고서 {report_id}를 찾을 수 없음")
             raise HTTPException(status_code=404, detail="주간 보고서를 찾을 수 없습니다.")
 
-        print(f"✅ 주간 보고서 발견: {weekly_report.project_obj.name} - {weekly_report.week}")
-
-        # 상세 업무들 존재 확인 (빈 목록이 아닌 경우에만)
-        if task_links.detailed_task_ids:
-            detailed_tasks = db.query(DetailedTaskDB).filter(DetailedTaskDB.id.in_(task_links.detailed_task_ids)).all()
-            found_ids = {task.id for task in detailed_tasks}
-            requested_ids = set(task_links.detailed_task_ids)
-
-            print(f"🔍 요청된 ID 개수: {len(requested_ids)}")
-            print(f"✅ 발견된 ID 개수: {len(found_ids)}")
-
-            if len(detailed_tasks) != len(task_links.detailed_task_ids):
-                missing_ids = requested_ids - found_ids
-                print(f"❌ 누락된 상세 업무 IDs: {missing_ids}")
-                raise HTTPException(status_code=404, detail=f"다음 상세 업무 ID들을 찾을 수 없습니다: {missing_ids}")
-        else:
-            detailed_tasks = []
-            print("🔄 빈 목록으로 모든 연결 해제")
-
-        # ✨ SQLAlchemy relationship을 사용한 연결 관리
-        old_count = len(weekly_report.detailed_tasks)
-
-        # 기존 연결 해제
-        weekly_report.detailed_tasks.clear()
-
-        # 새로운 연결 설정
-        weekly_report.detailed_tasks.extend(detailed_tasks)
+        requested_ids = set(links_update.detailed_task_ids)
+        _check_detailed_tasks_exist(db, requested_ids)
 
+        # ✨ 컬렉션을 비우고 다시 채우지 않고 기존 연결과의 차이만 반영
+        results = task_links.replace_links(db, {report_id: requested_ids})
+        _record_link_changes(db, results)
         db.commit()
+        result = results[report_id]
 
-        print(f"✅ 연결 업데이트 완료: {old_count} → {len(detailed_tasks)}개")
+        print(
+            f"✅ 연결 업데이트 완료: {result['previous_count']} → {result['current_count']}개 "
+            f"(+{len(result['added'])}, -{len(result['removed'])})"
+        )
 
         return {
-            "message": f"주간 보고서 {report_id}에 {len(detailed_tasks)}개의 상세 업무가 연결되었습니다.",
-            "linked_task_ids": task_links.detailed_task_ids,
-            "previous_count": old_count,
-            "current_count": len(detailed_tasks),
+            "message": f"주간 보고서 {report_id}에 {result['current_count']}개의 상세 업무가 연결되었습니다.",
+            "linked_task_ids": links_update.detailed_task_ids,
+            "previous_count": result["previous_count"],
+            "current_count": result["current_count"],
+            "added_task_ids": result["added"],
+            "removed_task_ids": result["removed"],
         }
 
     except HTTPException:
@@ -488,24 +509,62 @@ def link_detailed_tasks_to_weekly_report(
         raise
     except Exception as e:
         print(f"💥 예상치 못한 오류: {str(e)}")
-        print(f"📋 요청 데이터: {task_links}")
+        print(f"📋 요청 데이터: {links_update}")
         print(f"🔍 오류 타입: {type(e).__name__}")
         raise HTTPException(status_code=500, detail=f"상세 업무 연결 중 서버 오류가 발생했습니다: {str(e)}")
 
 
+# 여러 주간 보고서에 상세 업무 일괄 연결
+@router.post("/weekly-reports/link")
+def bulk_link_detailed_tasks_to_weekly_reports(bulk_update: WeeklyReportLinksBulkUpdate, db: Session = Depends(get_db)):
+    """여러 주간 보고서의 연결 업무를 한 번에 교체합니다. 하나라도 실패하면 모두 취소됩니다."""
+    report_ids = [item.weekly_report_id for item in bulk_update.reports]
+    duplicated = {report_id for report_id, count in Counter(report_ids).items() if count > 1}
+    if duplicated:
+        raise HTTPException(status_code=400, detail=f"같은 주간 보고서가 여러 번 포함되어 있습니다: {duplicated}")
+
+    found_reports = {
+        row[0]
+        for chunk in batching.id_chunks(report_ids)
+        for row in db.query(WeeklyReportDB.id).filter(WeeklyReportDB.id.in_(chunk))
+    }
+    missing_reports = set(report_ids) - found_reports
+    if missing_reports:
+        raise HTTPException(status_code=404, detail=f"다음 주간 보고서 ID들을 찾을 수 없습니다: {missing_reports}")
+
+    _check_detailed_tasks_exist(db, {task_id for item in bulk_update.reports for task_id in item.detailed_task_ids})
+
+    results = task_links.replace_links(db, {item.weekly_report_id: item.detailed_task_ids for item in bulk_update.reports})
+    _record_link_changes(db, results)
+    db.commit()
+
+    added = sum(len(result["added"]) for result in results.values())
+    removed = sum(len(result["removed"]) for result in results.values())
+    print(f"✅ 주간 보고서 {len(results)}개 연결 업데이트 완료 (+{added}, -{removed})")
+
+    return {
+        "message": f"주간 보고서 {len(results)}개의 상세 업무 연결이 업데이트되었습니다.",
+        "added_count": added,
+        "removed_count": removed,
+        "reports": [{"weekly_report_id": report_id, **result} for report_id, result in results.items()],
+    }
+
+
 # 주간 보고서의 연결된 상세 업무 조회
 @router.get("/weekly-reports/{report_id}/tasks", response_model=List[DetailedTaskResponse])
 def get_linked_detailed_tasks(report_id: int, db: Session = Depends(get_db)):
     """주간 보고서에 연결된 상세 업무 목록을 조회합니다."""
-    weekly_report = db.query(WeeklyReportDB).filter(WeeklyReportDB.id == report_id).first()
-    if not weekly_report:
+    weekly_report_exists = db.query(WeeklyReportDB.id).filter(WeeklyReportDB.id == report_id).first()
+    if not weekly_report_exists:
         raise HTTPException(status_code=404, detail="주간 보고서를 찾을 수 없습니다.")
 
-    # ✨ SQLAlchemy relationship을 사용한 조회 (eager loading)
+    # ✨ 연결 테이블과 조인해 한 번에 조회 (컬렉션 로딩 후 재조회하지 않음)
     tasks = (
         db.query(DetailedTaskDB)
         .options(joinedload(DetailedTaskDB.project_obj))
-        .filter(DetailedTaskDB.id.in_([task.id for task in weekly_report.detailed_tasks]))
+        .join(weekly_report_detailed_tasks, weekly_report_detailed_tasks.c.detailed_task_id == DetailedTaskDB.id)
+        .filter(weekly_report_detailed_tasks.c.weekly_report_id == report_id)
+        .order_by(DetailedTaskDB.id)
         .all()
     )
 
@@ -537,19 +596,23 @@ def get_linked_detailed_tasks(report_id: int, db: Session = Depends(get_db)):
 def get_task_weekly_reports(task_id: int, db: Session = Depends(get_db)):
     """상세 업무와 연결된 주간 보고서 목록을 조회합니다."""
 
-    # 상세 업무 조회 (relationship과 함께)
-    task = (
-        db.query(DetailedTaskDB)
-        .options(joinedload(DetailedTaskDB.weekly_reports).joinedload(WeeklyReportDB.project_obj))
-        .filter(DetailedTaskDB.id == task_id)
-        .first()
-    )
-    if not task:
+    # 상세 업무 존재 확인
+    task_exists = db.query(DetailedTaskDB.id).filter(DetailedTaskDB.id == task_id).first()
+    if not task_exists:
         raise HTTPException(status_code=404, detail="상세 업무를 찾을 수 없습니다.")
 
-    # ✨ SQLAlchemy relationship을 사용한 연결된 주간 보고서 조회
+    # ✨ 연결 테이블에서 업무 id로 바로 찾아 조인 (중첩 joinedload는 weekly_reports 전체를 스캔함)
+    reports = (
+        db.query(WeeklyReportDB)
+        .options(joinedload(WeeklyReportDB.project_obj))
+        .join(weekly_report_detailed_tasks, weekly_report_detailed_tasks.c.weekly_report_id == WeeklyReportDB.id)
+        .filter(weekly_report_detailed_tasks.c.detailed_task_id == task_id)
+        .order_by(WeeklyReportDB.id)
+        .all()
+    )
+
     result = []
-    for report in task.weekly_reports:
+    for report in reports:
         result.append(
             {
                 "id": report.id,
@@ -570,10 +633,10 @@ def get_project_task_statistics(project_name: str, db: Session = Depends(get_db)
     """프로젝트별 상세 업무 통계를 조회합니다."""
 
     # 프로젝트 확인
-    project = get_project_by_name(db, project_name)
+    project_id = get_project_id_by_name(db, project_name)
 
     # 해당 프로젝트의 모든 업무 조회
-    tasks = db.query(DetailedTaskDB).filter(DetailedTaskDB.project_id == project.id).all()
+    tasks = db.query(DetailedTaskDB).filter(DetailedTaskDB.project_id == project_id).all()
 
     if not tasks:
         return {
@@ -686,11 +749,22 @@ def validate_detailed_tasks_file(file: UploadFile = File(...)):
 
 # 파일 업로드 및 일괄 등록
 @router.post("/upload/import")
-def import_detailed_tasks_from_file(file: UploadFile = File(...), db: Session = Depends(get_db)):
+def import_detailed_tasks_from_file(
+    response: Response,
+    file: UploadFile = File(...),
+    background: bool = Query(False, description="True이면 백그라운드 작업으로 접수하고 작업 ID를 반환"),
+    db: Session = Depends(get_db),
+):
     """상세 업무를 파일에서 일괄 등록합니다."""
+    # 파일 내용 읽기
+    contents = file.file.read()
+
+    # 대용량 파일은 백그라운드 작업으로 처리 (/import-jobs/{job_id}로 진행 상황 조회)
+    if background:
+        response.status_code = 202
+        return import_jobs.start_import_job(db, "detailed_tasks", file.filename, contents)
+
     try:
-        # 파일 내용 읽기
-        contents = file.file.read()
 
         if file.filename.endswith(".csv"):
             df = pd.read_csv(io.StringIO(contents.decode("utf-8")))
@@ -698,115 +772,26 @@ def import_detailed_tasks_from_file(file: UploadFile = File(...), db: Session =
             df = pd.read_excel(io.BytesIO(contents))
 
         # 필수 컬럼 확인
-        required_columns = ["project", "stage", "task_item"]
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = [col for col in detailed_task_import.REQUIRED_COLUMNS if col not in df.columns]
 
         if missing_columns:
             raise HTTPException(status_code=400, detail=f"필수 컬럼이 누락되었습니다: {', '.join(missing_columns)}")
 
-        # 빈 행 제거
-        df = df.dropna(subset=required_columns)
-
-        successful_imports = 0
-        failed_imports = []
-
-        for index, row in df.iterrows():
-            try:
-                # 기본값 설정
-                task_data = {
-                    "project": str(row["project"]).strip(),
-                    "stage": str(row["stage"]).strip(),
-                    "task_item": str(row["task_item"]).strip(),
-                    "assignee": str(row.get("assignee", "")).strip(),
-                    "current_status": str(row.get("current_status", "not_started")).strip(),
-                    "has_risk": bool(row.get("has_risk", False)),
-                    "description": str(row.get("description", "")).strip(),
-                    "planned_end_date": None,
-                    "actual_end_date": None,
-                    "progress_rate": int(row.get("progress_rate", 0)) if pd.notna(row.get("progress_rate")) else 0,
-                }
-
-                # 프로젝트 ID 변환
-                try:
-                    project_id = get_project_id_by_name(db, task_data["project"])
-                except HTTPException:
-                    failed_imports.append(
-                        {
-                            "row": index + 2,
-                            "project": task_data["project"],
-                            "task_item": task_data["task_item"],
-                            "reason": "프로젝트를 찾을 수 없음",
-                        }
-                    )
-                    continue
-
-                # 날짜 처리
-                for date_field in ["planned_end_date", "actual_end_date"]:
-                    if date_field in df.columns and pd.notna(row[date_field]):
-                        try:
-                            from datetime import datetime
-
-                            if isinstance(row[date_field], str):
-                                task_data[date_field] = datetime.strptime(row[date_field], "%Y-%m-%d").date()
-                            else:
-                                task_data[date_field] = row[date_field]
-                        except:
-                            task_data[date_field] = None
-
-                # 중복 확인
-                existing_task = (
-                    db.query(DetailedTaskDB)
-                    .filter(
-                        and_(
-                            DetailedTaskDB.project_id == project_id,
-                            DetailedTaskDB.task_item == task_data["task_item"],
-                        )
-                    )
-                    .first()
-                )
-
-                if existing_task:
-                    failed_imports.append(
-                        {
-                            "row": index + 2,  # Excel 행 번호 (헤더 포함)
-                            "project": task_data["project"],
-                            "task_item": task_data["task_item"],
-                            "reason": "이미 존재하는 업무",
-                        }
-                    )
-                    continue
-
-                # 데이터베이스에 저장
-                task_data.pop("project")  # project 필드 제거
-                task_data["project_id"] = project_id  # project_id 추가
-
-                db_task = DetailedTaskDB(**task_data)
-                db.add(db_task)
-                db.commit()
-
-                successful_imports += 1
-
-            except Exception as e:
-                failed_imports.append(
-                    {
-                        "row": index + 2,
-                        "project": task_data.get("project", ""),
-                        "task_item": task_data.get("task_item", ""),
-                        "reason": f"처리 중 오류: {str(e)}",
-                    }
-                )
-                continue
+        # 프로젝트/중복 일괄 조회 후 하나의 트랜잭션으로 배치 삽입
+        result = detailed_task_import.import_detailed_tasks(db, df)
 
         return {
             "success": True,
-            "message": f"일괄 등록이 완료되었습니다. 성공: {successful_imports}개, 실패: {len(failed_imports)}개",
-            "data": {
-                "successful_imports": successful_imports,
-                "failed_imports": failed_imports,
-                "total_processed": len(df),
-            },
+            "message": (
+                f"일괄 등록이 완료되었습니다. 성공: {result['successful_imports']}개, "
+                f"실패: {len(result['failed_imports'])}개"
+            ),
+            "data": result,
         }
 
+    except HTTPException:
+        # HTTP 예외는 다시 던짐
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"파일 업로드 중 오류가 발생했습니다: {str(e)}")
 
@@ -1,15 +1,110 @@
-from fastapi import APIRouter, Depends, Response
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, func, distinct, and_
-from database import get_db
-from models import WeeklyReportDB, DetailedTaskDB, ProjectDB, TaskStatus
-import pandas as pd
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from sqlalchemy import desc, distinct
+from database import SessionLocal
+from models import WeeklyReportDB, DetailedTaskDB, ProjectDB, ProjectRollupDB, WeekRollupDB
+from services import metrics, name_index, project_cache, rollups
+from typing import Callable, Iterable, Iterator, List
 from io import StringIO
+from urllib.parse import quote
+import csv
 import logging
 
 router = APIRouter(prefix="/export", tags=["export"])
 logger = logging.getLogger(__name__)
 
+# 한 번에 내보낼 행 수 (DB 커서에서 가져오는 단위와 응답 chunk 단위)
+CSV_CHUNK_ROWS = 1000
+
+WEEKLY_REPORT_COLUMNS = ["ID", "프로젝트", "주차", "단계", "이번 주 한 일", "다음 주 계획", "이슈/리스크", "생성일", "수정일"]
+PROJECT_SUMMARY_COLUMNS = [
+    "프로젝트",
+    "총 주차 수",
+    "최신 주차",
+    "단계 수",
+    "진행 단계",
+    "현재 이슈 수",
+    "완료율(%)",
+    "총 보고서 수",
+]
+WEEKLY_SUMMARY_COLUMNS = ["주차", "총 프로젝트 수", "총 단계 수", "이슈가 있는 프로젝트 수", "총 이슈 수", "프로젝트 목록"]
+DETAILED_TASK_COLUMNS = [
+    "ID",
+    "프로젝트",
+    "단계",
+    "업무 항목",
+    "담당자",
+    "현재 상태",
+    "리스크 여부",
+    "설명",
+    "종료예정일",
+    "실제 완료일",
+    "진행률(%)",
+    "생성일",
+    "수정일",
+]
+
+
+def _format_datetime(value) -> str:
+    return value.strftime("%Y-%m-%d %H:%M:%S") if value else ""
+
+
+def _format_date(value) -> str:
+    return value.strftime("%Y-%m-%d") if value else ""
+
+
+def iter_csv(columns: List[str], rows: Iterable[Iterable]) -> Iterator[str]:
+    """행 단위 이터레이터를 CSV 텍스트 chunk로 변환합니다. (BOM 추가로 한글 깨짐 방지)"""
+    buffer = StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    buffer.write("\ufeff")
+    writer.writerow(columns)
+
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % CSV_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    yield buffer.getvalue()
+
+
+def matching_project_ids(db, fragment: str) -> List[int]:
+    """프로젝트명에 fragment가 포함된 프로젝트 ID 목록"""
+    names = name_index.matching_values(db, name_index.PROJECT, fragment)
+    return list(project_cache.project_ids_for_names(db, names).values())
+
+
+def csv_streaming_response(
+    columns: List[str], row_source: Callable[..., Iterable[Iterable]], filename: str, kind: str
+) -> StreamingResponse:
+    """전용 DB 세션에서 row_source를 실행하면서 CSV를 스트리밍하는 응답을 만듭니다.
+
+    스트리밍은 엔드포인트 함수가 반환된 뒤에 진행되므로 요청 의존성 세션 대신
+    응답 생성기 수명에 맞춘 세션을 사용합니다.
+    """
+
+    def generate():
+        db = SessionLocal()
+        try:
+            yield from iter_csv(columns, metrics.count_export_rows(kind, row_source(db)))
+        finally:
+            db.close()
+
+    # 한글 필터값이 들어간 파일명은 latin-1 헤더로 보낼 수 없으므로 RFC 5987 형식을 함께 사용
+    ascii_filename = filename.encode("ascii", "ignore").decode("ascii") or "export.csv"
+    content_disposition = f"attachment; filename={ascii_filename}"
+    if ascii_filename != filename:
+        content_disposition += f"; filename*=UTF-8''{quote(filename)}"
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": content_disposition},
+    )
+
 
 @router.get("/weekly-reports.csv")
 def export_weekly_reports_csv(
@@ -18,54 +113,53 @@ def export_weekly_reports_csv(
     stage: str = None,
     start_week: str = None,
     end_week: str = None,
-    db: Session = Depends(get_db),
 ):
     """주차별 보고서를 CSV 형식으로 내보냅니다."""
 
-    # 쿼리 구성 (joinedload 사용)
-    query = db.query(WeeklyReportDB).options(joinedload(WeeklyReportDB.project_obj))
-
-    # 필터 적용
-    if project:
-        query = query.join(ProjectDB, WeeklyReportDB.project_id == ProjectDB.id).filter(
-            ProjectDB.name.ilike(f"%{project}%")
-        )
-    if week:
-        query = query.filter(WeeklyReportDB.week == week)
-    if stage:
-        query = query.filter(WeeklyReportDB.stage.ilike(f"%{stage}%"))
-    if start_week:
-        query = query.filter(WeeklyReportDB.week >= start_week)
-    if end_week:
-        query = query.filter(WeeklyReportDB.week <= end_week)
-
-    # 최신순 정렬
-    reports = query.order_by(desc(WeeklyReportDB.week), WeeklyReportDB.project_obj.name, WeeklyReportDB.stage).all()
-
-    # 데이터 변환
-    data = []
-    for report in reports:
-        data.append(
-            {
-                "ID": report.id,
-                "프로젝트": report.project_obj.name,
-                "주차": report.week,
-                "단계": report.stage,
-                "이번 주 한 일": report.this_week_work,
-                "다음 주 계획": report.next_week_plan or "",
-                "이슈/리스크": report.issues_risks or "",
-                "생성일": report.created_at.strftime("%Y-%m-%d %H:%M:%S") if report.created_at else "",
-                "수정일": report.updated_at.strftime("%Y-%m-%d %H:%M:%S") if report.updated_at else "",
-            }
-        )
-
-    # DataFrame 생성
-    df = pd.DataFrame(data)
-
-    # CSV 문자열 생성
-    csv_buffer = StringIO()
-    df.to_csv(csv_buffer, index=False, encoding="utf-8-sig")  # BOM 추가로 한글 깨짐 방지
-    csv_content = csv_buffer.getvalue()
+    def rows(db):
+        # 필요한 컬럼만 조회 (ORM 객체 생성 없이 커서에서 바로 스트리밍)
+        query = db.query(
+            WeeklyReportDB.id,
+            ProjectDB.name,
+            WeeklyReportDB.week,
+            WeeklyReportDB.stage,
+            WeeklyReportDB.this_week_work,
+            WeeklyReportDB.next_week_plan,
+            WeeklyReportDB.issues_risks,
+            WeeklyReportDB.created_at,
+            WeeklyReportDB.updated_at,
+        ).join(ProjectDB, WeeklyReportDB.project_id == ProjectDB.id)
+
+        # 필터 적용
+        # 부분 일치 필터는 trigram 이름 색인으로 정확한 값/ID를 찾아 인덱스 조건으로 적용
+        if project:
+            query = query.filter(WeeklyReportDB.project_id.in_(matching_project_ids(db, project)))
+        if week:
+            query = query.filter(WeeklyReportDB.week == week)
+        if stage:
+            query = query.filter(WeeklyReportDB.stage.in_(name_index.matching_values(db, name_index.STAGE, stage)))
+        if start_week:
+            query = query.filter(WeeklyReportDB.week >= start_week)
+        if end_week:
+            query = query.filter(WeeklyReportDB.week <= end_week)
+
+        # 최신순 정렬
+        query = query.order_by(desc(WeeklyReportDB.week), ProjectDB.name, WeeklyReportDB.stage)
+
+        for report_id, project_name, report_week, report_stage, work, plan, issues, created, updated in query.yield_per(
+            CSV_CHUNK_ROWS
+        ):
+            yield [
+                report_id,
+                project_name,
+                report_week,
+                report_stage,
+                work,
+                plan or "",
+                issues or "",
+                _format_datetime(created),
+                _format_datetime(updated),
+            ]
 
     # 파일명 생성
     filename = "weekly_reports"
@@ -75,146 +169,74 @@ def export_weekly_reports_csv(
         filename += f"_{week}"
     filename += ".csv"
 
-    return Response(
-        content=csv_content,
-        media_type="text/csv; charset=utf-8",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
-    )
+    return csv_streaming_response(WEEKLY_REPORT_COLUMNS, rows, filename, "weekly_reports")
 
 
 @router.get("/project-summary.csv")
-def export_project_summary_csv(db: Session = Depends(get_db)):
+def export_project_summary_csv():
     """프로젝트별 요약 정보를 CSV 형식으로 내보냅니다."""
 
-    # 모든 프로젝트 목록 조회
-    projects = db.query(ProjectDB.name).distinct().all()
+    def rows(db):
+        # 프로젝트별 통계는 집계 테이블에서 조회
+        projects = (
+            db.query(ProjectDB.id, ProjectDB.name, ProjectRollupDB)
+            .outerjoin(ProjectRollupDB, ProjectRollupDB.project_id == ProjectDB.id)
+            .order_by(ProjectDB.id)
+            .all()
+        )
 
-    data = []
-    for project_tuple in projects:
-        project_name = project_tuple[0]
+        for project_id, project_name, rollup in projects:
+            if rollup is None:
+                rollup = rollups.get_project_rollup(db, project_id)
+            if not rollup.report_count:
+                continue
 
-        # 프로젝트의 모든 보고서 조회
-        project_obj = db.query(ProjectDB).filter(ProjectDB.name == project_name).first()
-        if not project_obj:
-            continue
+            stages = rollups.project_rollup_stages(rollup)
+            completion_rate = (rollup.completed_report_count / rollup.report_count) * 100
 
-        reports = (
-            db.query(WeeklyReportDB)
-            .filter(WeeklyReportDB.project_id == project_obj.id)
-            .order_by(desc(WeeklyReportDB.week))
-            .all()
-        )
+            yield [
+                project_name,
+                rollup.week_count,
+                rollup.latest_week,
+                len(stages),
+                ", ".join(stages),
+                rollup.issue_count,
+                round(completion_rate, 1),
+                rollup.report_count,
+            ]
 
-        if reports:
-            # 통계 계산
-            total_weeks = len(set(report.week for report in reports))
-            latest_week = max(report.week for report in reports)
-            stages = list(set(report.stage for report in reports))
-            current_issues = len([r for r in reports if r.issues_risks and r.issues_risks.strip()])
-
-            # 완료율 계산
-            completed_reports = len(
-                [
-                    r
-                    for r in reports
-                    if not r.next_week_plan
-                    or "완료" in r.next_week_plan
-                    or "종료" in r.next_week_plan
-                    or "마무리" in r.next_week_plan
-                ]
-            )
-            completion_rate = (completed_reports / len(reports)) * 100 if reports else 0
-
-            data.append(
-                {
-                    "프로젝트": project_name,
-                    "총 주차 수": total_weeks,
-                    "최신 주차": latest_week,
-                    "단계 수": len(stages),
-                    "진행 단계": ", ".join(stages),
-                    "현재 이슈 수": current_issues,
-                    "완료율(%)": round(completion_rate, 1),
-                    "총 보고서 수": len(reports),
-                }
-            )
-
-    # DataFrame 생성
-    df = pd.DataFrame(data)
-
-    # CSV 문자열 생성
-    csv_buffer = StringIO()
-    df.to_csv(csv_buffer, index=False, encoding="utf-8-sig")
-    csv_content = csv_buffer.getvalue()
-
-    return Response(
-        content=csv_content,
-        media_type="text/csv; charset=utf-8",
-        headers={"Content-Disposition": "attachment; filename=project_summary.csv"},
-    )
+    return csv_streaming_response(PROJECT_SUMMARY_COLUMNS, rows, "project_summary.csv", "project_summary")
 
 
 @router.get("/weekly-summary.csv")
-def export_weekly_summary_csv(db: Session = Depends(get_db)):
+def export_weekly_summary_csv():
     """주차별 요약 정보를 CSV 형식으로 내보냅니다."""
 
-    # 모든 주차 목록 조회 (최신순)
-    weeks = db.query(distinct(WeeklyReportDB.week)).order_by(desc(WeeklyReportDB.week)).all()
-
-    data = []
-    for week_tuple in weeks:
-        week = week_tuple[0]
-
-        # 해당 주차의 모든 보고서 조회
-        reports = (
-            db.query(WeeklyReportDB)
-            .options(joinedload(WeeklyReportDB.project_obj))
-            .filter(WeeklyReportDB.week == week)
-            .order_by(WeeklyReportDB.project_obj.name, WeeklyReportDB.stage)
+    def rows(db):
+        # 모든 주차 목록 조회 (최신순) 후 집계 테이블에서 통계 조회
+        weeks = (
+            db.query(distinct(WeeklyReportDB.week), WeekRollupDB)
+            .outerjoin(WeekRollupDB, WeekRollupDB.week == WeeklyReportDB.week)
+            .order_by(desc(WeeklyReportDB.week))
             .all()
         )
 
-        if reports:
-            # 프로젝트별 그룹핑
-            project_groups = {}
-            for report in reports:
-                project_name = report.project_obj.name
-                if project_name not in project_groups:
-                    project_groups[project_name] = []
-                project_groups[project_name].append(report)
-
-            projects_with_issues = 0
-            total_issues = 0
-
-            for project_name, project_reports in project_groups.items():
-                has_issues = any(r.issues_risks and r.issues_risks.strip() for r in project_reports)
-                if has_issues:
-                    projects_with_issues += 1
-                total_issues += len([r for r in project_reports if r.issues_risks and r.issues_risks.strip()])
-
-            data.append(
-                {
-                    "주차": week,
-                    "총 프로젝트 수": len(project_groups),
-                    "총 단계 수": len(reports),
-                    "이슈가 있는 프로젝트 수": projects_with_issues,
-                    "총 이슈 수": total_issues,
-                    "프로젝트 목록": ", ".join(project_groups.keys()),
-                }
-            )
-
-    # DataFrame 생성
-    df = pd.DataFrame(data)
-
-    # CSV 문자열 생성
-    csv_buffer = StringIO()
-    df.to_csv(csv_buffer, index=False, encoding="utf-8-sig")
-    csv_content = csv_buffer.getvalue()
-
-    return Response(
-        content=csv_content,
-        media_type="text/csv; charset=utf-8",
-        headers={"Content-Disposition": "attachment; filename=weekly_summary.csv"},
-    )
+        for week, rollup in weeks:
+            if rollup is None:
+                rollup = rollups.get_week_rollup(db, week)
+            if rollup is None:
+                continue
+
+            yield [
+                week,
+                rollup.project_count,
+                rollup.report_count,
+                rollup.projects_with_issues,
+                rollup.issue_count,
+                ", ".join(rollups.week_rollup_projects(rollup)),
+            ]
+
+    return csv_streaming_response(WEEKLY_SUMMARY_COLUMNS, rows, "weekly_summary.csv", "weekly_summary")
 
 
 @router.get("/detailed-tasks.csv")
@@ -225,60 +247,61 @@ def export_detailed_tasks_csv(
     has_risk: bool = None,
     start_date: str = None,
     end_date: str = None,
-    db: Session = Depends(get_db),
 ):
     """상세 업무를 CSV 형식으로 내보냅니다."""
 
-    # 쿼리 구성 (joinedload 사용)
-    query = db.query(DetailedTaskDB).options(joinedload(DetailedTaskDB.project_obj))
-
-    # 필터 적용
-    if project:
-        query = query.join(ProjectDB, DetailedTaskDB.project_id == ProjectDB.id).filter(
-            ProjectDB.name.ilike(f"%{project}%")
-        )
-    if assignee:
-        query = query.filter(DetailedTaskDB.assignee.ilike(f"%{assignee}%"))
-    if current_status:
-        query = query.filter(DetailedTaskDB.current_status == current_status)
-    if has_risk is not None:
-        query = query.filter(DetailedTaskDB.has_risk == has_risk)
-    if start_date:
-        query = query.filter(DetailedTaskDB.planned_end_date >= start_date)
-    if end_date:
-        query = query.filter(DetailedTaskDB.planned_end_date <= end_date)
-
-    # 정렬
-    tasks = query.order_by(DetailedTaskDB.project_obj.name, DetailedTaskDB.stage, DetailedTaskDB.task_item).all()
-
-    # 데이터 변환
-    data = []
-    for task in tasks:
-        data.append(
-            {
-                "ID": task.id,
-                "프로젝트": task.project_obj.name,
-                "단계": task.stage or "",
-                "업무 항목": task.task_item,
-                "담당자": task.assignee or "",
-                "현재 상태": task.current_status.value if task.current_status else "",
-                "리스크 여부": "예" if task.has_risk else "아니오",
-                "설명": task.description or "",
-                "종료예정일": task.planned_end_date.strftime("%Y-%m-%d") if task.planned_end_date else "",
-                "실제 완료일": task.actual_end_date.strftime("%Y-%m-%d") if task.actual_end_date else "",
-                "진행률(%)": task.progress_rate,
-                "생성일": task.created_at.strftime("%Y-%m-%d %H:%M:%S") if task.created_at else "",
-                "수정일": task.updated_at.strftime("%Y-%m-%d %H:%M:%S") if task.updated_at else "",
-            }
-        )
-
-    # DataFrame 생성
-    df = pd.DataFrame(data)
-
-    # CSV 문자열 생성
-    csv_buffer = StringIO()
-    df.to_csv(csv_buffer, index=False, encoding="utf-8-sig")
-    csv_content = csv_buffer.getvalue()
+    def rows(db):
+        # 필요한 컬럼만 조회 (ORM 객체 생성 없이 커서에서 바로 스트리밍)
+        query = db.query(
+            DetailedTaskDB.id,
+            ProjectDB.name,
+            DetailedTaskDB.stage,
+            DetailedTaskDB.task_item,
+            DetailedTaskDB.assignee,
+            DetailedTaskDB.current_status,
+            DetailedTaskDB.has_risk,
+            DetailedTaskDB.description,
+            DetailedTaskDB.planned_end_date,
+            DetailedTaskDB.actual_end_date,
+            DetailedTaskDB.progress_rate,
+            DetailedTaskDB.created_at,
+            DetailedTaskDB.updated_at,
+        ).join(ProjectDB, DetailedTaskDB.project_id == ProjectDB.id)
+
+        # 필터 적용
+        # 부분 일치 필터는 trigram 이름 색인으로 정확한 값/ID를 찾아 인덱스 조건으로 적용
+        if project:
+            query = query.filter(DetailedTaskDB.project_id.in_(matching_project_ids(db, project)))
+        if assignee:
+            query = query.filter(DetailedTaskDB.assignee.in_(name_index.matching_values(db, name_index.ASSIGNEE, assignee)))
+        if current_status:
+            query = query.filter(DetailedTaskDB.current_status == current_status)
+        if has_risk is not None:
+            query = query.filter(DetailedTaskDB.has_risk == has_risk)
+        if start_date:
+            query = query.filter(DetailedTaskDB.planned_end_date >= start_date)
+        if end_date:
+            query = query.filter(DetailedTaskDB.planned_end_date <= end_date)
+
+        # 정렬
+        query = query.order_by(ProjectDB.name, DetailedTaskDB.stage, DetailedTaskDB.task_item)
+
+        for task in query.yield_per(CSV_CHUNK_ROWS):
+            yield [
+                task.id,
+                task.name,
+                task.stage or "",
+                task.task_item,
+                task.assignee or "",
+                task.current_status.value if task.current_status else "",
+                "예" if task.has_risk else "아니오",
+                task.description or "",
+                _format_date(task.planned_end_date),
+                _format_date(task.actual_end_date),
+                task.progress_rate,
+                _format_datetime(task.created_at),
+                _format_datetime(task.updated_at),
+            ]
 
     # 파일명 생성
     filename = "detailed_tasks"
@@ -288,8 +311,4 @@ def export_detailed_tasks_csv(
         filename += f"_{assignee}"
     filename += ".csv"
 
-    return Response(
-        content=csv_content,
-        media_type="text/csv; charset=utf-8",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
-    )
+    return csv_streaming_response(DETAILED_TASK_COLUMNS, rows, filename, "detailed_tasks")
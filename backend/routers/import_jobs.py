@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from sqlalchemy.orm import Session
+from sqlalchemy import desc
+from typing import Optional
+import logging
+
+from database import get_db
+from models import ImportJobDB
+from services import import_jobs
+
+router = APIRouter(prefix="/import-jobs", tags=["import-jobs"])
+logger = logging.getLogger(__name__)
+
+
+def start_import_job(db: Session, kind: str, filename: str, contents: bytes) -> dict:
+    """업로드 파일로 백그라운드 작업을 만들고 접수 응답 본문을 반환합니다."""
+    try:
+        job = import_jobs.enqueue(db, kind, filename, contents)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"일괄 등록 작업 생성 중 오류가 발생했습니다: {str(e)}")
+
+    return {
+        "success": True,
+        "message": "일괄 등록 작업이 접수되었습니다. 작업 상태 API로 진행 상황을 확인하세요.",
+        "data": import_jobs.job_to_dict(job, include_failures=False),
+    }
+
+
+@router.post("/detailed-tasks", status_code=202)
+def create_detailed_task_import_job(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """상세 업무 파일(csv/xlsx) 일괄 등록을 백그라운드 작업으로 접수합니다."""
+    return start_import_job(db, "detailed_tasks", file.filename, file.file.read())
+
+
+@router.post("/projects", status_code=202)
+def create_project_import_job(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """프로젝트 파일(csv/json) 일괄 등록을 백그라운드 작업으로 접수합니다."""
+    return start_import_job(db, "projects", file.filename, file.file.read())
+
+
+@router.get("/")
+def list_import_jobs(
+    kind: Optional[str] = Query(None, description="작업 종류 (detailed_tasks/projects)"),
+    status: Optional[str] = Query(None, description="작업 상태 (queued/running/completed/failed)"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """최근 일괄 등록 작업 목록을 조회합니다. (행 단위 실패 목록 제외)"""
+    query = db.query(ImportJobDB)
+    if kind:
+        query = query.filter(ImportJobDB.kind == kind)
+    if status:
+        query = query.filter(ImportJobDB.status == status)
+
+    jobs = query.order_by(desc(ImportJobDB.created_at)).limit(limit).all()
+    return [import_jobs.job_to_dict(job, include_failures=False) for job in jobs]
+
+
+@router.get("/{job_id}")
+def get_import_job(job_id: str, db: Session = Depends(get_db)):
+    """일괄 등록 작업의 상태, 처리 행 수, 처리 속도, 행 단위 실패 목록을 조회합니다."""
+    job = db.get(ImportJobDB, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="일괄 등록 작업을 찾을 수 없습니다")
+    return import_jobs.job_to_dict(job)
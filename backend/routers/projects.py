@@ -1,7 +1,7 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Request
 from fastapi.responses import Response
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import desc, distinct, func, inspect
 from sqlalchemy.exc import OperationalError
 from typing import List, Optional, Dict, Any
@@ -15,6 +15,8 @@ from database import get_db, engine, Base
 from models import (
     ProjectDB,
     WeeklyReportDB,
+    DetailedTaskDB,
+    WBSTaskDB,
     ProjectCreate,
     ProjectUpdate,
     ProjectResponse,
@@ -23,6 +25,8 @@ from models import (
     ProjectStatus,
     ProjectPriority,
 )
+from services import rollups, project_import, project_cache, change_versions, change_feed, name_index
+from routers import import_jobs
 
 logger = logging.getLogger(__name__)
 
@@ -111,6 +115,9 @@ def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
     )
 
     db.add(db_project)
+    db.flush()
+    project_cache.invalidate(db)
+    change_feed.record(db, change_feed.PROJECT, change_feed.CREATED, db_project.id)
     db.commit()
     db.refresh(db_project)
 
@@ -119,12 +126,17 @@ def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
 
 @router.get("/", response_model=List[ProjectResponse])
 def get_projects(
+    request: Request,
+    response: Response,
     status: Optional[ProjectStatus] = Query(None, description="상태별 필터"),
     priority: Optional[ProjectPriority] = Query(None, description="우선순위별 필터"),
     manager: Optional[str] = Query(None, description="매니저별 필터"),
     db: Session = Depends(get_db),
 ):
-    """프로젝트 목록을 조회합니다."""
+    """프로젝트 목록을 조회합니다. (변경이 없으면 If-None-Match/If-Modified-Since에 304)"""
+    unchanged = change_versions.not_modified(request, response, db, [change_versions.PROJECTS])
+    if unchanged:
+        return unchanged
 
     def _get_projects_operation(db_session):
         query = db_session.query(ProjectDB)
@@ -135,7 +147,7 @@ def get_projects(
         if priority:
             query = query.filter(ProjectDB.priority == priority)
         if manager:
-            query = query.filter(ProjectDB.manager.ilike(f"%{manager}%"))
+            query = query.filter(ProjectDB.manager.in_(name_index.matching_values(db_session, name_index.MANAGER, manager)))
 
         return query.order_by(desc(ProjectDB.updated_at)).all()
 
@@ -161,34 +173,17 @@ def get_project(project_id: int, db: Session = Depends(get_db)):
     if not project:
         raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다.")
 
-    # 프로젝트 통계 계산 (✨ SQLAlchemy relationship 정상 사용)
-    reports = project.weekly_reports  # ✨ 이제 정상 작동!
-
-    if reports:
-        total_weeks = len(set(report.week for report in reports))
-        latest_week = max(report.week for report in reports)
-        total_reports = len(reports)
-        current_issues = len([r for r in reports if r.issues_risks and r.issues_risks.strip()])
-        stages = list(set(report.stage for report in reports))
-
-        # 완료율 계산
-        completed_reports = len(
-            [
-                r
-                for r in reports
-                if not r.next_week_plan
-                or any(keyword in r.next_week_plan.lower() for keyword in ["완료", "종료", "마무리", "끝", "완성"])
-            ]
-        )
-        completion_rate = (completed_reports / len(reports)) * 100 if reports else 0
+    # 프로젝트 통계 (쓰기 시점에 갱신되는 집계 테이블에서 조회)
+    rollup = rollups.get_project_rollup(db, project.id)
 
+    if rollup.report_count:
         stats = ProjectStats(
-            total_weeks=total_weeks,
-            latest_week=latest_week,
-            total_reports=total_reports,
-            current_issues=current_issues,
-            completion_rate=round(completion_rate, 1),
-            stages=stages,
+            total_weeks=rollup.week_count,
+            latest_week=rollup.latest_week,
+            total_reports=rollup.report_count,
+            current_issues=rollup.issue_count,
+            completion_rate=round((rollup.completed_report_count / rollup.report_count) * 100, 1),
+            stages=rollups.project_rollup_stages(rollup),
         )
     else:
         stats = ProjectStats(
@@ -272,12 +267,22 @@ def update_project(project_id: int, project_update: ProjectUpdate, db: Session =
 
     # 🎉 Integer FK 덕분에 더 이상 수동 업데이트 불필요!
     # SQLAlchemy relationship이 자동으로 참조 무결성을 관리합니다.
+    renamed = "name" in update_data and update_data["name"] != db_project.name
 
     # 필드 업데이트
     for field, value in update_data.items():
         setattr(db_project, field, value)
 
     db_project.updated_at = datetime.utcnow()
+
+    # 프로젝트명이 바뀌면 이름을 담고 있는 주차/담당자 집계 갱신
+    if renamed:
+        weeks, assignees = rollups.project_dependents(db, project_id)
+        rollups.refresh_for_project(db, project_id, weeks, assignees)
+
+    # 이름 캐시와 프로젝트 조회 ETag가 쓰는 변경 버전 갱신
+    project_cache.invalidate(db)
+    change_feed.record(db, change_feed.PROJECT, change_feed.UPDATED, project_id)
     db.commit()
     db.refresh(db_project)
 
@@ -288,14 +293,37 @@ def update_project(project_id: int, project_update: ProjectUpdate, db: Session =
 def delete_project(project_id: int, db: Session = Depends(get_db)):
     """프로젝트를 삭제합니다."""
 
-    db_project = db.query(ProjectDB).filter(ProjectDB.id == project_id).first()
+    # 보고서/업무와 그 연결 컬렉션을 미리 일괄 로드 (cascade 삭제 시 객체마다 컬렉션을 읽지 않도록)
+    db_project = (
+        db.query(ProjectDB)
+        .options(
+            selectinload(ProjectDB.weekly_reports).selectinload(WeeklyReportDB.detailed_tasks),
+            selectinload(ProjectDB.detailed_tasks).selectinload(DetailedTaskDB.weekly_reports),
+        )
+        .filter(ProjectDB.id == project_id)
+        .first()
+    )
     if not db_project:
         raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다.")
 
     # 🎉 cascade="all, delete-orphan" 덕분에 관련 데이터 자동 삭제!
     # SQLAlchemy가 relationship을 통해 연관된 보고서와 업무를 자동으로 삭제합니다.
+    weeks, assignees = rollups.project_dependents(db, project_id)
+
+    # 함께 삭제되는 하위 데이터도 변경 이벤트로 알림 (구독자가 화면에서 제거하도록)
+    deleted_ids = {
+        change_feed.WEEKLY_REPORT: [report.id for report in db_project.weekly_reports],
+        change_feed.DETAILED_TASK: [task.id for task in db_project.detailed_tasks],
+        change_feed.WBS_TASK: [row[0] for row in db.query(WBSTaskDB.id).filter(WBSTaskDB.project_id == project_id)],
+    }
 
     db.delete(db_project)
+    rollups.refresh_for_project(db, project_id, weeks, assignees, deleted=True)
+    project_cache.invalidate(db)
+    change_versions.bump(db, change_versions.WEEKLY_REPORTS, change_versions.wbs_key(project_id))
+    change_feed.record(db, change_feed.PROJECT, change_feed.DELETED, project_id)
+    for entity, entity_ids in deleted_ids.items():
+        change_feed.record(db, entity, change_feed.DELETED, entity_ids, project_id)
     db.commit()
 
     return {"message": "프로젝트가 성공적으로 삭제되었습니다."}
@@ -306,7 +334,7 @@ def get_projects_overview(db: Session = Depends(get_db)):
     """프로젝트 전체 개요 통계를 조회합니다."""
 
     total_projects = db.query(ProjectDB).count()
-    active_projects = db.query(ProjectDB).filter(ProjectDB.status == ProjectStatus.IN_PROGRESS).count()
+    active_projects = db.query(ProjectDB).filter(ProjectDB.status == ProjectStatus.ACTIVE).count()
     completed_projects = db.query(ProjectDB).filter(ProjectDB.status == ProjectStatus.COMPLETED).count()
 
     # 상태별 통계
@@ -435,12 +463,22 @@ async def validate_upload_data(file: UploadFile = File(...)):
 
 
 @router.post("/upload/import")
-async def import_projects(file: UploadFile = File(...), db: Session = Depends(get_db)):
+async def import_projects(
+    response: Response,
+    file: UploadFile = File(...),
+    background: bool = Query(False, description="True이면 백그라운드 작업으로 접수하고 작업 ID를 반환"),
+    db: Session = Depends(get_db),
+):
     """검증된 프로젝트 데이터를 실제로 등록합니다."""
 
-    try:
-        contents = await file.read()
+    contents = await file.read()
+
+    # 대용량 파일은 백그라운드 작업으로 처리 (/import-jobs/{job_id}로 진행 상황 조회)
+    if background:
+        response.status_code = 202
+        return import_jobs.start_import_job(db, "projects", file.filename, contents)
 
+    try:
         # 파일 형식별 파싱
         if file.filename.endswith(".csv"):
             df = pd.read_csv(io.StringIO(contents.decode("utf-8")))
@@ -450,58 +488,23 @@ async def import_projects(file: UploadFile = File(...), db: Session = Depends(ge
         else:
             raise HTTPException(status_code=400, detail="지원하지 않는 파일 형식입니다.")
 
-        created_projects = []
-        errors = []
-
-        for idx, row in df.iterrows():
-            try:
-                # 중복 체크
-                existing_project = db.query(ProjectDB).filter(ProjectDB.name == str(row["name"]).strip()).first()
-                if existing_project:
-                    errors.append({"row": idx + 2, "error": f"프로젝트 '{row['name']}'는 이미 존재합니다"})
-                    continue
-
-                # 날짜 변환
-                start_date = None
-                end_date = None
-
-                if "start_date" in row and not pd.isna(row["start_date"]):
-                    start_date = datetime.strptime(str(row["start_date"]), "%Y-%m-%d").date()
-
-                if "end_date" in row and not pd.isna(row["end_date"]):
-                    end_date = datetime.strptime(str(row["end_date"]), "%Y-%m-%d").date()
-
-                # 프로젝트 생성
-                project = ProjectDB(
-                    name=str(row["name"]).strip(),
-                    description=str(row.get("description", "")),
-                    start_date=start_date,
-                    end_date=end_date,
-                    status=str(row.get("status", "planning")).lower(),
-                    priority=str(row.get("priority", "medium")).lower(),
-                    manager=str(row.get("manager", "")),
-                    team_members=str(row.get("team_members", "")),
-                    budget=float(row["budget"]) if "budget" in row and not pd.isna(row["budget"]) else None,
-                    notes=str(row.get("notes", "")),
-                )
-
-                db.add(project)
-                created_projects.append(project.name)
-
-            except Exception as e:
-                errors.append({"row": idx + 2, "error": str(e)})
+        if "name" not in df.columns:
+            raise HTTPException(status_code=400, detail="필수 컬럼이 누락되었습니다: name")
 
-        if created_projects:
-            db.commit()
+        # 기존 프로젝트명 일괄 조회 후 한 번에 커밋
+        result = project_import.import_projects(db, df)
 
         return {
             "success": True,
-            "created_count": len(created_projects),
-            "error_count": len(errors),
-            "created_projects": created_projects,
-            "errors": errors,
+            "created_count": len(result["created_projects"]),
+            "error_count": len(result["errors"]),
+            "created_projects": result["created_projects"],
+            "errors": result["errors"],
         }
 
+    except HTTPException:
+        # HTTP 예외는 다시 던짐
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"데이터 등록 중 오류가 발생했습니다: {str(e)}")
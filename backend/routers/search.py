@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from database import get_db
+from services import name_index, project_cache, search_index
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("/")
+def search(
+    q: str = Query(..., min_length=1, max_length=200, description="검색어 (단어별 접두어 검색, 모든 단어 포함)"),
+    types: Optional[str] = Query(None, description="콤마로 구분한 검색 대상 (weekly_report, detailed_task)"),
+    project: Optional[str] = Query(None, description="이 프로젝트 안에서만 검색 (프로젝트명)"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """주간 보고서(단계/금주 실적/차주 계획/이슈)와 상세 업무(업무 항목/단계/담당자/설명)를 전문 검색합니다.
+
+    결과는 관련도 순이며, snippet에는 일치한 부분이 <mark>로 표시됩니다. (나머지 텍스트는 HTML 이스케이프)
+    """
+    search_types = search_index.SEARCH_TYPES
+    if types:
+        search_types = tuple(dict.fromkeys(value.strip() for value in types.split(",") if value.strip()))
+        unknown = set(search_types) - set(search_index.SEARCH_TYPES)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"알 수 없는 검색 대상입니다: {', '.join(sorted(unknown))}")
+
+    project_id = None
+    if project:
+        project_id = project_cache.project_id_for_name(db, project)
+        if project_id is None:
+            raise HTTPException(status_code=404, detail=f"프로젝트 '{project}'를 찾을 수 없습니다.")
+
+    try:
+        hits = search_index.search(db, q, search_types, project_id, limit)
+    except search_index.InvalidSearchQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except search_index.SearchUnavailableError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    for hit in hits:
+        hit["project"] = project_cache.project_name_for_id(db, hit["project_id"])
+
+    return {"query": q, "count": len(hits), "results": hits}
+
+
+@router.get("/typeahead/{kind}", response_model=List[str])
+def typeahead(
+    kind: str,
+    q: str = Query("", max_length=100, description="입력 중인 값 (비어 있으면 많이 쓰인 값)"),
+    limit: int = Query(10, ge=1, le=50),
+    fuzzy: bool = Query(True, description="일치하는 값이 부족하면 비슷한 값(오타 허용)도 포함"),
+    db: Session = Depends(get_db),
+):
+    """선택 상자 자동 완성 후보를 반환합니다. kind: project, manager, stage, assignee
+
+    앞부분 일치 → 부분 일치 → 비슷한 값 순이며, 같은 순위는 많이 쓰인 값이 먼저입니다.
+    """
+    if kind not in name_index.KINDS:
+        raise HTTPException(status_code=404, detail=f"알 수 없는 자동 완성 대상입니다: {kind}")
+    return name_index.suggest(db, kind, q, limit, fuzzy)
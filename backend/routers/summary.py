@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import desc, func, distinct, and_, case, or_
 from database import get_db
 from models import WeeklyReportDB, DetailedTaskDB, ProjectDB, TaskStatus
+from services import rollups, project_cache, change_versions
 from typing import List, Dict, Any, Optional
 import logging
 
@@ -37,20 +38,14 @@ def get_project_summary(project_name: str, db: Session = Depends(get_db)):
     """특정 프로젝트의 요약 정보를 조회합니다."""
 
     # ProjectDB에서 프로젝트 조회
-    project = db.query(ProjectDB).filter(ProjectDB.name == project_name).first()
-    if not project:
+    project_id = project_cache.project_id_for_name(db, project_name)
+    if project_id is None:
         raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다.")
 
-    # 관련된 보고서들 조회 (relationship 사용)
-    reports = (
-        db.query(WeeklyReportDB)
-        .options(joinedload(WeeklyReportDB.project_obj))
-        .filter(WeeklyReportDB.project_id == project.id)
-        .order_by(WeeklyReportDB.week)
-        .all()
-    )
+    # 쓰기 시점에 갱신되는 집계 테이블에서 조회
+    rollup = rollups.get_project_rollup(db, project_id)
 
-    if not reports:
+    if not rollup.report_count:
         return {
             "project_name": project_name,
             "total_weeks": 0,
@@ -62,32 +57,17 @@ def get_project_summary(project_name: str, db: Session = Depends(get_db)):
             "weeks": [],
         }
 
-    # 기본 통계 계산
-    weeks = list(set(report.week for report in reports))
-    total_weeks = len(weeks)
-    latest_week = max(weeks)
-    stages = list(set(report.stage for report in reports))
-    current_issues = len([report for report in reports if report.issues_risks and report.issues_risks.strip()])
-
-    # 완료율 계산 (간단한 휴리스틱)
-    completed_reports = 0
-    for report in reports:
-        if report.next_week_plan:
-            next_plan_lower = report.next_week_plan.lower()
-            if any(keyword in next_plan_lower for keyword in ["완료", "종료", "마무리", "끝", "finish", "complete"]):
-                completed_reports += 1
-
-    completion_rate = (completed_reports / len(reports)) * 100 if reports else 0
+    completion_rate = (rollup.completed_report_count / rollup.report_count) * 100
 
     return {
         "project_name": project_name,
-        "total_weeks": total_weeks,
-        "latest_week": latest_week,
-        "current_issues": current_issues,
+        "total_weeks": rollup.week_count,
+        "latest_week": rollup.latest_week,
+        "current_issues": rollup.issue_count,
         "completion_rate": round(completion_rate, 1),
-        "stages": stages,
-        "report_count": len(reports),
-        "weeks": sorted(weeks, reverse=True),
+        "stages": rollups.project_rollup_stages(rollup),
+        "report_count": rollup.report_count,
+        "weeks": rollups.project_rollup_weeks(rollup),
     }
 
 
@@ -95,15 +75,10 @@ def get_project_summary(project_name: str, db: Session = Depends(get_db)):
 def get_week_summary(week: str, db: Session = Depends(get_db)):
     """특정 주차의 요약 정보를 조회합니다."""
 
-    reports = (
-        db.query(WeeklyReportDB)
-        .options(joinedload(WeeklyReportDB.project_obj))
-        .filter(WeeklyReportDB.week == week)
-        .order_by(WeeklyReportDB.project_obj.name, WeeklyReportDB.stage)
-        .all()
-    )
+    # 쓰기 시점에 갱신되는 집계 테이블에서 조회
+    rollup = rollups.get_week_rollup(db, week)
 
-    if not reports:
+    if rollup is None:
         return {
             "week": week,
             "total_projects": 0,
@@ -113,39 +88,24 @@ def get_week_summary(week: str, db: Session = Depends(get_db)):
             "project_list": [],
         }
 
-    # 프로젝트별 그룹핑
-    project_groups = {}
-    for report in reports:
-        project_name = report.project_obj.name
-        if project_name not in project_groups:
-            project_groups[project_name] = []
-        project_groups[project_name].append(report)
-
-    # 통계 계산
-    total_projects = len(project_groups)
-    total_stages = len(reports)
-    projects_with_issues = 0
-    total_issues = 0
-
-    for project_name, project_reports in project_groups.items():
-        has_issues = any(r.issues_risks and r.issues_risks.strip() for r in project_reports)
-        if has_issues:
-            projects_with_issues += 1
-        total_issues += len([r for r in project_reports if r.issues_risks and r.issues_risks.strip()])
-
     return {
         "week": week,
-        "total_projects": total_projects,
-        "total_stages": total_stages,
-        "projects_with_issues": projects_with_issues,
-        "total_issues": total_issues,
-        "project_list": list(project_groups.keys()),
+        "total_projects": rollup.project_count,
+        "total_stages": rollup.report_count,
+        "projects_with_issues": rollup.projects_with_issues,
+        "total_issues": rollup.issue_count,
+        "project_list": rollups.week_rollup_projects(rollup),
     }
 
 
 @router.get("/dashboard")
-def get_dashboard_summary(db: Session = Depends(get_db)):
-    """전체 대시보드 요약 정보를 조회합니다."""
+def get_dashboard_summary(request: Request, response: Response, db: Session = Depends(get_db)):
+    """전체 대시보드 요약 정보를 조회합니다. (변경이 없으면 집계 없이 304)"""
+    unchanged = change_versions.not_modified(
+        request, response, db, [change_versions.PROJECTS, change_versions.WEEKLY_REPORTS]
+    )
+    if unchanged:
+        return unchanged
 
     # 기본 통계
     total_projects = db.query(ProjectDB).count()
@@ -184,94 +144,113 @@ def get_dashboard_summary(db: Session = Depends(get_db)):
 def get_enhanced_dashboard(db: Session = Depends(get_db)):
     """상세 업무 시트 데이터까지 포함한 종합 대시보드 정보를 조회합니다."""
 
-    total_reports = db.query(WeeklyReportDB).count()
-    total_projects_from_reports = db.query(distinct(WeeklyReportDB.project_id)).count()
-    total_weeks = db.query(distinct(WeeklyReportDB.week)).count()
-    reports_with_issues = (
-        db.query(WeeklyReportDB)
-        .filter(WeeklyReportDB.issues_risks.isnot(None), WeeklyReportDB.issues_risks != "")
-        .count()
-    )
-
-    total_detailed_tasks = db.query(DetailedTaskDB).count()
-    total_projects_from_tasks = db.query(distinct(DetailedTaskDB.project_id)).count()
-
-    task_status_stats = {}
-    for status in TaskStatus:
-        count = db.query(DetailedTaskDB).filter(DetailedTaskDB.current_status == status).count()
-        task_status_stats[status.value] = count
-
-    progress_stats = {
-        "not_started": db.query(DetailedTaskDB).filter(DetailedTaskDB.progress_rate == 0).count(),
-        "in_progress": db.query(DetailedTaskDB)
-        .filter(and_(DetailedTaskDB.progress_rate > 0, DetailedTaskDB.progress_rate < 100))
-        .count(),
-        "completed": db.query(DetailedTaskDB).filter(DetailedTaskDB.progress_rate == 100).count(),
-    }
-
-    tasks_with_risk = db.query(DetailedTaskDB).filter(DetailedTaskDB.has_risk == True).count()
-
-    avg_progress_result = db.query(func.avg(DetailedTaskDB.progress_rate)).scalar()
-    avg_progress = round(avg_progress_result, 1) if avg_progress_result else 0.0
-
-    assignee_stats = (
+    # 주간 보고서 통계 (단일 집계 쿼리)
+    report_totals = db.query(
+        func.count(WeeklyReportDB.id),
+        func.count(distinct(WeeklyReportDB.project_id)),
+        func.count(distinct(WeeklyReportDB.week)),
+        func.sum(case((and_(WeeklyReportDB.issues_risks.isnot(None), WeeklyReportDB.issues_risks != ""), 1), else_=0)),
+    ).one()
+    total_reports, total_projects_from_reports, total_weeks, reports_with_issues = report_totals
+    reports_with_issues = reports_with_issues or 0
+
+    # 상세 업무 통계: (프로젝트, 담당자, 상태) 단위로 한 번만 스캔한 뒤 Python에서 각 버킷으로 롤업
+    task_groups = (
         db.query(
+            DetailedTaskDB.project_id,
+            ProjectDB.name,
             DetailedTaskDB.assignee,
-            func.count(DetailedTaskDB.id).label("task_count"),
-            func.avg(DetailedTaskDB.progress_rate).label("avg_progress"),
+            DetailedTaskDB.current_status,
+            func.count(DetailedTaskDB.id),
+            func.sum(DetailedTaskDB.progress_rate),
+            func.count(DetailedTaskDB.progress_rate),
+            func.sum(case((DetailedTaskDB.has_risk == True, 1), else_=0)),
+            func.sum(case((DetailedTaskDB.progress_rate == 0, 1), else_=0)),
+            func.sum(case((and_(DetailedTaskDB.progress_rate > 0, DetailedTaskDB.progress_rate < 100), 1), else_=0)),
+            func.sum(case((DetailedTaskDB.progress_rate == 100, 1), else_=0)),
         )
-        .filter(DetailedTaskDB.assignee.isnot(None), DetailedTaskDB.assignee != "")
-        .group_by(DetailedTaskDB.assignee)
-        .order_by(desc("task_count"))
-        .limit(10)
+        .outerjoin(ProjectDB, ProjectDB.id == DetailedTaskDB.project_id)
+        .group_by(DetailedTaskDB.project_id, ProjectDB.name, DetailedTaskDB.assignee, DetailedTaskDB.current_status)
         .all()
     )
 
-    assignee_distribution = []
-    for assignee, task_count, avg_progress in assignee_stats:
-        assignee_distribution.append(
-            {
-                "assignee": assignee,
-                "task_count": task_count,
-                "avg_progress": round(avg_progress, 1) if avg_progress else 0.0,
-            }
-        )
+    total_detailed_tasks = 0
+    tasks_with_risk = 0
+    progress_sum = 0.0
+    progress_count = 0
+    task_project_ids = set()
+    task_status_stats = {status.value: 0 for status in TaskStatus}
+    progress_stats = {"not_started": 0, "in_progress": 0, "completed": 0}
+    assignee_buckets: Dict[str, Dict[str, float]] = {}
+    project_buckets: Dict[str, Dict[str, float]] = {}
+
+    for (
+        project_id,
+        project_name,
+        assignee,
+        status,
+        task_count,
+        group_progress_sum,
+        group_progress_count,
+        risk_count,
+        not_started_count,
+        in_progress_count,
+        completed_count,
+    ) in task_groups:
+        group_progress_sum = group_progress_sum or 0.0
+        risk_count = risk_count or 0
+
+        total_detailed_tasks += task_count
+        tasks_with_risk += risk_count
+        progress_sum += group_progress_sum
+        progress_count += group_progress_count
+        task_project_ids.add(project_id)
+
+        if status is not None:
+            task_status_stats[status.value] += task_count
+
+        progress_stats["not_started"] += not_started_count or 0
+        progress_stats["in_progress"] += in_progress_count or 0
+        progress_stats["completed"] += completed_count or 0
+
+        if assignee:
+            bucket = assignee_buckets.setdefault(assignee, {"task_count": 0, "progress_sum": 0.0, "progress_count": 0})
+            bucket["task_count"] += task_count
+            bucket["progress_sum"] += group_progress_sum
+            bucket["progress_count"] += group_progress_count
+
+        if project_name is not None:
+            bucket = project_buckets.setdefault(
+                project_name, {"total_tasks": 0, "progress_sum": 0.0, "progress_count": 0, "risk_tasks": 0}
+            )
+            bucket["total_tasks"] += task_count
+            bucket["progress_sum"] += group_progress_sum
+            bucket["progress_count"] += group_progress_count
+            bucket["risk_tasks"] += risk_count
 
-    # 프로젝트별 기본 통계 (관계 활용)
-    project_basic_stats = (
-        db.query(
-            ProjectDB.name,
-            func.count(DetailedTaskDB.id).label("total_tasks"),
-            func.avg(DetailedTaskDB.progress_rate).label("avg_progress"),
-        )
-        .join(DetailedTaskDB, ProjectDB.id == DetailedTaskDB.project_id)
-        .group_by(ProjectDB.name)
-        .order_by(desc("total_tasks"))
-        .limit(5)
-        .all()
-    )
+    def _average(progress_total: float, count: int) -> float:
+        return round(progress_total / count, 1) if count and progress_total else 0.0
 
-    project_risk_stats = {}
-    for project_name, _, _ in project_basic_stats:
-        risk_count = (
-            db.query(func.count(DetailedTaskDB.id))
-            .join(ProjectDB, ProjectDB.id == DetailedTaskDB.project_id)
-            .filter(ProjectDB.name == project_name)
-            .filter(DetailedTaskDB.has_risk == True)
-            .scalar()
-        ) or 0
-        project_risk_stats[project_name] = risk_count
-
-    project_overview = []
-    for project_name, total_tasks, avg_progress in project_basic_stats:
-        project_overview.append(
-            {
-                "project": project_name,
-                "total_tasks": total_tasks,
-                "avg_progress": round(avg_progress, 1) if avg_progress else 0.0,
-                "risk_tasks": project_risk_stats.get(project_name, 0),
-            }
-        )
+    avg_progress = _average(progress_sum, progress_count)
+
+    assignee_distribution = [
+        {
+            "assignee": assignee,
+            "task_count": bucket["task_count"],
+            "avg_progress": _average(bucket["progress_sum"], bucket["progress_count"]),
+        }
+        for assignee, bucket in sorted(assignee_buckets.items(), key=lambda item: (-item[1]["task_count"], item[0]))[:10]
+    ]
+
+    project_overview = [
+        {
+            "project": project_name,
+            "total_tasks": bucket["total_tasks"],
+            "avg_progress": _average(bucket["progress_sum"], bucket["progress_count"]),
+            "risk_tasks": bucket["risk_tasks"],
+        }
+        for project_name, bucket in sorted(project_buckets.items(), key=lambda item: (-item[1]["total_tasks"], item[0]))[:5]
+    ]
 
     # 최근 업무 업데이트 (프로젝트명 포함)
     recent_task_updates = (
@@ -297,7 +276,7 @@ def get_enhanced_dashboard(db: Session = Depends(get_db)):
 
     return {
         "overview": {
-            "total_projects": max(total_projects_from_reports, total_projects_from_tasks),
+            "total_projects": max(total_projects_from_reports, len(task_project_ids)),
             "total_reports": total_reports,
             "total_weeks": total_weeks,
             "total_detailed_tasks": total_detailed_tasks,
@@ -320,18 +299,18 @@ def get_enhanced_project_summary(project_name: str, db: Session = Depends(get_db
     """특정 프로젝트의 주간 보고서와 상세 업무를 통합한 요약 정보를 조회합니다."""
 
     # 프로젝트 확인
-    project = db.query(ProjectDB).filter(ProjectDB.name == project_name).first()
-    if not project:
+    project_id = project_cache.project_id_for_name(db, project_name)
+    if project_id is None:
         return {"project": project_name, "found": False, "message": "해당 프로젝트를 찾을 수 없습니다."}
 
     # 프로젝트 ID로 데이터 조회
     reports = (
-        db.query(WeeklyReportDB).filter(WeeklyReportDB.project_id == project.id).order_by(WeeklyReportDB.week).all()
+        db.query(WeeklyReportDB).filter(WeeklyReportDB.project_id == project_id).order_by(WeeklyReportDB.week).all()
     )
 
     detailed_tasks = (
         db.query(DetailedTaskDB)
-        .filter(DetailedTaskDB.project_id == project.id)
+        .filter(DetailedTaskDB.project_id == project_id)
         .order_by(DetailedTaskDB.planned_end_date, DetailedTaskDB.created_at)
         .all()
     )
@@ -420,78 +399,29 @@ def get_enhanced_project_summary(project_name: str, db: Session = Depends(get_db
 def get_assignee_summary(assignee_name: str, db: Session = Depends(get_db)):
     """특정 담당자의 업무 요약 정보를 조회합니다."""
 
-    # 담당자의 모든 업무 조회
-    tasks = (
-        db.query(DetailedTaskDB)
-        .options(joinedload(DetailedTaskDB.project_obj))
-        .filter(DetailedTaskDB.assignee == assignee_name)
-        .all()
-    )
+    # 쓰기 시점에 갱신되는 집계 테이블에서 조회
+    rollup = rollups.get_assignee_rollup(db, assignee_name)
 
-    if not tasks:
+    if rollup is None:
         return {
             "assignee": assignee_name,
             "found": False,
             "message": f"담당자 '{assignee_name}'의 업무를 찾을 수 없습니다.",
         }
 
-    # 기본 통계
-    total_tasks = len(tasks)
-    completed_tasks = len([t for t in tasks if t.progress_rate >= 100])
-    in_progress_tasks = len([t for t in tasks if 0 < t.progress_rate < 100])
-    not_started_tasks = len([t for t in tasks if t.progress_rate == 0])
-    tasks_with_risk = len([t for t in tasks if t.has_risk])
-    avg_progress = round(sum(t.progress_rate for t in tasks) / total_tasks, 1) if tasks else 0.0
-
-    # 프로젝트별 분류
-    project_breakdown = {}
-    for task in tasks:
-        project_name = task.project_obj.name
-        if project_name not in project_breakdown:
-            project_breakdown[project_name] = {
-                "total": 0,
-                "completed": 0,
-                "in_progress": 0,
-                "with_risk": 0,
-                "avg_progress": 0.0,
-            }
-
-        project_breakdown[project_name]["total"] += 1
-        if task.progress_rate >= 100:
-            project_breakdown[project_name]["completed"] += 1
-        elif task.progress_rate > 0:
-            project_breakdown[project_name]["in_progress"] += 1
-        if task.has_risk:
-            project_breakdown[project_name]["with_risk"] += 1
-
-    for project_name in project_breakdown:
-        project_tasks = [t for t in tasks if t.project_obj.name == project_name]
-        if project_tasks:
-            project_breakdown[project_name]["avg_progress"] = round(
-                sum(t.progress_rate for t in project_tasks) / len(project_tasks), 1
-            )
-
-    # 상태별 분류
-    status_breakdown = {}
-    for task in tasks:
-        status = task.current_status.value
-        if status not in status_breakdown:
-            status_breakdown[status] = 0
-        status_breakdown[status] += 1
-
     return {
         "assignee": assignee_name,
         "found": True,
         "summary": {
-            "total_tasks": total_tasks,
-            "completed_tasks": completed_tasks,
-            "in_progress_tasks": in_progress_tasks,
-            "not_started_tasks": not_started_tasks,
-            "tasks_with_risk": tasks_with_risk,
-            "avg_progress": avg_progress,
+            "total_tasks": rollup.task_count,
+            "completed_tasks": rollup.completed_count,
+            "in_progress_tasks": rollup.in_progress_count,
+            "not_started_tasks": rollup.not_started_count,
+            "tasks_with_risk": rollup.risk_count,
+            "avg_progress": rollup.avg_progress,
         },
-        "project_breakdown": project_breakdown,
-        "status_breakdown": status_breakdown,
+        "project_breakdown": rollups.assignee_rollup_projects(rollup),
+        "status_breakdown": rollups.assignee_rollup_statuses(rollup),
     }
 
 
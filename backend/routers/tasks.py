@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, or_, desc
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 from database import get_db
 from models import (
@@ -9,18 +10,31 @@ from models import (
     WeeklyReportCreate,
     WeeklyReportUpdate,
     WeeklyReportFilter,
-    ProjectDB,
+    DetailedTaskDB,
 )
+from services import rollups, report_completion, pagination, project_cache, change_versions, change_feed, task_links, name_index
 
 router = APIRouter(prefix="/weekly-reports", tags=["weekly-reports"])
 
 
-def get_project_by_name(db: Session, project_name: str) -> ProjectDB:
-    """프로젝트명으로 프로젝트 객체를 조회합니다."""
-    project = db.query(ProjectDB).filter(ProjectDB.name == project_name).first()
-    if not project:
+def get_project_id_by_name(db: Session, project_name: str) -> int:
+    """프로젝트명으로 프로젝트 ID를 조회합니다. (프로젝트 캐시 사용)"""
+    project_id = project_cache.project_id_for_name(db, project_name)
+    if project_id is None:
         raise HTTPException(status_code=404, detail=f"프로젝트 '{project_name}'를 찾을 수 없습니다.")
-    return project
+    return project_id
+
+
+def record_linked_task_changes(db: Session, report_id: int):
+    """연결된 상세 업무도 변경으로 기록합니다. (상세 업무 응답의 연결 보고서 목록이 바뀌므로)"""
+    task_ids = sorted(task_links.linked_task_ids_by_report(db, [report_id]).get(report_id, ()))
+    if not task_ids:
+        return
+    by_project = {}
+    for task_id, project_id in db.query(DetailedTaskDB.id, DetailedTaskDB.project_id).filter(DetailedTaskDB.id.in_(task_ids)):
+        by_project.setdefault(project_id, []).append(task_id)
+    for project_id, ids in by_project.items():
+        change_feed.record(db, change_feed.DETAILED_TASK, change_feed.UPDATED, ids, project_id)
 
 
 # 주차별 보고서 생성
@@ -29,46 +43,47 @@ def create_weekly_report(report: WeeklyReportCreate, db: Session = Depends(get_d
     """새로운 주간 보고서를 생성합니다."""
 
     # ✨ 프로젝트명을 project_id로 변환
-    project = get_project_by_name(db, report.project)
-
-    # 동일한 프로젝트-주차-단계 조합이 이미 존재하는지 확인
-    existing_report = (
-        db.query(WeeklyReportDB)
-        .filter(WeeklyReportDB.project_id == project.id)
-        .filter(WeeklyReportDB.week == report.week)
-        .filter(WeeklyReportDB.stage == report.stage)
-        .first()
-    )
-
-    if existing_report:
-        raise HTTPException(
-            status_code=400,
-            detail=f"프로젝트 '{report.project}', 주차 '{report.week}', 단계 '{report.stage}' 조합이 이미 존재합니다.",
-        )
+    project_id = get_project_id_by_name(db, report.project)
 
     # ✨ project_id를 사용하여 DB 객체 생성
     db_report = WeeklyReportDB(
-        project_id=project.id,  # ✨ Integer FK 사용
+        project_id=project_id,  # ✨ Integer FK 사용
         week=report.week,
         stage=report.stage,
         this_week_work=report.this_week_work,
         next_week_plan=report.next_week_plan,
         issues_risks=report.issues_risks,
     )
+    report_completion.classify(db_report)
 
     db.add(db_report)
+
+    # 동일한 프로젝트-주차-단계 조합은 unique 인덱스로 거부됨
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"프로젝트 '{report.project}', 주차 '{report.week}', 단계 '{report.stage}' 조합이 이미 존재합니다.",
+        )
+
+    rollups.refresh_for_reports(db, [(db_report.project_id, db_report.week)])
+    change_versions.bump(db, change_versions.WEEKLY_REPORTS)
+    change_feed.record(db, change_feed.WEEKLY_REPORT, change_feed.CREATED, db_report.id, db_report.project_id)
     db.commit()
     db.refresh(db_report)
 
     # ✨ 응답에서 프로젝트명 포함 (relationship 활용)
     response_data = WeeklyReportResponse(
         id=db_report.id,
-        project=project.name,  # ✨ 프로젝트명 직접 설정
+        project=report.project,  # ✨ 프로젝트명 직접 설정
         week=db_report.week,
         stage=db_report.stage,
         this_week_work=db_report.this_week_work,
         next_week_plan=db_report.next_week_plan,
         issues_risks=db_report.issues_risks,
+        is_completion=bool(db_report.is_completion),
         created_at=db_report.created_at,
         updated_at=db_report.updated_at,
     )
@@ -79,6 +94,7 @@ def create_weekly_report(report: WeeklyReportCreate, db: Session = Depends(get_d
 # 모든 주차별 보고서 조회 (필터링 지원)
 @router.get("/", response_model=List[WeeklyReportResponse])
 def get_weekly_reports(
+    response: Response,
     project: Optional[str] = None,
     week: Optional[str] = None,
     stage: Optional[str] = None,
@@ -86,37 +102,57 @@ def get_weekly_reports(
     end_week: Optional[str] = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값 (지정 시 offset 무시)"),
     db: Session = Depends(get_db),
 ):
-    """주간 보고서 목록을 조회합니다. (필터링 지원)"""
+    """주간 보고서 목록을 조회합니다. (필터링 지원)
+
+    다음 페이지가 있으면 X-Next-Cursor 헤더로 커서를 반환하며,
+    cursor로 조회하면 페이지 깊이와 무관하게 일정한 비용으로 조회됩니다.
+    """
 
     # ✨ relationship으로 project 정보도 함께 로드
     query = db.query(WeeklyReportDB).options(joinedload(WeeklyReportDB.project_obj))
 
-    # ✨ 프로젝트 필터링 (프로젝트명으로)
+    # ✨ 프로젝트 필터링 (프로젝트명 부분 일치, trigram 이름 색인으로 찾은 프로젝트 ID로 거름)
     if project:
-        project_obj = db.query(ProjectDB).filter(ProjectDB.name.ilike(f"%{project}%")).first()
-        if project_obj:
-            query = query.filter(WeeklyReportDB.project_id == project_obj.id)
-        else:
+        project_ids = project_cache.project_ids_for_names(db, name_index.matching_values(db, name_index.PROJECT, project))
+        if not project_ids:
             # 존재하지 않는 프로젝트면 빈 결과 반환
             return []
+        query = query.filter(WeeklyReportDB.project_id.in_(project_ids.values()))
 
     # 기타 필터링
     if week:
         query = query.filter(WeeklyReportDB.week == week)
     if stage:
-        query = query.filter(WeeklyReportDB.stage.ilike(f"%{stage}%"))
+        query = query.filter(WeeklyReportDB.stage.in_(name_index.matching_values(db, name_index.STAGE, stage)))
     if start_week:
         query = query.filter(WeeklyReportDB.week >= start_week)
     if end_week:
         query = query.filter(WeeklyReportDB.week <= end_week)
 
-    # 최신순 정렬
-    query = query.order_by(desc(WeeklyReportDB.week), desc(WeeklyReportDB.updated_at))
+    # 최신순 정렬 (동일 시각은 id로 순서 고정)
+    query = query.order_by(desc(WeeklyReportDB.week), desc(WeeklyReportDB.updated_at), desc(WeeklyReportDB.id))
+
+    # 페이징 (week, updated_at, id 키셋)
+    if cursor:
+        try:
+            sort_columns = [WeeklyReportDB.week, WeeklyReportDB.updated_at, WeeklyReportDB.id]
+            query = pagination.apply_keyset(query, sort_columns, "weekly_reports", cursor)
+        except pagination.InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        query = query.offset(offset)
 
-    # 페이징
-    reports = query.offset(offset).limit(limit).all()
+    reports = query.limit(limit + 1).all()
+
+    next_cursor = pagination.next_cursor(
+        reports, limit, "weekly_reports", lambda report: (report.week, report.updated_at, report.id)
+    )
+    if next_cursor:
+        response.headers[pagination.NEXT_CURSOR_HEADER] = next_cursor
+    reports = reports[:limit]
 
     # ✨ 응답 데이터 구성 (relationship 활용)
     response_data = []
@@ -130,6 +166,7 @@ def get_weekly_reports(
                 this_week_work=report.this_week_work,
                 next_week_plan=report.next_week_plan,
                 issues_risks=report.issues_risks,
+                is_completion=bool(report.is_completion),
                 created_at=report.created_at,
                 updated_at=report.updated_at,
             )
@@ -160,6 +197,7 @@ def get_weekly_report(report_id: int, db: Session = Depends(get_db)):
         this_week_work=report.this_week_work,
         next_week_plan=report.next_week_plan,
         issues_risks=report.issues_risks,
+        is_completion=bool(report.is_completion),
         created_at=report.created_at,
         updated_at=report.updated_at,
     )
@@ -184,39 +222,40 @@ def update_weekly_report(report_id: int, report_update: WeeklyReportUpdate, db:
     # 업데이트할 필드들
     update_data = report_update.model_dump(exclude_unset=True)
 
+    project_name = report.project_obj.name if report.project_obj else "Unknown"
+
     # ✨ 프로젝트 변경 시 project_id 업데이트
     if "project" in update_data and update_data["project"]:
-        project = get_project_by_name(db, update_data["project"])
-        update_data["project_id"] = project.id
+        update_data["project_id"] = get_project_id_by_name(db, update_data["project"])
+        project_name = update_data["project"]
         # project 필드는 제거 (DB에는 project_id만 저장)
         del update_data["project"]
 
-    # 중복 체크 (프로젝트, 주차, 단계가 변경되는 경우)
-    if any(field in update_data for field in ["project_id", "week", "stage"]):
-        project_id = update_data.get("project_id", report.project_id)
-        week = update_data.get("week", report.week)
-        stage = update_data.get("stage", report.stage)
-
-        existing_report = (
-            db.query(WeeklyReportDB)
-            .filter(WeeklyReportDB.project_id == project_id)
-            .filter(WeeklyReportDB.week == week)
-            .filter(WeeklyReportDB.stage == stage)
-            .filter(WeeklyReportDB.id != report_id)  # 현재 보고서는 제외
-            .first()
-        )
-
-        if existing_report:
-            project_name = update_data.get("project", report.project_obj.name if report.project_obj else "Unknown")
-            raise HTTPException(
-                status_code=400,
-                detail=f"프로젝트 '{project_name}', 주차 '{week}', 단계 '{stage}' 조합이 이미 존재합니다.",
-            )
+    previous_key = (report.project_id, report.week)
 
     # 필드 업데이트
     for field, value in update_data.items():
         setattr(report, field, value)
+    report_completion.classify(report)
+
+    # 프로젝트-주차-단계 중복은 unique 인덱스로 거부됨
+    week, stage = report.week, report.stage
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"프로젝트 '{project_name}', 주차 '{week}', 단계 '{stage}' 조합이 이미 존재합니다.",
+        )
 
+    rollups.refresh_for_reports(db, [previous_key, (report.project_id, report.week)])
+    change_versions.bump(db, change_versions.WEEKLY_REPORTS)
+    # 다른 프로젝트로 옮긴 경우 이전 프로젝트 구독자에게도 알림
+    for project_id in dict.fromkeys([previous_key[0], report.project_id]):
+        change_feed.record(db, change_feed.WEEKLY_REPORT, change_feed.UPDATED, report.id, project_id)
+    if "week" in update_data or "stage" in update_data:
+        record_linked_task_changes(db, report.id)
     db.commit()
     db.refresh(report)
 
@@ -228,6 +267,7 @@ def update_weekly_report(report_id: int, report_update: WeeklyReportUpdate, db:
         this_week_work=report.this_week_work,
         next_week_plan=report.next_week_plan,
         issues_risks=report.issues_risks,
+        is_completion=bool(report.is_completion),
         created_at=report.created_at,
         updated_at=report.updated_at,
     )
@@ -256,7 +296,11 @@ def delete_weekly_report(report_id: int, db: Session = Depends(get_db)):
     # ✨ Many-to-Many 관계는 SQLAlchemy가 자동으로 정리
     # cascade 설정에 의해 관련 연결들이 자동으로 정리됨
 
+    record_linked_task_changes(db, report_id)
     db.delete(report)
+    rollups.refresh_for_reports(db, [(report.project_id, week)])
+    change_versions.bump(db, change_versions.WEEKLY_REPORTS)
+    change_feed.record(db, change_feed.WEEKLY_REPORT, change_feed.DELETED, report_id, report.project_id)
     db.commit()
 
     return {"message": f"주간 보고서 '{project_name} - {week} - {stage}'가 성공적으로 삭제되었습니다."}
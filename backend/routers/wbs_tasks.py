@@ -1,35 +1,74 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from datetime import date
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from database import get_db
-from models import WBSTaskDB, WBSTaskCreate, WBSTaskUpdate, WBSTaskResponse, ProjectDB
+from models import (
+    WBSTaskDB,
+    WBSTaskCreate,
+    WBSTaskUpdate,
+    WBSTaskResponse,
+    ProjectDB,
+    WBSDependencyDB,
+    WBSDependencyCreate,
+    WBSDependencyResponse,
+    WBSScheduleResponse,
+    WBSBulkMoveRequest,
+)
+from services import change_feed, change_versions, wbs_schedule, wbs_tree
 
 router = APIRouter(
     prefix="/wbs-tasks",
     tags=["WBS Tasks"],
 )
 
+def to_response(task: WBSTaskDB, has_children: Optional[bool] = None) -> WBSTaskResponse:
+    """하위 태스크를 읽지 않고 단일 노드 응답을 만듭니다. (children 관계 지연 로딩 방지)"""
+    return WBSTaskResponse(
+        id=task.id,
+        text=task.text,
+        start_date=task.start_date,
+        end_date=task.end_date,
+        progress=task.progress,
+        deliverables=task.deliverables,
+        remarks=task.remarks,
+        parent_id=task.parent_id,
+        project_id=task.project_id,
+        sort_order=task.sort_order,
+        children=[],
+        has_children=has_children,
+        rollup_start_date=task.rollup_start_date,
+        rollup_end_date=task.rollup_end_date,
+        rollup_progress=task.rollup_progress,
+    )
+
 # Helper function to build task tree
-def build_tree(tasks: List[WBSTaskDB]) -> List[WBSTaskResponse]:
+def record_task_changes(db: Session, action: str, task: WBSTaskDB, *old_paths: Optional[str]):
+    """task 변경과 함께 일정 집계가 바뀐 상위 태스크(현재/이전 경로)를 변경 이벤트로 기록합니다."""
+    change_feed.record(db, change_feed.WBS_TASK, action, task.id, task.project_id)
+    ancestor_ids = [
+        ancestor_id
+        for tree_path in (task.tree_path, *old_paths)
+        if tree_path
+        for ancestor_id in wbs_tree.path_ids(tree_path)
+        if ancestor_id != task.id
+    ]
+    change_feed.record(db, change_feed.WBS_TASK, change_feed.UPDATED, ancestor_ids, task.project_id)
+
+
+def build_tree(tasks: List[WBSTaskDB], has_children: Optional[Dict[int, bool]] = None) -> List[WBSTaskResponse]:
+    """태스크 목록을 트리로 만듭니다. 부모가 목록에 없는 태스크는 루트가 됩니다.
+
+    has_children이 없으면 목록 안의 자식 여부로 채웁니다. (전체 트리 조회)
+    """
     task_map: Dict[int, WBSTaskResponse] = {}
     root_tasks: List[WBSTaskResponse] = []
 
     # Initialize all tasks in the map
     for task in tasks:
-        task_map[task.id] = WBSTaskResponse(
-            id=task.id,
-            text=task.text,
-            start_date=task.start_date,
-            end_date=task.end_date,
-            progress=task.progress,
-            deliverables=task.deliverables,
-            remarks=task.remarks,
-            parent_id=task.parent_id,
-            project_id=task.project_id,
-            sort_order=task.sort_order,
-            children=[]
-        )
+        task_map[task.id] = to_response(task, has_children.get(task.id) if has_children is not None else None)
 
     # Build the tree structure
     for task_id, task_node in task_map.items():
@@ -42,6 +81,8 @@ def build_tree(tasks: List[WBSTaskDB]) -> List[WBSTaskResponse]:
     # Sort children by sort_order
     for task_node in task_map.values():
         task_node.children.sort(key=lambda x: x.sort_order)
+        if task_node.has_children is None:
+            task_node.has_children = bool(task_node.children)
         
     # Sort root tasks
     root_tasks.sort(key=lambda x: x.sort_order)
@@ -49,19 +90,168 @@ def build_tree(tasks: List[WBSTaskDB]) -> List[WBSTaskResponse]:
     return root_tasks
 
 @router.get("/{project_id}", response_model=List[WBSTaskResponse])
-def get_wbs_tasks_for_project(project_id: int, db: Session = Depends(get_db)):
-    """특정 프로젝트의 모든 WBS 태스크를 계층 구조로 조회합니다."""
+def get_wbs_tasks_for_project(
+    request: Request,
+    response: Response,
+    project_id: int,
+    root: Optional[int] = Query(None, description="이 태스크를 루트로 하는 하위 트리만 조회"),
+    depth: Optional[int] = Query(None, ge=1, le=wbs_tree.MAX_WBS_DEPTH, description="루트부터 포함할 단계 수"),
+    from_date: Optional[date] = Query(None, alias="from", description="이 날짜 이후에 끝나는 태스크만 (간트 차트 표시 시작일)"),
+    to_date: Optional[date] = Query(None, alias="to", description="이 날짜 이전에 시작하는 태스크만 (간트 차트 표시 종료일)"),
+    db: Session = Depends(get_db),
+):
+    """특정 프로젝트의 WBS 태스크를 계층 구조로 조회합니다.
+
+    root/depth를 지정하면 해당 부분 트리만 조회합니다. (큰 WBS를 단계별로 펼칠 때)
+    from/to를 지정하면 그 기간과 겹치는 태스크와 상위 태스크만 조회합니다. (간트 차트에 보이는 구간만 그릴 때)
+    프로젝트 WBS가 바뀌지 않았으면 If-None-Match/If-Modified-Since에 304를 반환합니다.
+    """
+    windowed = from_date is not None or to_date is not None
+    if windowed and depth is not None:
+        raise HTTPException(status_code=400, detail="기간(from/to) 조회와 depth는 함께 사용할 수 없습니다.")
+    if from_date and to_date and from_date > to_date:
+        raise HTTPException(status_code=400, detail="시작일(from)이 종료일(to)보다 늦을 수 없습니다.")
+
     project = db.query(ProjectDB).filter(ProjectDB.id == project_id).first()
     if not project:
         raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다.")
 
-    tasks = db.query(WBSTaskDB).filter(WBSTaskDB.project_id == project_id).order_by(WBSTaskDB.sort_order).all()
-    
-    if not tasks:
-        return []
-        
-    tree = build_tree(tasks)
-    return tree
+    unchanged = change_versions.not_modified(request, response, db, [change_versions.wbs_key(project_id)])
+    if unchanged:
+        return unchanged
+
+    root_task = None
+    if root is not None:
+        root_task = db.query(WBSTaskDB).filter(WBSTaskDB.id == root, WBSTaskDB.project_id == project_id).first()
+        if not root_task:
+            raise HTTPException(status_code=404, detail="루트 태스크를 찾을 수 없습니다.")
+
+    if windowed:
+        rows = wbs_tree.fetch_window(db, project_id, from_date, to_date, root_task)
+    else:
+        rows = wbs_tree.fetch_subtree(db, project_id, root_task, depth)
+    return build_tree([task for task, _ in rows], {task.id: flag for task, flag in rows})
+
+@router.get("/{task_id}/path", response_model=List[WBSTaskResponse])
+def get_wbs_task_path(task_id: int, db: Session = Depends(get_db)):
+    """최상위 태스크부터 지정한 태스크까지의 상위 경로를 조회합니다. (하위 태스크는 포함하지 않음)"""
+    path = wbs_tree.ancestor_path(db, task_id)
+    if not path:
+        raise HTTPException(status_code=404, detail="태스크를 찾을 수 없습니다.")
+    return [to_response(task) for task in path]
+
+@router.get("/{project_id}/schedule", response_model=WBSScheduleResponse)
+def get_wbs_schedule(request: Request, response: Response, project_id: int, db: Session = Depends(get_db)):
+    """프로젝트 WBS의 집계 일정/진행률과 선후행 관계 기준 여유(slack), 주공정(critical path)을 조회합니다."""
+    project = db.query(ProjectDB).filter(ProjectDB.id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다.")
+    unchanged = change_versions.not_modified(request, response, db, [change_versions.wbs_key(project_id)])
+    if unchanged:
+        return unchanged
+    try:
+        return wbs_schedule.compute_schedule(db, project_id)
+    except wbs_schedule.InvalidDependencyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.get("/{project_id}/dependencies", response_model=List[WBSDependencyResponse])
+def get_wbs_dependencies(project_id: int, db: Session = Depends(get_db)):
+    """프로젝트의 WBS 선후행 관계 목록을 조회합니다."""
+    return db.query(WBSDependencyDB).filter(WBSDependencyDB.project_id == project_id).order_by(WBSDependencyDB.id).all()
+
+@router.post("/dependencies", response_model=WBSDependencyResponse)
+def create_wbs_dependency(dependency: WBSDependencyCreate, db: Session = Depends(get_db)):
+    """선행 태스크가 끝난 뒤(lag_days 후) 후행 태스크가 시작하는 선후행 관계를 추가합니다."""
+    if dependency.predecessor_id == dependency.successor_id:
+        raise HTTPException(status_code=400, detail="자기 자신을 선행 태스크로 지정할 수 없습니다.")
+
+    predecessor = db.query(WBSTaskDB).filter(WBSTaskDB.id == dependency.predecessor_id).first()
+    successor = db.query(WBSTaskDB).filter(WBSTaskDB.id == dependency.successor_id).first()
+    if not predecessor or not successor:
+        raise HTTPException(status_code=404, detail="태스크를 찾을 수 없습니다.")
+
+    try:
+        wbs_schedule.validate_dependency(db, predecessor, successor)
+    except wbs_schedule.InvalidDependencyError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    db_dependency = WBSDependencyDB(project_id=predecessor.project_id, **dependency.model_dump())
+    db.add(db_dependency)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="이미 등록된 선후행 관계입니다.")
+    change_versions.bump(db, change_versions.wbs_key(predecessor.project_id))
+    change_feed.record(db, change_feed.WBS_DEPENDENCY, change_feed.CREATED, db_dependency.id, predecessor.project_id)
+    db.commit()
+    db.refresh(db_dependency)
+    return db_dependency
+
+@router.delete("/dependencies/{dependency_id}")
+def delete_wbs_dependency(dependency_id: int, db: Session = Depends(get_db)):
+    """WBS 선후행 관계를 삭제합니다."""
+    db_dependency = db.query(WBSDependencyDB).filter(WBSDependencyDB.id == dependency_id).first()
+    if not db_dependency:
+        raise HTTPException(status_code=404, detail="선후행 관계를 찾을 수 없습니다.")
+    db.delete(db_dependency)
+    change_versions.bump(db, change_versions.wbs_key(db_dependency.project_id))
+    change_feed.record(db, change_feed.WBS_DEPENDENCY, change_feed.DELETED, dependency_id, db_dependency.project_id)
+    db.commit()
+    return {"message": f"Dependency {dependency_id} has been deleted."}
+
+@router.post("/bulk-move", response_model=List[WBSTaskResponse])
+def bulk_move_wbs_tasks(request: WBSBulkMoveRequest, db: Session = Depends(get_db)):
+    """여러 태스크의 상위 태스크/순서 변경을 순서대로 한 트랜잭션에 적용합니다. 하나라도 실패하면 모두 취소됩니다.
+
+    각 항목은 parent_id 아래 after_id 바로 뒤(또는 before_id 바로 앞)에 놓입니다.
+    정렬키가 바뀐 태스크(다시 번호가 매겨진 형제 포함)를 반환합니다.
+    """
+    # 관련 태스크를 한 번에 조회
+    task_ids = set()
+    for item in request.moves:
+        task_ids.update(value for value in (item.task_id, item.parent_id, item.after_id, item.before_id) if value is not None)
+    tasks = {task.id: task for task in db.query(WBSTaskDB).filter(WBSTaskDB.id.in_(task_ids))}
+    missing = sorted(task_ids - tasks.keys())
+    if missing:
+        raise HTTPException(status_code=404, detail=f"태스크를 찾을 수 없습니다: {missing}")
+
+    changed_ids = set()
+    touched_paths = []
+    try:
+        for item in request.moves:
+            task = tasks[item.task_id]
+            parent_id = item.parent_id if "parent_id" in item.model_fields_set else task.parent_id
+            old_path = task.tree_path
+            changed = wbs_tree.place(
+                db,
+                task,
+                db.get(WBSTaskDB, parent_id) if parent_id is not None else None,  # 생략 시 현재 부모 (세션에 있으면 조회 없음)
+                tasks.get(item.after_id) if item.after_id is not None else None,
+                tasks.get(item.before_id) if item.before_id is not None else None,
+            )
+            changed_ids.update(moved.id for moved in changed)
+            touched_paths.extend([old_path, task.tree_path])
+    except wbs_tree.InvalidMoveError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"태스크 {item.task_id} 이동 실패: {e}")
+
+    # 이전/새 상위 태스크 일정 집계 (공통 상위는 한 번만)
+    wbs_schedule.refresh_paths(db, touched_paths)
+    change_versions.bump(db, *(change_versions.wbs_key(tasks[item.task_id].project_id) for item in request.moves))
+
+    # 정렬키가 바뀐 태스크와 집계가 바뀐 상위 태스크 (모두 세션에 로드되어 있어 추가 조회 없음)
+    updated_by_project: Dict[int, List[int]] = {}
+    for task_id in sorted(changed_ids | {task_id for path in touched_paths if path for task_id in wbs_tree.path_ids(path)}):
+        updated_task = db.get(WBSTaskDB, task_id)
+        if updated_task is not None:
+            updated_by_project.setdefault(updated_task.project_id, []).append(task_id)
+    for project_id, updated_ids in updated_by_project.items():
+        change_feed.record(db, change_feed.WBS_TASK, change_feed.UPDATED, updated_ids, project_id)
+    db.commit()
+
+    changed_tasks = db.query(WBSTaskDB).filter(WBSTaskDB.id.in_(changed_ids)).order_by(WBSTaskDB.tree_path).all()
+    return [to_response(task) for task in changed_tasks]
 
 @router.post("/", response_model=WBSTaskResponse)
 def create_wbs_task(task: WBSTaskCreate, db: Session = Depends(get_db)):
@@ -72,13 +262,20 @@ def create_wbs_task(task: WBSTaskCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail=f"Project with id {task.project_id} not found")
 
     # Parent task exists check
+    parent_task = None
     if task.parent_id:
         parent_task = db.query(WBSTaskDB).filter(WBSTaskDB.id == task.parent_id).first()
         if not parent_task:
             raise HTTPException(status_code=404, detail=f"Parent task with id {task.parent_id} not found")
+        if parent_task.project_id != task.project_id:
+            raise HTTPException(status_code=400, detail="다른 프로젝트의 태스크를 상위 태스크로 지정할 수 없습니다.")
 
     db_task = WBSTaskDB(**task.model_dump())
     db.add(db_task)
+    wbs_tree.assign_path(db, db_task, parent_task)
+    wbs_schedule.refresh_task(db, db_task)
+    change_versions.bump(db, change_versions.wbs_key(db_task.project_id))
+    record_task_changes(db, change_feed.CREATED, db_task)
     db.commit()
     db.refresh(db_task)
     return WBSTaskResponse.model_validate(db_task)
@@ -91,9 +288,32 @@ def update_wbs_task(task_id: int, task_update: WBSTaskUpdate, db: Session = Depe
         raise HTTPException(status_code=404, detail="태스크를 찾을 수 없습니다.")
 
     update_data = task_update.model_dump(exclude_unset=True)
+    old_parent_id, old_path = db_task.parent_id, db_task.tree_path
+
+    # 부모/정렬 순서 변경은 하위 트리 경로까지 함께 갱신 (순환 구조는 거부)
+    if "parent_id" in update_data or "sort_order" in update_data:
+        parent_id = update_data.pop("parent_id", db_task.parent_id)
+        sort_order = update_data.pop("sort_order", db_task.sort_order)
+        parent_task = None
+        if parent_id:
+            parent_task = db.query(WBSTaskDB).filter(WBSTaskDB.id == parent_id).first()
+            if not parent_task:
+                raise HTTPException(status_code=404, detail=f"Parent task with id {parent_id} not found")
+        try:
+            wbs_tree.move(db, db_task, parent_task, sort_order)
+        except wbs_tree.InvalidMoveError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
     for key, value in update_data.items():
         setattr(db_task, key, value)
 
+    # 일정 집계는 자신과 상위 태스크만 갱신 (부모가 바뀌었으면 이전 상위 태스크도)
+    wbs_schedule.refresh_task(db, db_task)
+    if db_task.parent_id != old_parent_id:
+        wbs_schedule.refresh_ancestors(db, old_path)
+
+    change_versions.bump(db, change_versions.wbs_key(db_task.project_id))
+    record_task_changes(db, change_feed.UPDATED, db_task, old_path)
     db.commit()
     db.refresh(db_task)
     return WBSTaskResponse.model_validate(db_task)
@@ -105,7 +325,17 @@ def delete_wbs_task(task_id: int, db: Session = Depends(get_db)):
     if not db_task:
         raise HTTPException(status_code=404, detail="태스크를 찾을 수 없습니다.")
 
-    # The relationship cascade setting handles deletion of children.
-    db.delete(db_task)
+    # 하위 트리 전체를 경로 범위 DELETE 한 번으로 삭제 (ORM cascade처럼 단계별로 자식을 읽지 않음)
+    old_path = db_task.tree_path
+    project_id = db_task.project_id
+    # 삭제 전에 하위 트리/선후행 관계 id를 INSERT ... SELECT로 변경 이벤트에 기록
+    change_feed.record_select(
+        db, change_feed.WBS_DEPENDENCY, change_feed.DELETED, wbs_tree.subtree_dependency_ids(db_task), project_id
+    )
+    change_feed.record_select(db, change_feed.WBS_TASK, change_feed.DELETED, wbs_tree.subtree_ids(db_task), project_id)
+    deleted_count = wbs_tree.delete_subtree(db, db_task)
+    wbs_schedule.refresh_ancestors(db, old_path)
+    change_versions.bump(db, change_versions.wbs_key(project_id))
+    change_feed.record(db, change_feed.WBS_TASK, change_feed.UPDATED, wbs_tree.path_ids(old_path)[:-1], project_id)
     db.commit()
-    return {"message": f"Task {task_id} and all its sub-tasks have been deleted."}
+    return {"message": f"Task {task_id} and all its sub-tasks have been deleted.", "deleted_count": deleted_count}
@@ -0,0 +1,5 @@
+"""
+비즈니스 로직 모듈
+
+라우터에서 공통으로 사용하는 집계, 캐시, 동기화 로직을 모아둡니다.
+"""
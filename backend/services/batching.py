@@ -0,0 +1,23 @@
+"""
+IN 절 조회 / 일괄 삽입용 분할 도우미
+
+SQLite 바인드 변수 제한을 넘지 않도록 IN 절에 넣을 값과 executemany 행 목록을 일정 크기로 나눕니다.
+"""
+
+from typing import Hashable, Iterable, Iterator, List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+# IN 절에 넣을 최대 값 개수 (SQLite 바인드 변수 제한 고려)
+LOOKUP_CHUNK_SIZE = 500
+
+
+def chunks(values: Sequence[T], size: int = LOOKUP_CHUNK_SIZE) -> Iterator[Sequence[T]]:
+    """순서를 유지한 채 size개씩 나눕니다."""
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def id_chunks(ids: Iterable[Hashable]) -> Iterator[List]:
+    """id(또는 이름)를 정렬·중복 제거해 IN 절 하나에 넣을 수 있는 크기로 나눕니다."""
+    return chunks(sorted(set(ids)))
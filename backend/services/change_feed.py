@@ -0,0 +1,252 @@
+"""
+변경 이벤트 피드 (Server-Sent Events)
+
+쓰기 경로는 record(...)로 change_log 테이블에 (entity, action, entity_id, project_id)를
+같은 트랜잭션에 남깁니다. 커밋된 변경만 보이므로 롤백된 쓰기는 전달되지 않습니다.
+
+워커(프로세스)마다 ChangeFeed 하나가 구독자가 있는 동안 change_log를 id 순으로 주기적으로 읽고
+(기본키 범위 조회 한 번), 그 워커에 연결된 모든 구독자 큐로 나눠 줍니다.
+→ 외부 브로커 없이 여러 gunicorn 워커 어디에 연결해도 같은 이벤트를 받고,
+  열린 탭 수와 관계없이 워커당 조회는 주기마다 한 번입니다.
+
+재접속 시 Last-Event-ID(또는 since) 이후 기록을 먼저 보내며, 보관 기간이 지나 이어받을 수 없거나
+밀린 이벤트가 너무 많으면 reset 이벤트로 전체 재조회를 요청합니다.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Set, Union
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.sql import Select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+from database import SessionLocal
+from models import ChangeLogDB
+
+logger = logging.getLogger(__name__)
+
+PROJECT = "project"
+WEEKLY_REPORT = "weekly_report"
+DETAILED_TASK = "detailed_task"
+WBS_TASK = "wbs_task"
+WBS_DEPENDENCY = "wbs_dependency"
+ENTITIES = (PROJECT, WEEKLY_REPORT, DETAILED_TASK, WBS_TASK, WBS_DEPENDENCY)
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+# 한 번에 읽는 최대 행 수
+FETCH_LIMIT = 1000
+# 재접속 시 이어서 보낼 최대 이벤트 수 (넘으면 reset)
+REPLAY_LIMIT = 5000
+# 구독자 큐 크기 (느린 클라이언트가 밀리면 reset 후 연결 종료)
+SUBSCRIBER_QUEUE_SIZE = 10000
+# 정리(보관 기간 초과 행 삭제) 주기
+PRUNE_INTERVAL = timedelta(hours=1)
+
+# 큐에 넣는 특수 신호: 구독자가 처리하지 못할 만큼 밀림
+OVERFLOW = "overflow"
+
+
+def record(
+    db: Session, entity: str, action: str, entity_ids: Union[int, Iterable[int]], project_id: Optional[int] = None
+):
+    """변경 이벤트를 같은 트랜잭션에 기록합니다. (커밋은 호출자)
+
+    프로젝트 이벤트는 project_id를 생략하면 프로젝트 자신의 ID로 기록합니다.
+    """
+    ids = [entity_ids] if isinstance(entity_ids, int) else list(dict.fromkeys(entity_ids))
+    if not ids:
+        return
+    now = datetime.utcnow()
+    db.execute(
+        insert(ChangeLogDB),
+        [
+            {
+                "entity": entity,
+                "action": action,
+                "entity_id": entity_id,
+                "project_id": entity_id if project_id is None and entity == PROJECT else project_id,
+                "created_at": now,
+            }
+            for entity_id in ids
+        ],
+    )
+
+
+def record_select(db: Session, entity: str, action: str, ids_query: Select, project_id: Optional[int] = None):
+    """id 하나를 고르는 SELECT 결과를 INSERT ... SELECT 한 번으로 기록합니다. (삭제 직전 하위 트리 등)"""
+    ids = ids_query.subquery()
+    db.execute(
+        insert(ChangeLogDB).from_select(
+            ["entity", "action", "entity_id", "project_id", "created_at"],
+            select(
+                literal(entity),
+                literal(action),
+                list(ids.c)[0],
+                literal(project_id),
+                literal(datetime.utcnow()),
+            ),
+        )
+    )
+
+
+def to_event(row: ChangeLogDB) -> dict:
+    return {
+        "id": row.id,
+        "entity": row.entity,
+        "action": row.action,
+        "entity_id": row.entity_id,
+        "project_id": row.project_id,
+        "at": row.created_at.isoformat(),
+    }
+
+
+def latest_id(db: Session) -> int:
+    return db.query(func.max(ChangeLogDB.id)).scalar() or 0
+
+
+def oldest_id(db: Session) -> Optional[int]:
+    return db.query(func.min(ChangeLogDB.id)).scalar()
+
+
+def fetch_since(db: Session, since_id: int, limit: int = FETCH_LIMIT) -> List[dict]:
+    """since_id 이후의 변경 이벤트를 id 순으로 반환합니다."""
+    rows = db.query(ChangeLogDB).filter(ChangeLogDB.id > since_id).order_by(ChangeLogDB.id).limit(limit).all()
+    return [to_event(row) for row in rows]
+
+
+def prune(db: Session) -> int:
+    """보관 기간이 지난 변경 기록을 삭제하고 커밋합니다.
+
+    마지막 기록 한 행은 남겨 둠 → 그동안 변경이 없었던 클라이언트의 버전도 계속 이어받을 수 있음
+    """
+    cutoff = datetime.utcnow() - timedelta(hours=settings.CHANGE_LOG_RETENTION_HOURS)
+    deleted = db.execute(
+        delete(ChangeLogDB).where(ChangeLogDB.created_at < cutoff, ChangeLogDB.id < latest_id(db))
+    ).rowcount
+    db.commit()
+    return deleted
+
+
+def _with_session(fn, *args):
+    db = SessionLocal()
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+
+class ChangeFeed:
+    """프로세스 안의 구독자에게 change_log 새 행을 나눠 주는 폴러"""
+
+    def __init__(self, poll_seconds: float):
+        self.poll_seconds = poll_seconds
+        self.last_id = 0
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._last_pruned: Optional[datetime] = None
+
+    async def subscribe(self) -> asyncio.Queue:
+        """새 구독자 큐를 등록합니다. 등록 이후 커밋된(id > self.last_id) 이벤트가 큐로 들어옵니다."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        if self._task is None or self._task.done():
+            self.last_id = await run_in_threadpool(_with_session, latest_id)
+            self._task = asyncio.create_task(self._run())
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    async def _run(self):
+        # SQLite는 쓰기가 직렬화되어 id 순서 = 커밋 순서이므로 last_id 이후만 읽어도 누락이 없음
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            if not self._subscribers:
+                break  # 구독자가 없으면 중지 (다음 구독 시 다시 시작)
+            try:
+                events = await run_in_threadpool(_with_session, fetch_since, self.last_id)
+                if self._last_pruned is None or datetime.utcnow() - self._last_pruned > PRUNE_INTERVAL:
+                    self._last_pruned = datetime.utcnow()
+                    await run_in_threadpool(_with_session, prune)
+            except Exception as e:
+                logger.warning(f"변경 이벤트 조회 실패: {e}")
+                continue
+
+            for event in events:
+                for queue in list(self._subscribers):
+                    try:
+                        queue.put_nowait(event)
+                    except asyncio.QueueFull:
+                        # 처리하지 못하는 구독자는 reset 후 연결을 끊음 (다른 구독자를 막지 않도록)
+                        self._subscribers.discard(queue)
+                        queue.get_nowait()
+                        queue.put_nowait(OVERFLOW)
+            if events:
+                self.last_id = events[-1]["id"]
+
+
+change_feed = ChangeFeed(settings.CHANGE_FEED_POLL_SECONDS)
+
+
+def format_sse(event: dict) -> str:
+    return f"id: {event['id']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+def format_reset(last_id: int, reason: str) -> str:
+    """클라이언트에 전체 재조회를 요청하는 이벤트 (이후 last_id부터 이어받음)"""
+    return f"id: {last_id}\nevent: reset\ndata: {json.dumps({'reason': reason, 'id': last_id})}\n\n"
+
+
+async def stream(
+    since_id: Optional[int], entities: Optional[Set[str]] = None, project_id: Optional[int] = None
+):
+    """SSE 본문 생성기: 밀린 이벤트를 먼저 보내고 이후 새 이벤트를 계속 보냅니다."""
+
+    def wanted(event: dict) -> bool:
+        return (entities is None or event["entity"] in entities) and (
+            project_id is None or event["project_id"] == project_id
+        )
+
+    queue = await change_feed.subscribe()
+    try:
+        # 연결 직후 재접속 간격 안내 + 현재 위치
+        sent_id = since_id if since_id is not None else change_feed.last_id
+        yield f"retry: 3000\nid: {sent_id}\n\n"
+
+        if since_id is not None:
+            oldest = await run_in_threadpool(_with_session, oldest_id)
+            backlog = await run_in_threadpool(_with_session, fetch_since, since_id, REPLAY_LIMIT + 1)
+            if (oldest is not None and since_id < oldest - 1) or len(backlog) > REPLAY_LIMIT:
+                # 전체 재조회 후에는 현재 마지막 변경부터 이어받으면 됨
+                sent_id = await run_in_threadpool(_with_session, latest_id)
+                yield format_reset(sent_id, "expired" if len(backlog) <= REPLAY_LIMIT else "too_many_changes")
+            else:
+                for event in backlog:
+                    if wanted(event):
+                        yield format_sse(event)
+                    sent_id = event["id"]
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=settings.CHANGE_FEED_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if event == OVERFLOW:
+                yield format_reset(change_feed.last_id, "overflow")
+                return
+            if event["id"] <= sent_id:
+                continue  # 재전송 구간과 겹친 이벤트
+            sent_id = event["id"]
+            if wanted(event):
+                yield format_sse(event)
+    finally:
+        change_feed.unsubscribe(queue)
@@ -0,0 +1,101 @@
+"""
+데이터 묶음별 변경 버전과 조건부 GET (ETag / Last-Modified)
+
+쓰기 경로가 같은 트랜잭션 안에서 bump(db, key)로 cache_versions의 버전을 올리고,
+조회 API는 응답을 만들기 전에 not_modified(...)로 해당 묶음들의 버전만 읽어
+클라이언트가 가진 ETag와 같으면 집계/직렬화 없이 304를 반환합니다.
+
+키 목록
+- projects: 프로젝트 생성/수정/삭제/일괄 등록
+- weekly_reports: 주간 보고서 생성/수정/삭제
+- wbs:{project_id}: 해당 프로젝트의 WBS 태스크/선후행 관계 변경
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from models import CacheVersionDB
+
+PROJECTS = "projects"
+WEEKLY_REPORTS = "weekly_reports"
+
+
+def wbs_key(project_id: int) -> str:
+    return f"wbs:{project_id}"
+
+
+def bump(db: Session, *keys: str):
+    """키별 버전을 1 올립니다. (행이 없으면 생성, 커밋은 호출자)"""
+    now = datetime.utcnow()
+    for key in dict.fromkeys(keys):
+        result = db.execute(
+            update(CacheVersionDB)
+            .where(CacheVersionDB.key == key)
+            .values(version=CacheVersionDB.version + 1, updated_at=now)
+        )
+        if not result.rowcount:
+            db.execute(insert(CacheVersionDB).values(key=key, version=1, updated_at=now))
+
+
+def current(db: Session, keys: Iterable[str]) -> Tuple[Dict[str, int], Optional[datetime]]:
+    """키별 현재 버전(없으면 0)과 가장 최근 변경 시각을 한 번의 조회로 반환합니다."""
+    keys = list(dict.fromkeys(keys))
+    versions = {key: 0 for key in keys}
+    last_modified = None
+    for key, version, updated_at in db.query(
+        CacheVersionDB.key, CacheVersionDB.version, CacheVersionDB.updated_at
+    ).filter(CacheVersionDB.key.in_(keys)):
+        versions[key] = version
+        if updated_at is not None and (last_modified is None or updated_at > last_modified):
+            last_modified = updated_at
+    return versions, last_modified
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # 약한 비교: W/ 접두사 무시
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP 날짜는 초 단위 → 같은 초 안의 변경은 구분할 수 없으므로 변경된 것으로 처리 (정확한 재검증은 ETag)
+    return last_modified.replace(microsecond=0, tzinfo=timezone.utc) < since
+
+
+def not_modified(request: Request, response: Response, db: Session, keys: List[str]) -> Optional[Response]:
+    """조건부 GET 처리: 변경이 없으면 304 응답을, 있으면 None을 반환하고 response에 검증 헤더를 설정합니다.
+
+    ETag는 키별 버전으로 만들며(같은 URL 기준), If-None-Match가 있으면 If-Modified-Since보다 우선합니다.
+    If-Modified-Since는 초 단위라 마지막 변경과 같은 초이면 304를 보내지 않습니다. (오래된 데이터 방지)
+    """
+    versions, last_modified = current(db, keys)
+    digest = hashlib.sha1(";".join(f"{key}={version}" for key, version in sorted(versions.items())).encode())
+    headers = {"ETag": f'W/"{digest.hexdigest()[:20]}"', "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        unchanged = _etag_matches(if_none_match, headers["ETag"])
+    else:
+        unchanged = bool(if_modified_since and last_modified and _not_modified_since(if_modified_since, last_modified))
+
+    if unchanged:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,75 @@
+"""
+변경분 동기화 ("버전 N 이후 변경")
+
+클라이언트는 전체 목록을 받기 전에 현재 버전(change_log의 마지막 id)을 받아 두고,
+다음 접속 때 그 버전 이후의 change_log만 읽어 바뀐 행과 삭제된 id(툼스톤)를 받습니다.
+→ 재접속 비용이 데이터 크기가 아니라 그동안의 변경량에 비례합니다.
+
+같은 대상이 여러 번 바뀌었으면 마지막 동작 하나로 합치고, 바뀐 행은 현재 값을 한 번에 조회합니다.
+(조회 시점에 이미 없어진 행은 삭제로 돌려줌)
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from models import ChangeLogDB
+from services import change_feed
+
+# 한 번에 읽을 수 있는 최대 변경 기록 수
+MAX_CHANGES = 5000
+
+
+class VersionExpiredError(ValueError):
+    """요청한 버전 이후의 변경 기록이 남아 있지 않음 (전체 재조회 필요)"""
+
+
+def current_version(db: Session) -> int:
+    return change_feed.latest_id(db)
+
+
+def collect_changes(
+    db: Session,
+    since: int,
+    entities: Iterable[str],
+    project_id: Optional[int] = None,
+    limit: int = 1000,
+) -> Tuple[int, bool, Dict[str, Dict[str, List[int]]]]:
+    """since 이후 변경을 대상별 {upserted: [id], deleted: [id]}로 합쳐 반환합니다.
+
+    반환값: (다음 요청에 쓸 버전, 남은 변경이 더 있는지, 대상별 변경 id)
+    """
+    # 마지막 id를 먼저 읽고 그 이하만 조회 (조회 중 커밋된 변경을 건너뛰지 않도록)
+    latest = change_feed.latest_id(db)
+    if since > latest:
+        raise VersionExpiredError("알 수 없는 버전입니다. 전체 데이터를 다시 조회하세요.")
+    oldest = change_feed.oldest_id(db)
+    if oldest is not None and since < oldest - 1:
+        raise VersionExpiredError("변경 기록 보관 기간이 지났습니다. 전체 데이터를 다시 조회하세요.")
+
+    entities = list(entities)
+    query = db.query(ChangeLogDB.id, ChangeLogDB.entity, ChangeLogDB.action, ChangeLogDB.entity_id).filter(
+        ChangeLogDB.id > since, ChangeLogDB.id <= latest, ChangeLogDB.entity.in_(entities)
+    )
+    if project_id is not None:
+        query = query.filter(ChangeLogDB.project_id == project_id)
+    rows = query.order_by(ChangeLogDB.id).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    version = rows[-1].id if has_more else latest
+
+    # 대상별로 마지막 동작만 남김
+    last_action: Dict[str, Dict[int, str]] = {entity: {} for entity in entities}
+    for row in rows:
+        actions = last_action[row.entity]
+        actions.pop(row.entity_id, None)
+        actions[row.entity_id] = row.action
+
+    changes = {}
+    for entity, actions in last_action.items():
+        changes[entity] = {
+            "upserted": [entity_id for entity_id, action in actions.items() if action != change_feed.DELETED],
+            "deleted": [entity_id for entity_id, action in actions.items() if action == change_feed.DELETED],
+        }
+    return version, has_more, changes
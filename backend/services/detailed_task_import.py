@@ -0,0 +1,255 @@
+"""
+상세 업무 일괄 등록 엔진
+
+파일 전체를 한 번에 검증하고, 프로젝트명과 기존 (project_id, task_item) 조합을
+미리 일괄 조회한 뒤 executemany 배치로 삽입합니다.
+행 단위 실패 사유는 기존 업로드 API와 같은 형식({row, project, task_item, reason})으로 반환합니다.
+"""
+
+import logging
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from models import DetailedTaskDB, TaskStatus
+from services import change_feed, metrics, project_cache, rollups
+from services.batching import chunks, id_chunks
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = ["project", "stage", "task_item"]
+# executemany 한 번에 삽입할 행 수
+IMPORT_BATCH_SIZE = 1000
+
+TRUE_STRINGS = {"true", "1", "y", "yes", "예", "o"}
+
+_STATUS_VALUES = {status.value: status for status in TaskStatus}
+
+
+class _ConversionError(Exception):
+    pass
+
+
+def _text_column(df: pd.DataFrame, column: str, default: str) -> pd.Series:
+    """기존 동작과 같이 str(value).strip() 규칙으로 문자열 컬럼을 만듭니다."""
+    if column not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    return df[column].astype(str).str.strip()
+
+
+def _to_flag(value) -> bool:
+    # 빈 셀(NaN)이나 "false" 문자열이 리스크 있음으로 등록되지 않도록 처리
+    if pd.isna(value):
+        return False
+    if isinstance(value, str):
+        return value.strip().lower() in TRUE_STRINGS
+    return bool(value)
+
+
+def _to_progress(value):
+    if pd.isna(value):
+        return 0
+    try:
+        return int(value)
+    except (TypeError, ValueError) as e:
+        return _ConversionError(str(e))
+
+
+def _to_date(value):
+    if pd.isna(value):
+        return None
+    try:
+        if isinstance(value, str):
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+    except ValueError:
+        pass
+    return None
+
+
+def normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """업로드된 DataFrame을 컬럼 단위로 변환합니다. (행 반복 없이 벡터 연산)"""
+    frame = pd.DataFrame(index=df.index)
+    frame["project"] = _text_column(df, "project", "")
+    frame["stage"] = _text_column(df, "stage", "")
+    frame["task_item"] = _text_column(df, "task_item", "")
+    frame["assignee"] = _text_column(df, "assignee", "")
+    frame["current_status"] = _text_column(df, "current_status", TaskStatus.NOT_STARTED.value)
+    if "current_status" in df.columns:
+        # 비어 있는 상태값은 "nan" 문자열 대신 기본 상태로 등록
+        frame.loc[df["current_status"].isna(), "current_status"] = TaskStatus.NOT_STARTED.value
+    frame["description"] = _text_column(df, "description", "")
+
+    if "has_risk" in df.columns:
+        frame["has_risk"] = df["has_risk"].map(_to_flag)
+    else:
+        frame["has_risk"] = False
+
+    if "progress_rate" in df.columns:
+        frame["progress_rate"] = df["progress_rate"].map(_to_progress)
+    else:
+        frame["progress_rate"] = 0
+
+    for date_field in ["planned_end_date", "actual_end_date"]:
+        if date_field in df.columns:
+            frame[date_field] = df[date_field].map(_to_date).astype(object)
+        else:
+            frame[date_field] = None
+
+    return frame
+
+
+def resolve_project_ids(db: Session, names: List[str]) -> Dict[str, int]:
+    """프로젝트명 → ID 매핑을 일괄 조회합니다. (프로젝트 캐시에 없는 이름만 조회)"""
+    return project_cache.project_ids_for_names(db, names)
+
+
+def existing_task_keys(db: Session, project_ids: List[int], task_items: List[str]) -> Set[Tuple[int, str]]:
+    """이미 등록된 (project_id, task_item) 조합을 일괄 조회합니다."""
+    keys = set()
+    if not project_ids:
+        return keys
+    project_ids = sorted(set(project_ids))
+    for chunk in id_chunks(task_items):
+        rows = db.query(DetailedTaskDB.project_id, DetailedTaskDB.task_item).filter(
+            DetailedTaskDB.project_id.in_(project_ids), DetailedTaskDB.task_item.in_(chunk)
+        )
+        keys.update((project_id, task_item) for project_id, task_item in rows)
+    return keys
+
+
+def plan_import(db: Session, df: pd.DataFrame) -> Tuple[List[dict], List[dict]]:
+    """삽입할 행 목록과 실패 목록을 계산합니다. (DB 쓰기 없음)"""
+    frame = normalize_frame(df)
+    project_ids = resolve_project_ids(db, frame["project"].tolist())
+    frame["project_id"] = frame["project"].map(project_ids)
+
+    known = frame["project_id"].notna()
+    taken = existing_task_keys(
+        db, frame.loc[known, "project_id"].astype(int).tolist(), frame.loc[known, "task_item"].tolist()
+    )
+
+    rows: List[dict] = []
+    failures: List[dict] = []
+
+    def fail(index, record, reason):
+        failures.append(
+            {
+                "row": index + 2,  # Excel 행 번호 (헤더 포함)
+                "project": record.project,
+                "task_item": record.task_item,
+                "reason": reason,
+            }
+        )
+
+    # 실패 사유 우선순위는 기존 행 단위 처리 순서를 따름: 변환 → 프로젝트 → 중복 → 저장
+    for record in frame.itertuples():
+        index = record.Index
+
+        if isinstance(record.progress_rate, _ConversionError):
+            fail(index, record, f"처리 중 오류: {record.progress_rate}")
+            continue
+
+        if pd.isna(record.project_id):
+            fail(index, record, "프로젝트를 찾을 수 없음")
+            continue
+
+        key = (int(record.project_id), record.task_item)
+        if key in taken:
+            fail(index, record, "이미 존재하는 업무")
+            continue
+
+        status = _STATUS_VALUES.get(record.current_status)
+        if status is None:
+            fail(index, record, f"처리 중 오류: 유효하지 않은 상태값 '{record.current_status}'")
+            continue
+
+        taken.add(key)
+        rows.append(
+            {
+                "project_id": key[0],
+                "stage": record.stage,
+                "task_item": record.task_item,
+                "assignee": record.assignee,
+                "current_status": status,
+                "has_risk": bool(record.has_risk),
+                "description": record.description,
+                "planned_end_date": record.planned_end_date,
+                "actual_end_date": record.actual_end_date,
+                "progress_rate": record.progress_rate,
+            }
+        )
+
+    return rows, failures
+
+
+def insert_rows(db: Session, rows: List[dict], batch_size: int = IMPORT_BATCH_SIZE) -> int:
+    """행 목록을 executemany 배치로 삽입하고 변경 이벤트를 기록합니다. 커밋은 호출자가 결정합니다."""
+    inserted = 0
+    for batch in chunks(rows, batch_size):
+        # RETURNING으로 새 ID를 같은 문장에서 받아 변경 이벤트에 사용 (추가 조회 없음)
+        created = db.execute(insert(DetailedTaskDB).returning(DetailedTaskDB.id, DetailedTaskDB.project_id), batch)
+        by_project: Dict[int, List[int]] = {}
+        for task_id, project_id in created:
+            by_project.setdefault(project_id, []).append(task_id)
+        for project_id, task_ids in by_project.items():
+            change_feed.record(db, change_feed.DETAILED_TASK, change_feed.CREATED, task_ids, project_id)
+        inserted += len(batch)
+    return inserted
+
+
+def planned_row_index(df: pd.DataFrame, failures: List[dict]) -> List:
+    """삽입 대상 행의 DataFrame index를 계획 순서대로 반환합니다. (실패 행 제외)"""
+    failed = {failure["row"] for failure in failures}
+    return [index for index in df.index if index + 2 not in failed]
+
+
+def import_detailed_tasks(
+    db: Session, df: pd.DataFrame, on_batch: Optional[Callable[[int, int, int, Optional[int], List[dict]], None]] = None
+) -> dict:
+    """DataFrame의 상세 업무를 일괄 등록합니다.
+
+    on_batch가 없으면 전체를 하나의 트랜잭션으로 커밋합니다.
+    on_batch가 주어지면(백그라운드 작업) 배치마다
+    on_batch(처리 행 수, 전체 행 수, 성공 건수, 배치 마지막 행의 index, 실패 목록)를 호출한 뒤 커밋하므로,
+    진행 상황과 재개 위치가 삽입된 데이터와 함께 반영됩니다.
+    """
+    started = time.perf_counter()
+    df = df.dropna(subset=REQUIRED_COLUMNS)
+    rows, failures = plan_import(db, df)
+    total_rows = len(df)
+    successful_imports = 0
+
+    try:
+        if on_batch is None:
+            successful_imports = insert_rows(db, rows)
+            rollups.refresh_for_tasks(db, {row["assignee"] for row in rows})
+            db.commit()
+        else:
+            row_index = planned_row_index(df, failures)
+            on_batch(len(failures), total_rows, 0, None, failures)
+            db.commit()
+            for batch in chunks(rows, IMPORT_BATCH_SIZE):
+                successful_imports += insert_rows(db, batch)
+                rollups.refresh_for_tasks(db, {row["assignee"] for row in batch})
+                last_row = int(row_index[successful_imports - 1])
+                on_batch(len(failures) + successful_imports, total_rows, successful_imports, last_row, failures)
+                db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    logger.info(f"상세 업무 일괄 등록: 성공 {successful_imports}, 실패 {len(failures)}")
+    metrics.record_import("detailed_tasks", successful_imports, len(failures), time.perf_counter() - started)
+    return {
+        "successful_imports": successful_imports,
+        "failed_imports": failures,
+        "total_processed": total_rows,
+    }
@@ -0,0 +1,265 @@
+"""
+파일 일괄 등록 백그라운드 작업
+
+업로드 파일을 settings.UPLOAD_DIR 아래에 저장하고 import_jobs 테이블에 작업을 기록한 뒤
+프로세스 내 스레드 풀에서 처리합니다. 요청은 파일 저장 직후 반환되므로
+클라이언트 연결이 끊겨도 작업은 계속 진행되고, 진행 상황은 DB에 기록되어
+어느 워커 프로세스에서든 조회할 수 있습니다.
+"""
+
+import io
+import json
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal
+from models import ImportJobDB
+from services import detailed_task_import, project_import
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+# 작업 종류별 허용 확장자
+JOB_FILE_TYPES: Dict[str, tuple] = {
+    "detailed_tasks": (".csv", ".xlsx", ".xls"),
+    "projects": (".csv", ".json"),
+}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """현재 프로세스의 작업 스레드 풀을 반환합니다.
+
+    gunicorn --preload 환경에서는 fork 전에 만든 스레드가 자식 프로세스로 이어지지 않으므로
+    프로세스마다 처음 사용할 때 생성합니다.
+    """
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        _executor = ThreadPoolExecutor(max_workers=settings.IMPORT_WORKERS, thread_name_prefix="import-job")
+        _executor_pid = os.getpid()
+    return _executor
+
+
+def shutdown():
+    """스레드 풀을 종료합니다. 진행 중인 작업은 다음 시작 시 중단 작업으로 복구됩니다."""
+    global _executor
+    if _executor is not None and _executor_pid == os.getpid():
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def job_dir() -> str:
+    path = os.path.join(settings.UPLOAD_DIR, "import_jobs")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def create_job(db: Session, kind: str, filename: str, contents: bytes) -> ImportJobDB:
+    """업로드 파일을 저장하고 대기 중인 작업을 생성합니다."""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension not in JOB_FILE_TYPES[kind]:
+        raise ValueError(f"지원하지 않는 파일 형식입니다. ({', '.join(JOB_FILE_TYPES[kind])} 파일만 가능)")
+
+    job_id = uuid.uuid4().hex
+    file_path = os.path.join(job_dir(), f"{job_id}{extension}")
+    with open(file_path, "wb") as f:
+        f.write(contents)
+
+    job = ImportJobDB(id=job_id, kind=kind, status=JOB_QUEUED, filename=filename, file_path=file_path)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def submit(job_id: str):
+    """작업을 스레드 풀에 등록합니다."""
+    _get_executor().submit(run_job, job_id)
+
+
+def enqueue(db: Session, kind: str, filename: str, contents: bytes) -> ImportJobDB:
+    """파일을 저장하고 작업을 생성한 뒤 바로 실행 대기열에 넣습니다."""
+    job = create_job(db, kind, filename, contents)
+    submit(job.id)
+    return job
+
+
+def claim_job(db: Session, job_id: str) -> bool:
+    """대기 중인 작업을 실행 상태로 전환합니다. 다른 워커가 먼저 가져갔으면 False."""
+    now = datetime.utcnow()
+    claimed = (
+        db.query(ImportJobDB)
+        .filter(ImportJobDB.id == job_id, ImportJobDB.status == JOB_QUEUED)
+        .update({"status": JOB_RUNNING, "started_at": now, "heartbeat_at": now}, synchronize_session=False)
+    )
+    db.commit()
+    return claimed == 1
+
+
+def read_frame(kind: str, file_path: str) -> pd.DataFrame:
+    """저장된 업로드 파일을 DataFrame으로 읽습니다. (기존 업로드 API와 같은 규칙)"""
+    with open(file_path, "rb") as f:
+        contents = f.read()
+
+    if file_path.endswith(".csv"):
+        return pd.read_csv(io.StringIO(contents.decode("utf-8")))
+    if file_path.endswith(".json"):
+        return pd.DataFrame(json.loads(contents.decode("utf-8")))
+    return pd.read_excel(io.BytesIO(contents))
+
+
+def _check_columns(df: pd.DataFrame, required_columns):
+    missing_columns = [col for col in required_columns if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"필수 컬럼이 누락되었습니다: {', '.join(missing_columns)}")
+
+
+def _run_detailed_tasks(db: Session, df: pd.DataFrame, on_batch: Callable) -> tuple:
+    _check_columns(df, detailed_task_import.REQUIRED_COLUMNS)
+    result = detailed_task_import.import_detailed_tasks(db, df, on_batch=on_batch)
+    return result["successful_imports"], result["failed_imports"]
+
+
+def _run_projects(db: Session, df: pd.DataFrame, on_batch: Callable) -> tuple:
+    _check_columns(df, project_import.REQUIRED_COLUMNS)
+    result = project_import.import_projects(db, df, on_batch=on_batch)
+    return len(result["created_projects"]), result["errors"]
+
+
+_RUNNERS = {
+    "detailed_tasks": _run_detailed_tasks,
+    "projects": _run_projects,
+}
+
+
+def run_job(job_id: str):
+    """작업 하나를 실행합니다. (스레드 풀에서 호출, 전용 세션 사용)"""
+    db = SessionLocal()
+    try:
+        if not claim_job(db, job_id):
+            return
+
+        job = db.get(ImportJobDB, job_id)
+        logger.info(f"📥 일괄 등록 작업 시작: {job_id} ({job.kind}, {job.filename})")
+
+        # 중단 후 재실행이면 마지막으로 커밋된 행 다음부터 처리하고, 앞서 커밋된 결과를 이어서 집계
+        resume_row = job.resume_row
+        prior_successful = 0
+        prior_failures = []
+        if resume_row is not None:
+            prior_successful = job.successful_rows or 0
+            stored = json.loads(job.failures) if job.failures else []
+            prior_failures = [failure for failure in stored if failure["row"] - 2 <= resume_row]
+            logger.info(f"↩️ 일괄 등록 작업 재개: {job_id} ({resume_row + 2}행 이후, 이전 성공 {prior_successful})")
+
+        def on_batch(processed_rows: int, total_rows: int, successful_rows: int, last_row, failures):
+            # 진행 상황과 재개 위치는 삽입 배치와 같은 트랜잭션으로 커밋됨
+            if resume_row is None:
+                job.total_rows = total_rows
+            if last_row is None:
+                # 첫 호출(삽입 전)에만 계획 단계의 실패 목록을 저장
+                job.failures = json.dumps(prior_failures + failures, ensure_ascii=False, default=str)
+            else:
+                job.resume_row = last_row
+            job.processed_rows = len(prior_failures) + prior_successful + processed_rows
+            job.successful_rows = prior_successful + successful_rows
+            job.failed_rows = job.processed_rows - job.successful_rows
+            job.heartbeat_at = datetime.utcnow()
+
+        try:
+            df = read_frame(job.kind, job.file_path)
+            if resume_row is not None:
+                df = df.loc[df.index > resume_row]
+            successful_rows, failures = _RUNNERS[job.kind](db, df, on_batch)
+        except Exception as e:
+            db.rollback()
+            logger.exception(f"일괄 등록 작업 실패: {job_id}")
+            job.status = JOB_FAILED
+            job.error = str(e)
+            job.finished_at = datetime.utcnow()
+            db.commit()
+            return
+
+        failures = prior_failures + failures
+        job.status = JOB_COMPLETED
+        job.successful_rows = prior_successful + successful_rows
+        job.failed_rows = len(failures)
+        job.processed_rows = job.successful_rows + len(failures)
+        job.failures = json.dumps(failures, ensure_ascii=False, default=str)
+        job.finished_at = datetime.utcnow()
+        db.commit()
+
+        # 처리가 끝난 업로드 파일 정리 (실패한 작업은 확인용으로 남겨 둠)
+        try:
+            os.remove(job.file_path)
+        except OSError:
+            pass
+
+        logger.info(f"✅ 일괄 등록 작업 완료: {job_id} (성공 {job.successful_rows}, 실패 {job.failed_rows})")
+    except Exception:
+        logger.exception(f"일괄 등록 작업 처리 중 오류: {job_id}")
+    finally:
+        db.close()
+
+
+def recover_jobs(db: Session) -> int:
+    """대기 중이거나 갱신이 멈춘 작업을 다시 실행 대기열에 넣습니다.
+
+    워커 재시작 등으로 중단된 작업은 heartbeat가 IMPORT_JOB_STALE_SECONDS 이상 갱신되지 않은
+    상태로 남습니다. 배치와 함께 커밋된 resume_row 다음 행부터 다시 처리하고,
+    그 전까지의 성공 건수와 실패 목록은 그대로 이어서 집계합니다.
+    """
+    stale_before = datetime.utcnow() - timedelta(seconds=settings.IMPORT_JOB_STALE_SECONDS)
+    db.query(ImportJobDB).filter(
+        ImportJobDB.status == JOB_RUNNING,
+        or_(ImportJobDB.heartbeat_at.is_(None), ImportJobDB.heartbeat_at < stale_before),
+    ).update({"status": JOB_QUEUED}, synchronize_session=False)
+    db.commit()
+
+    job_ids = [job_id for (job_id,) in db.query(ImportJobDB.id).filter(ImportJobDB.status == JOB_QUEUED)]
+    for job_id in job_ids:
+        submit(job_id)
+    return len(job_ids)
+
+
+def job_to_dict(job: ImportJobDB, include_failures: bool = True) -> dict:
+    """작업 상태 응답을 만듭니다. 처리 속도는 시작 이후 초당 처리 행 수입니다."""
+    throughput = None
+    if job.started_at:
+        elapsed = ((job.finished_at or datetime.utcnow()) - job.started_at).total_seconds()
+        if elapsed > 0:
+            throughput = round((job.processed_rows or 0) / elapsed, 1)
+
+    data = {
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "filename": job.filename,
+        "total_rows": job.total_rows or 0,
+        "processed_rows": job.processed_rows or 0,
+        "successful_rows": job.successful_rows or 0,
+        "failed_rows": job.failed_rows or 0,
+        "rows_per_second": throughput,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+    if include_failures:
+        data["failures"] = json.loads(job.failures) if job.failures else []
+    return data
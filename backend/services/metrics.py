@@ -0,0 +1,139 @@
+"""
+Prometheus 지표 수집 (/metrics)
+
+- http_request_duration_seconds: 경로(라우트 템플릿)별 응답 시간 히스토그램
+- http_requests_in_progress: 처리 중인 요청 수
+- db_pool_checkout_wait_seconds: 커넥션 풀에서 연결을 얻기까지 기다린 시간
+- import_rows_total / import_duration_seconds / export_rows_total: 일괄 등록·내보내기 행 처리량
+
+gunicorn 워커 여러 개가 각자 값을 갖고 있으므로, PROMETHEUS_MULTIPROC_DIR이 설정되면
+prometheus_client 멀티프로세스 모드로 워커별 파일에 기록하고 /metrics에서 합산합니다.
+(startup.sh가 디렉토리를 준비하고, gunicorn.conf.py가 종료된 워커를 정리합니다)
+외부 서비스 없이 Prometheus가 /metrics를 직접 수집하면 됩니다.
+"""
+
+import os
+import time
+from typing import Iterable, Iterator, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP 요청 처리 시간",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "처리 중인 HTTP 요청 수",
+    ["method"],
+    multiprocess_mode="livesum",  # 살아 있는 워커 값만 합산
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "DB 커넥션 풀에서 연결을 얻기까지 대기한 시간",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+IMPORT_ROWS = Counter("import_rows", "일괄 등록 처리 행 수", ["kind", "result"])
+IMPORT_DURATION = Histogram(
+    "import_duration_seconds",
+    "일괄 등록 1회 처리 시간",
+    ["kind"],
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+EXPORT_ROWS = Counter("export_rows", "CSV 내보내기 행 수", ["kind"])
+
+# 라우트에 매칭되지 않은 요청(404 등)은 경로별 라벨을 만들지 않음
+UNMATCHED_ROUTE = "unmatched"
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """현재 지표를 Prometheus 텍스트 형식으로 반환합니다. 멀티프로세스 모드면 모든 워커 값을 합산합니다."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int):
+    """종료된 워커의 livesum 게이지 파일을 정리합니다. (gunicorn child_exit 훅에서 호출)"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
+
+
+def instrument_pool(target_engine):
+    """엔진 커넥션 풀의 연결 획득 대기 시간을 기록합니다.
+
+    풀 이벤트(checkout)는 연결을 얻은 뒤에만 호출되므로, 대기 구간을 재기 위해
+    풀 구현이 연결을 꺼내는 _do_get을 감쌉니다. (engine.dispose()로 풀이 재생성되면 다시 호출 필요)
+    """
+    pool = target_engine.pool
+    do_get = pool._do_get
+
+    def timed_do_get():
+        started = time.perf_counter()
+        try:
+            return do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+    pool._do_get = timed_do_get
+
+
+def record_import(kind: str, successful: int, failed: int, seconds: float):
+    IMPORT_ROWS.labels(kind=kind, result="success").inc(successful)
+    IMPORT_ROWS.labels(kind=kind, result="failed").inc(failed)
+    IMPORT_DURATION.labels(kind=kind).observe(seconds)
+
+
+def count_export_rows(kind: str, rows: Iterable) -> Iterator:
+    """내보내기 행 이터레이터를 그대로 흘려보내면서 행 수를 셉니다."""
+    counter = EXPORT_ROWS.labels(kind=kind)
+    for row in rows:
+        counter.inc()
+        yield row
+
+
+class MetricsMiddleware:
+    """요청별 응답 시간과 처리 중 요청 수를 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method=method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            # 라우팅 후 FastAPI가 scope에 매칭된 라우트를 기록 → 경로 파라미터 대신 템플릿으로 집계
+            route = scope.get("route")
+            REQUEST_DURATION.labels(
+                method=method, route=getattr(route, "path", UNMATCHED_ROUTE), status=str(status["code"])
+            ).observe(time.perf_counter() - started)
@@ -0,0 +1,211 @@
+"""
+이름 사전 + trigram 색인 (부분 문자열 필터 / 자동 완성)
+
+프로젝트명·매니저·단계·담당자 필터는 ilike('%값%')라 매번 원본 테이블 전체를 읽었습니다.
+이 값들은 서로 다른 값의 수가 적으므로(담당자 수백, 단계 수 개) 값 사전(name_terms)을 따로 두고
+FTS5 trigram 색인으로 부분 문자열을 찾은 뒤, 원본 테이블은 정확한 값의 IN 조건(인덱스 사용)으로 거릅니다.
+
+- name_terms는 원본 테이블 INSERT/UPDATE/DELETE 트리거가 참조 행 수(refs)와 함께 유지 (0이 되면 삭제)
+- name_terms_fts는 name_terms를 원본으로 하는 external-content trigram 색인
+- 3글자 이상: trigram 색인으로 부분 문자열 검색 / 3글자 미만: 해당 종류의 사전만 LIKE로 확인
+- 자동 완성은 앞부분 일치 → 부분 일치 → (부족하면) trigram 유사도 순, 같은 순위는 많이 쓰인 값 먼저
+
+SQLite가 아니면 원본 테이블의 서로 다른 값을 ilike로 찾습니다.
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import text, union
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from models import DetailedTaskDB, NameTermDB, ProjectDB, WeeklyReportDB
+
+PROJECT = "project"
+MANAGER = "manager"
+STAGE = "stage"
+ASSIGNEE = "assignee"
+KINDS = (PROJECT, MANAGER, STAGE, ASSIGNEE)
+
+# 종류별 원본 (테이블, 컬럼)
+_SOURCES = {
+    PROJECT: [("projects", "name")],
+    MANAGER: [("projects", "manager")],
+    STAGE: [("weekly_reports", "stage"), ("detailed_tasks", "stage")],
+    ASSIGNEE: [("detailed_tasks", "assignee")],
+}
+_SOURCE_COLUMNS = {
+    PROJECT: [ProjectDB.name],
+    MANAGER: [ProjectDB.manager],
+    STAGE: [WeeklyReportDB.stage, DetailedTaskDB.stage],
+    ASSIGNEE: [DetailedTaskDB.assignee],
+}
+
+FTS_TABLE = "name_terms_fts"
+TRIGRAM = 3
+# 자동 완성에서 읽을 부분 일치 후보 최대 수 (SQL에서 순위대로 정렬한 뒤 자름)
+MAX_CANDIDATES = 500
+
+
+def _term_triggers(kind: str, table: str, column: str) -> List[str]:
+    add = (
+        f"INSERT INTO name_terms(kind, value, refs) SELECT '{kind}', new.{column}, 1 WHERE new.{column} IS NOT NULL "
+        f"ON CONFLICT(kind, value) DO UPDATE SET refs = refs + 1;"
+    )
+    remove = (
+        f"UPDATE name_terms SET refs = refs - 1 WHERE kind = '{kind}' AND value = old.{column}; "
+        f"DELETE FROM name_terms WHERE kind = '{kind}' AND value = old.{column} AND refs <= 0;"
+    )
+    name = f"{table}_{column}_terms"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {table} BEGIN {add} END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {table} BEGIN {remove} END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE OF {column} ON {table} "
+        f"WHEN old.{column} IS NOT new.{column} BEGIN {remove} {add} END",
+    ]
+
+
+def _fts_triggers() -> List[str]:
+    # value는 바뀌지 않고 refs만 갱신되므로 INSERT/DELETE만 반영
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON name_terms "
+        f"BEGIN INSERT INTO {FTS_TABLE}(rowid, value) VALUES (new.id, new.value); END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON name_terms "
+        f"BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, value) VALUES ('delete', old.id, old.value); END",
+    ]
+
+
+def _backfill_statements() -> List[str]:
+    statements = ["DELETE FROM name_terms"]
+    for kind, sources in _SOURCES.items():
+        values = " UNION ALL ".join(f"SELECT {column} AS value FROM {table}" for table, column in sources)
+        statements.append(
+            f"INSERT INTO name_terms(kind, value, refs) SELECT '{kind}', value, COUNT(*) "
+            f"FROM ({values}) WHERE value IS NOT NULL GROUP BY value"
+        )
+    statements.append(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return statements
+
+
+def ensure_name_index(engine: Engine) -> bool:
+    """trigram 색인과 사전 유지 트리거를 만듭니다. 색인을 새로 만들었으면 사전을 원본에서 다시 채우고 True."""
+    if engine.dialect.name != "sqlite":
+        return False
+    with engine.begin() as conn:
+        created = (
+            conn.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}).first()
+            is None
+        )
+        conn.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"value, content='name_terms', content_rowid='id', tokenize='trigram')"
+        )
+        if created:
+            # 트리거 없이 한 번에 채우고 색인 (기존 트리거가 남아 있으면 먼저 제거)
+            for trigger in ("ai", "ad"):
+                conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{trigger}")
+            for statement in _backfill_statements():
+                conn.exec_driver_sql(statement)
+        for statement in _fts_triggers():
+            conn.exec_driver_sql(statement)
+        for kind, sources in _SOURCES.items():
+            for table, column in sources:
+                for statement in _term_triggers(kind, table, column):
+                    conn.exec_driver_sql(statement)
+    return created
+
+
+def _phrase(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _candidates(db: Session, kind: str, fragment: str, limit: Optional[int]) -> List[tuple]:
+    """fragment를 포함하는 (value, refs) 목록
+
+    limit이 있으면 앞부분 일치 → 많이 쓰인 값 순으로 정렬한 뒤 자르므로 잘린 뒤에도 상위 후보가 남습니다.
+    """
+    if len(fragment) >= TRIGRAM:
+        query = (
+            f"SELECT t.value, t.refs FROM {FTS_TABLE} JOIN name_terms AS t ON t.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH :match AND t.kind = :kind"
+        )
+        params = {"match": _phrase(fragment), "kind": kind}
+    else:
+        # trigram으로 찾을 수 없는 짧은 입력은 (kind, value) 인덱스 범위의 사전만 확인
+        query = "SELECT t.value, t.refs FROM name_terms AS t WHERE t.kind = :kind AND t.value LIKE :pattern ESCAPE '\\'"
+        params = {"kind": kind, "pattern": f"%{_escape_like(fragment)}%"}
+    if limit is not None:
+        query += " ORDER BY (t.value LIKE :prefix ESCAPE '\\') DESC, t.refs DESC, t.value LIMIT :limit"
+        params["prefix"] = f"{_escape_like(fragment)}%"
+        params["limit"] = limit
+    return [tuple(row) for row in db.execute(text(query), params)]
+
+
+def _fallback_values(db: Session, kind: str, fragment: str) -> List[str]:
+    """SQLite가 아닐 때: 원본 컬럼의 서로 다른 값을 ilike로 찾음"""
+    selects = [
+        db.query(column.label("value")).filter(column.ilike(f"%{fragment}%")).distinct().statement
+        for column in _SOURCE_COLUMNS[kind]
+    ]
+    statement = selects[0] if len(selects) == 1 else union(*selects)
+    return [row[0] for row in db.execute(statement)]
+
+
+def matching_values(db: Session, kind: str, fragment: str) -> List[str]:
+    """fragment를 포함하는 값 목록 (대소문자 무시). 원본 필터는 column.in_(결과)로 적용합니다."""
+    if db.get_bind().dialect.name != "sqlite":
+        return _fallback_values(db, kind, fragment)
+    values = [value for value, _ in _candidates(db, kind, fragment, None)]
+    if len(fragment) >= TRIGRAM:
+        return values
+    # 짧은 입력의 LIKE는 ASCII만 대소문자를 무시하므로 trigram 검색과 같은 기준으로 한 번 더 확인
+    lowered = fragment.casefold()
+    return [value for value in values if lowered in value.casefold()]
+
+
+def _fuzzy(db: Session, kind: str, fragment: str, limit: int) -> List[str]:
+    """fragment와 trigram이 많이 겹치는 값 (오타 허용)"""
+    lowered = fragment.casefold()
+    trigrams = list(dict.fromkeys(lowered[i : i + TRIGRAM] for i in range(len(lowered) - TRIGRAM + 1)))
+    if not trigrams:
+        return []
+    rows = db.execute(
+        text(
+            f"SELECT t.value FROM {FTS_TABLE} JOIN name_terms AS t ON t.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH :match AND t.kind = :kind ORDER BY {FTS_TABLE}.rank, t.refs DESC LIMIT :limit"
+        ),
+        {"match": " OR ".join(_phrase(trigram) for trigram in trigrams), "kind": kind, "limit": limit},
+    )
+    return [row[0] for row in rows]
+
+
+def suggest(db: Session, kind: str, fragment: str = "", limit: int = 10, fuzzy: bool = True) -> List[str]:
+    """자동 완성 후보: 앞부분 일치 → 부분 일치 → 유사 값 순 (같은 순위는 많이 쓰인 값 먼저)"""
+    fragment = fragment.strip()
+    if db.get_bind().dialect.name != "sqlite":
+        return sorted(_fallback_values(db, kind, fragment))[:limit]
+    if not fragment:
+        rows = (
+            db.query(NameTermDB.value)
+            .filter(NameTermDB.kind == kind)
+            .order_by(NameTermDB.refs.desc(), NameTermDB.value)
+            .limit(limit)
+        )
+        return [row[0] for row in rows]
+
+    lowered = fragment.casefold()
+    candidates = [
+        (value, refs) for value, refs in _candidates(db, kind, fragment, MAX_CANDIDATES) if lowered in value.casefold()
+    ]
+    candidates.sort(key=lambda item: (not item[0].casefold().startswith(lowered), -item[1], item[0]))
+    values = [value for value, _ in candidates[:limit]]
+
+    if fuzzy and len(values) < limit:
+        for value in _fuzzy(db, kind, fragment, limit):
+            if value not in values:
+                values.append(value)
+    return values[:limit]
@@ -0,0 +1,73 @@
+"""
+키셋(커서) 페이지네이션 도우미
+
+정렬 키 + id로 마지막 행 위치를 불투명한 토큰으로 만들어 다음 페이지 조회 시
+`(정렬키, id) < (토큰 값)` 조건으로 인덱스를 바로 탐색합니다.
+OFFSET처럼 건너뛴 행을 다시 읽지 않으므로 깊은 페이지도 첫 페이지와 비용이 같습니다.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import tuple_
+
+# 다음 페이지 커서를 전달하는 응답 헤더
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def _encode_value(value: Any):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise InvalidCursorError("알 수 없는 커서 값")
+    return value
+
+
+def encode_cursor(scope: str, values: Sequence[Any]) -> str:
+    """정렬 키 값들을 URL에 안전한 불투명 토큰으로 변환합니다."""
+    payload = {"s": scope, "v": [_encode_value(value) for value in values]}
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(scope: str, token: str, size: int) -> List[Any]:
+    """토큰을 정렬 키 값 목록으로 되돌립니다. 다른 목록의 토큰이거나 손상되었으면 InvalidCursorError."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw.decode("utf-8"))
+        values = [_decode_value(value) for value in payload["v"]]
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("유효하지 않은 커서입니다") from e
+
+    if payload.get("s") != scope or len(values) != size:
+        raise InvalidCursorError("유효하지 않은 커서입니다")
+    return values
+
+
+def apply_keyset(query, columns: Sequence, scope: str, cursor: str):
+    """내림차순 (columns...) 정렬 기준으로 커서 다음 위치부터 조회하도록 조건을 추가합니다."""
+    values = decode_cursor(scope, cursor, len(columns))
+    return query.filter(tuple_(*columns) < tuple_(*values))
+
+
+def next_cursor(rows: List, limit: int, scope: str, key) -> Optional[str]:
+    """limit + 1개를 조회한 결과로 다음 페이지 커서를 만듭니다. 다음 페이지가 없으면 None."""
+    if len(rows) <= limit:
+        return None
+    return encode_cursor(scope, key(rows[limit - 1]))
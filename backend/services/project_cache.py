@@ -0,0 +1,144 @@
+"""
+프로젝트명 ↔ ID 캐시
+
+보고서/업무 생성·수정·필터와 일괄 등록은 대부분 프로젝트명을 먼저 project_id로 바꿉니다.
+그 결과를 프로세스마다 크기 제한 LRU로 보관해 같은 이름을 반복해서 조회하지 않습니다.
+
+- 프로젝트 생성/수정/삭제 시 invalidate(db)가 로컬 캐시를 비우고 projects 변경 버전을 올립니다.
+  (같은 버전을 프로젝트 조회 API의 ETag에도 사용, services/change_versions.py)
+- 다른 워커는 세션(요청)마다 한 번 버전을 읽고, 보관한 버전과 다르면 캐시를 비웁니다.
+  (기본키 한 행 조회라 프로젝트 행을 읽는 것보다 가볍고, 한 요청에서 여러 이름을 찾아도 한 번만 확인)
+- 없는 이름은 보관하지 않으므로 새로 만든 프로젝트는 바로 조회됩니다.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from config import settings
+from models import CacheVersionDB, ProjectDB
+from services import change_versions
+from services.batching import id_chunks
+
+CACHE_KEY = change_versions.PROJECTS
+# 세션(요청)마다 한 번만 버전을 확인하도록 Session.info에 기록하는 키
+_SESSION_VERSION_KEY = "project_cache_version"
+
+
+class ProjectCache:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._ids: "OrderedDict[str, int]" = OrderedDict()
+        self._names: "OrderedDict[int, str]" = OrderedDict()
+        self._version: Optional[int] = None
+
+    def _sync(self, db: Session):
+        """DB의 캐시 버전이 보관한 버전과 다르면 캐시를 비웁니다."""
+        version = db.info.get(_SESSION_VERSION_KEY)
+        if version is None:
+            version = db.query(CacheVersionDB.version).filter(CacheVersionDB.key == CACHE_KEY).scalar() or 0
+            db.info[_SESSION_VERSION_KEY] = version
+        with self._lock:
+            if version != self._version:
+                self._ids.clear()
+                self._names.clear()
+                self._version = version
+
+    def _store(self, project_id: int, name: str):
+        with self._lock:
+            self._ids[name] = project_id
+            self._ids.move_to_end(name)
+            self._names[project_id] = name
+            self._names.move_to_end(project_id)
+            while len(self._ids) > self.max_size:
+                self._ids.popitem(last=False)
+            while len(self._names) > self.max_size:
+                self._names.popitem(last=False)
+
+    def _get(self, mapping: OrderedDict, key):
+        with self._lock:
+            value = mapping.get(key)
+            if value is not None:
+                mapping.move_to_end(key)
+            return value
+
+    def id_for_name(self, db: Session, name: str) -> Optional[int]:
+        """프로젝트명의 ID. 없는 프로젝트면 None."""
+        return self.ids_for_names(db, [name]).get(name)
+
+    def ids_for_names(self, db: Session, names: Iterable[str]) -> Dict[str, int]:
+        """프로젝트명 → ID 매핑. 캐시에 없는 이름만 묶어서 조회하며 없는 이름은 결과에서 빠집니다."""
+        names = set(names)
+        if self.max_size <= 0:
+            return self._load_ids(db, names)
+
+        self._sync(db)
+        mapping, missing = {}, []
+        for name in names:
+            project_id = self._get(self._ids, name)
+            if project_id is None:
+                missing.append(name)
+            else:
+                mapping[name] = project_id
+
+        loaded = self._load_ids(db, missing)
+        for name, project_id in loaded.items():
+            self._store(project_id, name)
+        mapping.update(loaded)
+        return mapping
+
+    def name_for_id(self, db: Session, project_id: int) -> Optional[str]:
+        """프로젝트 ID의 이름. 없는 프로젝트면 None."""
+        if self.max_size > 0:
+            self._sync(db)
+            name = self._get(self._names, project_id)
+            if name is not None:
+                return name
+
+        row = db.query(ProjectDB.name).filter(ProjectDB.id == project_id).first()
+        if row is None:
+            return None
+        if self.max_size > 0:
+            self._store(project_id, row[0])
+        return row[0]
+
+    def _load_ids(self, db: Session, names) -> Dict[str, int]:
+        mapping = {}
+        for chunk in id_chunks(names):
+            for project_id, name in db.query(ProjectDB.id, ProjectDB.name).filter(ProjectDB.name.in_(chunk)):
+                mapping[name] = project_id
+        return mapping
+
+    def invalidate(self, db: Optional[Session] = None):
+        """로컬 캐시를 비우고, db가 있으면 다른 워커도 비우도록 버전을 올립니다. (커밋은 호출자)"""
+        with self._lock:
+            self._ids.clear()
+            self._names.clear()
+            self._version = None
+        if db is None:
+            return
+
+        db.info.pop(_SESSION_VERSION_KEY, None)
+        change_versions.bump(db, CACHE_KEY)
+
+
+project_cache = ProjectCache(settings.PROJECT_CACHE_SIZE)
+
+
+def project_id_for_name(db: Session, name: str) -> Optional[int]:
+    return project_cache.id_for_name(db, name)
+
+
+def project_ids_for_names(db: Session, names: Iterable[str]) -> Dict[str, int]:
+    return project_cache.ids_for_names(db, names)
+
+
+def project_name_for_id(db: Session, project_id: int) -> Optional[str]:
+    return project_cache.name_for_id(db, project_id)
+
+
+def invalidate(db: Optional[Session] = None):
+    project_cache.invalidate(db)
@@ -0,0 +1,119 @@
+"""
+프로젝트 일괄 등록 엔진
+
+기존 프로젝트명을 미리 일괄 조회해 행마다 중복 확인 쿼리를 보내지 않습니다.
+행 단위 오류는 기존 업로드 API와 같은 형식({row, error})으로 반환합니다.
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Callable, List, Optional, Set, Tuple
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from models import ProjectDB, ProjectPriority, ProjectStatus
+from services import change_feed, metrics, project_cache
+from services.batching import chunks, id_chunks
+from services.detailed_task_import import planned_row_index
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = ["name"]
+# 한 번에 flush/커밋할 프로젝트 수
+IMPORT_BATCH_SIZE = 500
+
+
+def _to_date(value):
+    if pd.isna(value):
+        return None
+    return datetime.strptime(str(value), "%Y-%m-%d").date()
+
+
+def existing_project_names(db: Session, names: List[str]) -> Set[str]:
+    """이미 등록된 프로젝트명을 일괄 조회합니다."""
+    existing = set()
+    for chunk in id_chunks(names):
+        existing.update(name for (name,) in db.query(ProjectDB.name).filter(ProjectDB.name.in_(chunk)))
+    return existing
+
+
+def plan_import(db: Session, df: pd.DataFrame) -> Tuple[List[dict], List[dict]]:
+    """등록할 프로젝트 목록과 오류 목록을 계산합니다. (DB 쓰기 없음)"""
+    names = df["name"].astype(str).str.strip()
+    taken = existing_project_names(db, names.tolist())
+
+    projects: List[dict] = []
+    errors: List[dict] = []
+
+    for (idx, row), name in zip(df.iterrows(), names):
+        try:
+            # 중복 체크 (기존 데이터 및 같은 파일 내 앞선 행)
+            if name in taken:
+                errors.append({"row": idx + 2, "error": f"프로젝트 '{row['name']}'는 이미 존재합니다"})
+                continue
+
+            project = {
+                "name": name,
+                "description": str(row.get("description", "")),
+                "start_date": _to_date(row["start_date"]) if "start_date" in row else None,
+                "end_date": _to_date(row["end_date"]) if "end_date" in row else None,
+                "status": ProjectStatus(str(row.get("status", "planning")).lower()),
+                "priority": ProjectPriority(str(row.get("priority", "medium")).lower()),
+                "manager": str(row.get("manager", "")),
+                "team_members": str(row.get("team_members", "")),
+                "budget": float(row["budget"]) if "budget" in row and not pd.isna(row["budget"]) else None,
+                "notes": str(row.get("notes", "")),
+            }
+
+            taken.add(name)
+            projects.append(project)
+
+        except Exception as e:
+            errors.append({"row": idx + 2, "error": str(e)})
+
+    return projects, errors
+
+
+def import_projects(
+    db: Session, df: pd.DataFrame, on_batch: Optional[Callable[[int, int, int, Optional[int], List[dict]], None]] = None
+) -> dict:
+    """DataFrame의 프로젝트를 일괄 등록합니다.
+
+    on_batch가 없으면 전체를 하나의 트랜잭션으로 커밋합니다.
+    on_batch가 주어지면(백그라운드 작업) 배치마다
+    on_batch(처리 행 수, 전체 행 수, 성공 건수, 배치 마지막 행의 index, 오류 목록)를 호출한 뒤 커밋합니다.
+    """
+    started = time.perf_counter()
+    projects, errors = plan_import(db, df)
+    total_rows = len(df)
+    created_projects: List[str] = []
+
+    try:
+        if on_batch is not None:
+            row_index = planned_row_index(df, errors)
+            on_batch(len(errors), total_rows, 0, None, errors)
+            db.commit()
+
+        for batch in chunks(projects, IMPORT_BATCH_SIZE):
+            rows = [ProjectDB(**project) for project in batch]
+            db.add_all(rows)
+            db.flush()
+            project_cache.invalidate(db)
+            change_feed.record(db, change_feed.PROJECT, change_feed.CREATED, [row.id for row in rows])
+            created_projects.extend(project["name"] for project in batch)
+            if on_batch is not None:
+                last_row = int(row_index[len(created_projects) - 1])
+                on_batch(len(errors) + len(created_projects), total_rows, len(created_projects), last_row, errors)
+                db.commit()
+
+        if on_batch is None and created_projects:
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    logger.info(f"프로젝트 일괄 등록: 성공 {len(created_projects)}, 실패 {len(errors)}")
+    metrics.record_import("projects", len(created_projects), len(errors), time.perf_counter() - started)
+    return {"created_projects": created_projects, "errors": errors}
@@ -0,0 +1,53 @@
+"""
+요청별 SQL 계측 미들웨어
+
+database.configure_query_metrics()가 엔진 이벤트로 집계한 쿼리 수와 DB 시간을
+응답 헤더로 돌려줍니다. N+1 의심 엔드포인트를 브라우저 개발자 도구나 curl -I로 바로 확인할 수 있습니다.
+
+    X-DB-Queries: 12
+    Server-Timing: db;dur=3.4;desc="12 queries", app;dur=8.1
+
+순수 ASGI 미들웨어라 StreamingResponse도 감싸지 않으며, 헤더 값은 응답 시작 시점까지의 집계입니다.
+"""
+
+import time
+
+from database import QueryStats, current_query_stats
+
+DB_QUERIES_HEADER = "X-DB-Queries"
+SERVER_TIMING_HEADER = "Server-Timing"
+
+
+class QueryMetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(f"{scope['method']} {scope['path']}")
+        token = current_query_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_metrics(message):
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - started) * 1000
+                headers = list(message.get("headers", []))
+                headers.append((DB_QUERIES_HEADER.lower().encode("latin-1"), str(stats.count).encode("latin-1")))
+                headers.append(
+                    (
+                        SERVER_TIMING_HEADER.lower().encode("latin-1"),
+                        f'db;dur={stats.duration_ms:.1f};desc="{stats.count} queries", app;dur={total_ms:.1f}'.encode(
+                            "latin-1"
+                        ),
+                    )
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            current_query_stats.reset(token)
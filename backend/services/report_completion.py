@@ -0,0 +1,88 @@
+"""
+주간 보고서 완료 판정
+
+보고서가 완료 상태인지(다음 주 계획이 없거나 완료 키워드를 포함) 쓰기 시점에 한 번 판정해
+WeeklyReportDB.is_completion에 저장합니다. 완료율 집계와 모든 API는 이 값만 사용합니다.
+(예전에는 요약 API / 프로젝트 상세 API / CSV 내보내기가 조회 때마다 서로 다른 키워드로 본문을 검사)
+
+- 판정 기준: 다음 주 계획이 비어 있음(공백만 있는 경우 포함) 또는 COMPLETION_KEYWORDS 중 하나를 포함 (대소문자 무시)
+- 기존 보고서(값이 NULL)는 시작 시 backfill_missing_flags로 한 번에 채우고 해당 프로젝트 집계를 다시 계산
+- 키워드를 바꾸면 reclassify_all(rebuild_rollups.py)로 전체를 다시 판정
+"""
+
+from typing import Optional
+
+from sqlalchemy import case, func, or_, update
+from sqlalchemy.orm import Session
+
+from models import WeeklyReportDB
+from services import rollups
+
+COMPLETION_KEYWORDS = ("완료", "종료", "마무리", "끝", "완성", "finish", "complete")
+
+_WHITESPACE = " \t\r\n"
+
+
+def is_completion_plan(next_week_plan: Optional[str]) -> bool:
+    """다음 주 계획 문자열로 완료 여부를 판정합니다."""
+    if next_week_plan is None or not next_week_plan.strip(_WHITESPACE):
+        return True
+    lowered = next_week_plan.lower()
+    return any(keyword in lowered for keyword in COMPLETION_KEYWORDS)
+
+
+def classify(report: WeeklyReportDB) -> bool:
+    """보고서의 완료 여부를 다시 판정해 저장합니다. (생성/수정 시 flush 전에 호출)"""
+    report.is_completion = is_completion_plan(report.next_week_plan)
+    return report.is_completion
+
+
+def classify_row(row: dict) -> dict:
+    """일괄 INSERT용 dict 행에 완료 여부를 채웁니다."""
+    row["is_completion"] = is_completion_plan(row.get("next_week_plan"))
+    return row
+
+
+def _completion_sql():
+    """is_completion_plan과 같은 기준의 SQL 식 (기존 행 일괄 판정용, lower()는 ASCII 기준이라 키워드 판정과 동일)"""
+    plan = WeeklyReportDB.next_week_plan
+    lowered = func.lower(plan)
+    return case(
+        (
+            or_(
+                plan.is_(None),
+                func.trim(plan, _WHITESPACE) == "",
+                *[lowered.like(f"%{keyword}%") for keyword in COMPLETION_KEYWORDS],
+            ),
+            True,
+        ),
+        else_=False,
+    )
+
+
+def _reclassify(db: Session, condition) -> int:
+    project_ids = [row[0] for row in db.query(WeeklyReportDB.project_id).filter(condition).distinct()]
+    if not project_ids:
+        return 0
+    updated = db.execute(
+        update(WeeklyReportDB)
+        .where(condition)
+        .values(is_completion=_completion_sql())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    for project_id in project_ids:
+        rollups.refresh_project(db, project_id)
+    db.commit()
+    return updated
+
+
+def backfill_missing_flags(db: Session) -> int:
+    """완료 여부가 비어 있는 보고서를 판정하고, 해당 프로젝트의 완료율 집계를 다시 계산해 커밋합니다."""
+    return _reclassify(db, WeeklyReportDB.is_completion.is_(None))
+
+
+def reclassify_all(db: Session) -> int:
+    """모든 보고서를 다시 판정합니다. (키워드 변경 후 실행, 판정이 바뀐 행만 갱신)"""
+    return _reclassify(
+        db, or_(WeeklyReportDB.is_completion.is_(None), WeeklyReportDB.is_completion != _completion_sql())
+    )
@@ -0,0 +1,336 @@
+"""
+요약 집계 테이블 관리
+
+주간 보고서/상세 업무가 변경될 때 영향을 받는 프로젝트, 주차, 담당자 집계 행만
+다시 계산합니다. 요약 API는 집계 테이블을 키로 바로 조회합니다.
+"""
+
+import json
+import logging
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, distinct, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models import (
+    AssigneeRollupDB,
+    DetailedTaskDB,
+    ProjectDB,
+    ProjectRollupDB,
+    WeekRollupDB,
+    WeeklyReportDB,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _has_text(column):
+    """공백만 있는 값은 제외하고 내용이 있는지 확인하는 SQL 조건"""
+    return and_(column.isnot(None), func.trim(column, " \t\r\n") != "")
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _loads(value: Optional[str], default):
+    return json.loads(value) if value else default
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _commit_created(db: Session, model, key):
+    """조회 중 새로 계산한 집계 행을 커밋합니다.
+
+    다른 워커가 같은 키를 먼저 만들었으면(기본키 충돌) 롤백하고 그 행을 다시 읽습니다.
+    """
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+    return db.get(model, key)
+
+
+# ---------------------------------------------------------------------------
+# 프로젝트 집계
+# ---------------------------------------------------------------------------
+
+
+def refresh_project(db: Session, project_id: int) -> ProjectRollupDB:
+    """프로젝트 한 개의 집계 행을 다시 계산합니다."""
+    db.flush()
+
+    report_count, week_count, latest_week, issue_count, completed_count = (
+        db.query(
+            func.count(WeeklyReportDB.id),
+            func.count(distinct(WeeklyReportDB.week)),
+            func.max(WeeklyReportDB.week),
+            _count_if(_has_text(WeeklyReportDB.issues_risks)),
+            # 완료 여부는 쓰기 시점에 판정된 값 (services/report_completion)
+            _count_if(WeeklyReportDB.is_completion == True),
+        )
+        .filter(WeeklyReportDB.project_id == project_id)
+        .one()
+    )
+
+    stages = [
+        row[0]
+        for row in db.query(distinct(WeeklyReportDB.stage))
+        .filter(WeeklyReportDB.project_id == project_id)
+        .order_by(WeeklyReportDB.stage)
+    ]
+    weeks = [
+        row[0]
+        for row in db.query(distinct(WeeklyReportDB.week))
+        .filter(WeeklyReportDB.project_id == project_id)
+        .order_by(WeeklyReportDB.week.desc())
+    ]
+
+    rollup = db.get(ProjectRollupDB, project_id)
+    if rollup is None:
+        rollup = ProjectRollupDB(project_id=project_id)
+        db.add(rollup)
+
+    rollup.report_count = report_count
+    rollup.week_count = week_count
+    rollup.latest_week = latest_week
+    rollup.issue_count = issue_count
+    rollup.completed_report_count = completed_count
+    rollup.stages = _dumps(stages)
+    rollup.weeks = _dumps(weeks)
+    return rollup
+
+
+def get_project_rollup(db: Session, project_id: int) -> ProjectRollupDB:
+    """프로젝트 집계를 조회합니다. 아직 없으면 계산해서 저장합니다."""
+    rollup = db.get(ProjectRollupDB, project_id)
+    if rollup is None:
+        refresh_project(db, project_id)
+        rollup = _commit_created(db, ProjectRollupDB, project_id)
+    return rollup
+
+
+def project_rollup_stages(rollup: ProjectRollupDB):
+    return _loads(rollup.stages, [])
+
+
+def project_rollup_weeks(rollup: ProjectRollupDB):
+    return _loads(rollup.weeks, [])
+
+
+# ---------------------------------------------------------------------------
+# 주차 집계
+# ---------------------------------------------------------------------------
+
+
+def refresh_week(db: Session, week: str) -> Optional[WeekRollupDB]:
+    """주차 한 개의 집계 행을 다시 계산합니다. 보고서가 없으면 행을 삭제합니다."""
+    db.flush()
+
+    project_rows = (
+        db.query(
+            ProjectDB.name,
+            func.count(WeeklyReportDB.id),
+            _count_if(_has_text(WeeklyReportDB.issues_risks)),
+        )
+        .join(ProjectDB, ProjectDB.id == WeeklyReportDB.project_id)
+        .filter(WeeklyReportDB.week == week)
+        .group_by(ProjectDB.name)
+        .order_by(ProjectDB.name)
+        .all()
+    )
+
+    rollup = db.get(WeekRollupDB, week)
+    if not project_rows:
+        if rollup is not None:
+            db.delete(rollup)
+        return None
+
+    if rollup is None:
+        rollup = WeekRollupDB(week=week)
+        db.add(rollup)
+
+    rollup.report_count = sum(report_count for _, report_count, _ in project_rows)
+    rollup.project_count = len(project_rows)
+    rollup.projects_with_issues = len([1 for _, _, issue_count in project_rows if issue_count])
+    rollup.issue_count = sum(issue_count for _, _, issue_count in project_rows)
+    rollup.project_list = _dumps([name for name, _, _ in project_rows])
+    return rollup
+
+
+def get_week_rollup(db: Session, week: str) -> Optional[WeekRollupDB]:
+    """주차 집계를 조회합니다. 아직 없으면 계산해서 저장합니다."""
+    rollup = db.get(WeekRollupDB, week)
+    if rollup is None and refresh_week(db, week) is not None:
+        rollup = _commit_created(db, WeekRollupDB, week)
+    return rollup
+
+
+def week_rollup_projects(rollup: WeekRollupDB):
+    return _loads(rollup.project_list, [])
+
+
+# ---------------------------------------------------------------------------
+# 담당자 집계
+# ---------------------------------------------------------------------------
+
+
+def refresh_assignee(db: Session, assignee: Optional[str]) -> Optional[AssigneeRollupDB]:
+    """담당자 한 명의 집계 행을 다시 계산합니다. 업무가 없으면 행을 삭제합니다."""
+    if not assignee:
+        return None
+    db.flush()
+
+    progress = func.coalesce(DetailedTaskDB.progress_rate, 0)
+    rows = (
+        db.query(
+            ProjectDB.name,
+            DetailedTaskDB.current_status,
+            func.count(DetailedTaskDB.id),
+            func.sum(progress),
+            _count_if(progress >= 100),
+            _count_if(and_(progress > 0, progress < 100)),
+            _count_if(progress == 0),
+            _count_if(DetailedTaskDB.has_risk == True),
+        )
+        .join(ProjectDB, ProjectDB.id == DetailedTaskDB.project_id)
+        .filter(DetailedTaskDB.assignee == assignee)
+        .group_by(ProjectDB.name, DetailedTaskDB.current_status)
+        .all()
+    )
+
+    rollup = db.get(AssigneeRollupDB, assignee)
+    if not rows:
+        if rollup is not None:
+            db.delete(rollup)
+        return None
+
+    task_count = completed = in_progress = not_started = with_risk = 0
+    progress_sum = 0.0
+    project_breakdown = {}
+    project_progress = {}
+    status_breakdown = {}
+
+    for project_name, status, count, group_progress, done, doing, todo, risky in rows:
+        task_count += count
+        completed += done
+        in_progress += doing
+        not_started += todo
+        with_risk += risky
+        progress_sum += group_progress or 0.0
+
+        bucket = project_breakdown.setdefault(
+            project_name, {"total": 0, "completed": 0, "in_progress": 0, "with_risk": 0, "avg_progress": 0.0}
+        )
+        bucket["total"] += count
+        bucket["completed"] += done
+        bucket["in_progress"] += doing
+        bucket["with_risk"] += risky
+        project_progress[project_name] = project_progress.get(project_name, 0.0) + (group_progress or 0.0)
+
+        if status is not None:
+            status_breakdown[status.value] = status_breakdown.get(status.value, 0) + count
+
+    for project_name, bucket in project_breakdown.items():
+        bucket["avg_progress"] = round(project_progress[project_name] / bucket["total"], 1)
+
+    if rollup is None:
+        rollup = AssigneeRollupDB(assignee=assignee)
+        db.add(rollup)
+
+    rollup.task_count = task_count
+    rollup.completed_count = completed
+    rollup.in_progress_count = in_progress
+    rollup.not_started_count = not_started
+    rollup.risk_count = with_risk
+    rollup.avg_progress = round(progress_sum / task_count, 1)
+    rollup.project_breakdown = _dumps(project_breakdown)
+    rollup.status_breakdown = _dumps(status_breakdown)
+    return rollup
+
+
+def get_assignee_rollup(db: Session, assignee: str) -> Optional[AssigneeRollupDB]:
+    """담당자 집계를 조회합니다. 아직 없으면 계산해서 저장합니다."""
+    rollup = db.get(AssigneeRollupDB, assignee)
+    if rollup is None and refresh_assignee(db, assignee) is not None:
+        rollup = _commit_created(db, AssigneeRollupDB, assignee)
+    return rollup
+
+
+def assignee_rollup_projects(rollup: AssigneeRollupDB):
+    return _loads(rollup.project_breakdown, {})
+
+
+def assignee_rollup_statuses(rollup: AssigneeRollupDB):
+    return _loads(rollup.status_breakdown, {})
+
+
+# ---------------------------------------------------------------------------
+# 쓰기 핸들러용 헬퍼
+# ---------------------------------------------------------------------------
+
+
+def refresh_for_reports(db: Session, keys: Iterable[Tuple[int, str]]):
+    """변경된 주간 보고서의 (project_id, week) 키에 해당하는 집계를 갱신합니다."""
+    keys = set(keys)
+    for project_id in {project_id for project_id, _ in keys}:
+        refresh_project(db, project_id)
+    for week in {week for _, week in keys}:
+        refresh_week(db, week)
+
+
+def refresh_for_tasks(db: Session, assignees: Iterable[Optional[str]]):
+    """변경된 상세 업무의 담당자 집계를 갱신합니다."""
+    for assignee in set(assignees):
+        refresh_assignee(db, assignee)
+
+
+def project_dependents(db: Session, project_id: int) -> Tuple[List[str], List[str]]:
+    """프로젝트명을 담고 있는 주차/담당자 집계 키를 조회합니다. (변경 전에 호출)"""
+    weeks = [
+        row[0] for row in db.query(distinct(WeeklyReportDB.week)).filter(WeeklyReportDB.project_id == project_id)
+    ]
+    assignees = [
+        row[0]
+        for row in db.query(distinct(DetailedTaskDB.assignee)).filter(DetailedTaskDB.project_id == project_id)
+        if row[0]
+    ]
+    return weeks, assignees
+
+
+def refresh_for_project(
+    db: Session, project_id: int, weeks: Iterable[str], assignees: Iterable[str], deleted: bool = False
+):
+    """프로젝트 이름 변경/삭제 후 관련 주차/담당자 집계를 갱신합니다."""
+    db.flush()
+    if deleted:
+        db.query(ProjectRollupDB).filter(ProjectRollupDB.project_id == project_id).delete()
+    for week in set(weeks):
+        refresh_week(db, week)
+    for assignee in set(assignees):
+        refresh_assignee(db, assignee)
+
+
+def rebuild_all(db: Session):
+    """모든 집계 테이블을 원본 데이터로부터 다시 계산합니다. (드리프트 복구용)"""
+    db.query(ProjectRollupDB).delete()
+    db.query(WeekRollupDB).delete()
+    db.query(AssigneeRollupDB).delete()
+
+    project_ids = [row[0] for row in db.query(ProjectDB.id)]
+    weeks = [row[0] for row in db.query(distinct(WeeklyReportDB.week))]
+    assignees = [row[0] for row in db.query(distinct(DetailedTaskDB.assignee)) if row[0]]
+
+    for project_id in project_ids:
+        refresh_project(db, project_id)
+    for week in weeks:
+        refresh_week(db, week)
+    for assignee in assignees:
+        refresh_assignee(db, assignee)
+
+    db.commit()
+    logger.info(f"집계 테이블 재계산 완료: 프로젝트 {len(project_ids)}, 주차 {len(weeks)}, 담당자 {len(assignees)}")
+    return {"projects": len(project_ids), "weeks": len(weeks), "assignees": len(assignees)}
@@ -0,0 +1,203 @@
+"""
+보고서/상세 업무 전문 검색 (SQLite FTS5)
+
+weekly_reports / detailed_tasks를 원본으로 하는 external-content FTS5 테이블을 두고,
+원본 테이블의 INSERT/UPDATE/DELETE 트리거로 색인을 같은 트랜잭션에서 갱신합니다.
+(ORM 쓰기, 일괄 등록의 executemany, 프로젝트 삭제 cascade 모두 트리거로 반영)
+
+- 본문은 원본 테이블에만 저장하고 FTS 테이블에는 역색인만 둠 (중복 저장 없음)
+- 검색어는 단어별 접두어 검색("단어"*)을 AND로 묶음 → "검색" 으로 "검색을", "검색기능" 도 찾음
+  (2·3글자 접두어 색인으로 접두어 확장 비용을 줄임)
+- 순위는 bm25(컬럼 가중치), 결과에는 일치 부분을 <mark>로 감싼 snippet 포함
+- bm25는 일치한 행마다 계산되므로, 아주 흔한 단어는 최신 RANK_CANDIDATES건 안에서만 순위를 매김
+  (rowid 역순으로 후보 하한을 먼저 찾고 rowid 범위로 제한 → 일치 건수와 무관하게 일정한 비용)
+- 색인이 없던 DB는 시작 시 한 번 전체 색인(rebuild)
+
+SQLite가 아니면 검색을 지원하지 않습니다. (SearchUnavailableError)
+"""
+
+import html
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+WEEKLY_REPORT = "weekly_report"
+DETAILED_TASK = "detailed_task"
+SEARCH_TYPES = (WEEKLY_REPORT, DETAILED_TASK)
+
+# snippet 일치 구간 표시 (HTML 이스케이프 후 <mark>로 바꿈)
+_MARK_OPEN = "\x02"
+_MARK_CLOSE = "\x03"
+SNIPPET_TOKENS = 16
+# 검색어 단어 수 상한
+MAX_TERMS = 10
+# 순위를 계산할 최대 후보 수 (프로젝트 필터가 없을 때, 최신 행 우선)
+RANK_CANDIDATES = 5000
+
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass(frozen=True)
+class _FtsTable:
+    name: str
+    source: str
+    columns: tuple
+    weights: tuple  # bm25 컬럼 가중치 (columns 순서)
+
+
+_TABLES = {
+    WEEKLY_REPORT: _FtsTable(
+        "weekly_reports_fts",
+        "weekly_reports",
+        ("stage", "this_week_work", "next_week_plan", "issues_risks"),
+        (2.0, 1.0, 1.0, 1.5),
+    ),
+    DETAILED_TASK: _FtsTable(
+        "detailed_tasks_fts",
+        "detailed_tasks",
+        ("task_item", "stage", "assignee", "description"),
+        (3.0, 1.5, 1.5, 1.0),
+    ),
+}
+
+
+class InvalidSearchQueryError(ValueError):
+    pass
+
+
+class SearchUnavailableError(ValueError):
+    pass
+
+
+def _ddl(table: _FtsTable) -> List[str]:
+    columns = ", ".join(table.columns)
+    new_values = ", ".join(f"new.{column}" for column in table.columns)
+    old_values = ", ".join(f"old.{column}" for column in table.columns)
+    delete_old = (
+        f"INSERT INTO {table.name}({table.name}, rowid, {columns}) VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = f"INSERT INTO {table.name}(rowid, {columns}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {table.name} USING fts5("
+        f"{columns}, content='{table.source}', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {table.name}_ai AFTER INSERT ON {table.source} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {table.name}_ad AFTER DELETE ON {table.source} BEGIN {delete_old} END",
+        # 색인 대상 컬럼이 바뀔 때만 다시 색인 (진행률/상태만 바뀌는 수정은 색인 비용 없음)
+        f"CREATE TRIGGER IF NOT EXISTS {table.name}_au AFTER UPDATE OF {columns} ON {table.source} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def _table_exists(conn: Connection, name: str) -> bool:
+    return conn.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": name}).first() is not None
+
+
+def ensure_search_index(engine: Engine) -> List[str]:
+    """FTS 테이블과 동기화 트리거를 만들고, 새로 만든 색인은 기존 데이터로 채웁니다. 새로 색인한 테이블명을 반환합니다."""
+    if engine.dialect.name != "sqlite":
+        return []
+    rebuilt = []
+    with engine.begin() as conn:
+        for table in _TABLES.values():
+            created = not _table_exists(conn, table.name)
+            for statement in _ddl(table):
+                conn.exec_driver_sql(statement)
+            if created:
+                conn.exec_driver_sql(f"INSERT INTO {table.name}({table.name}) VALUES ('rebuild')")
+                rebuilt.append(table.name)
+    return rebuilt
+
+
+def rebuild(db: Session):
+    """원본 테이블로 전체 색인을 다시 만듭니다. (트리거 밖에서 원본을 고친 경우 정리용, 커밋은 호출자)"""
+    for table in _TABLES.values():
+        db.execute(text(f"INSERT INTO {table.name}({table.name}) VALUES ('rebuild')"))
+
+
+def match_query(query: str) -> str:
+    """사용자 검색어를 FTS5 MATCH 식으로 바꿉니다. (단어별 접두어 검색 AND, 연산자/따옴표는 일반 문자로 취급)"""
+    terms = _TERM_PATTERN.findall(query)[:MAX_TERMS]
+    if not terms:
+        raise InvalidSearchQueryError("검색어에 글자나 숫자가 하나 이상 있어야 합니다.")
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _highlight(snippet: Optional[str]) -> str:
+    return html.escape(snippet or "").replace(_MARK_OPEN, "<mark>").replace(_MARK_CLOSE, "</mark>")
+
+
+def _rank_floor(db: Session, table: _FtsTable, match: str) -> Optional[int]:
+    """일치하는 행이 RANK_CANDIDATES건보다 많으면 최신 RANK_CANDIDATES번째 행의 rowid (순위 계산 하한)"""
+    return db.execute(
+        text(f"SELECT rowid FROM {table.name} WHERE {table.name} MATCH :match ORDER BY rowid DESC LIMIT 1 OFFSET :offset"),
+        {"match": match, "offset": RANK_CANDIDATES - 1},
+    ).scalar()
+
+
+def _search_table(db: Session, search_type: str, match: str, project_id: Optional[int], limit: int) -> List[Dict]:
+    table = _TABLES[search_type]
+    weights = ", ".join(str(weight) for weight in table.weights)
+    extra_columns = "s.week, s.stage" if search_type == WEEKLY_REPORT else "s.task_item, s.stage, s.assignee"
+    if project_id is not None:
+        # 프로젝트 필터는 원본 행 조인으로 적용 (bm25는 필터를 통과한 행만 계산)
+        candidate_filter, floor = "AND s.project_id = :project_id", None
+    else:
+        floor = _rank_floor(db, table, match)
+        candidate_filter = f"AND {table.name}.rowid >= :floor" if floor is not None else ""
+    rows = db.execute(
+        text(
+            f"SELECT s.id, s.project_id, {extra_columns}, "
+            f"bm25({table.name}, {weights}) AS score, "
+            f"snippet({table.name}, -1, :mark_open, :mark_close, '…', :tokens) AS snippet "
+            f"FROM {table.name} JOIN {table.source} AS s ON s.id = {table.name}.rowid "
+            f"WHERE {table.name} MATCH :match {candidate_filter} "
+            f"ORDER BY score LIMIT :limit"
+        ),
+        {
+            "match": match,
+            "project_id": project_id,
+            "floor": floor,
+            "limit": limit,
+            "mark_open": _MARK_OPEN,
+            "mark_close": _MARK_CLOSE,
+            "tokens": SNIPPET_TOKENS,
+        },
+    ).mappings()
+
+    hits = []
+    for row in rows:
+        hit = {
+            "type": search_type,
+            "id": row["id"],
+            "project_id": row["project_id"],
+            "stage": row["stage"],
+            "score": -row["score"],  # bm25는 낮을수록 관련도가 높음 → 높을수록 좋게 뒤집음
+            "snippet": _highlight(row["snippet"]),
+        }
+        if search_type == WEEKLY_REPORT:
+            hit.update(title=f"{row['week']} {row['stage']}", week=row["week"])
+        else:
+            hit.update(title=row["task_item"], assignee=row["assignee"])
+        hits.append(hit)
+    return hits
+
+
+def search(db: Session, query: str, types=SEARCH_TYPES, project_id: Optional[int] = None, limit: int = 20) -> List[Dict]:
+    """검색어와 일치하는 보고서/상세 업무를 관련도 순으로 반환합니다."""
+    if db.get_bind().dialect.name != "sqlite":
+        raise SearchUnavailableError("전문 검색은 SQLite(FTS5) 데이터베이스에서만 지원됩니다.")
+    match = match_query(query)
+
+    hits = []
+    for search_type in types:
+        hits.extend(_search_table(db, search_type, match, project_id, limit))
+    # 반올림하면 작은 bm25 값이 모두 0이 되므로 원래 값으로 정렬한 뒤 응답용으로만 반올림 (유효숫자 4자리)
+    hits.sort(key=lambda hit: hit["score"], reverse=True)
+    hits = hits[:limit]
+    for hit in hits:
+        hit["score"] = float(f"{hit['score']:.4g}")
+    return hits
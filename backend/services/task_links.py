@@ -0,0 +1,88 @@
+"""
+주간 보고서 ↔ 상세 업무 연결(weekly_report_detailed_tasks) 일괄 조회/변경
+
+relationship 컬렉션을 객체마다 지연 로딩하면 목록 크기만큼 쿼리가 늘어나므로,
+연결 정보가 필요한 곳은 대상 id 전체를 한 번에 조회합니다.
+연결 변경도 컬렉션을 비우고 다시 채우지 않고, 기존 연결과의 차이만 INSERT/DELETE 합니다.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, Set
+
+from sqlalchemy import bindparam, delete, insert
+from sqlalchemy.orm import Session
+
+from models import WeeklyReportDB, weekly_report_detailed_tasks
+from services.batching import id_chunks
+
+def linked_reports_by_task(db: Session, task_ids: Iterable[int]) -> Dict[int, List[dict]]:
+    """상세 업무 id별로 연결된 주간 보고서 요약({id, week, stage}) 목록을 반환합니다."""
+    links: Dict[int, List[dict]] = defaultdict(list)
+
+    for chunk in id_chunks(task_ids):
+        rows = (
+            db.query(
+                weekly_report_detailed_tasks.c.detailed_task_id,
+                WeeklyReportDB.id,
+                WeeklyReportDB.week,
+                WeeklyReportDB.stage,
+            )
+            .join(WeeklyReportDB, WeeklyReportDB.id == weekly_report_detailed_tasks.c.weekly_report_id)
+            .filter(weekly_report_detailed_tasks.c.detailed_task_id.in_(chunk))
+            .order_by(weekly_report_detailed_tasks.c.detailed_task_id, WeeklyReportDB.id)
+        )
+        for task_id, report_id, week, stage in rows:
+            links[task_id].append({"id": report_id, "week": week, "stage": stage})
+
+    return links
+
+
+def linked_task_ids_by_report(db: Session, report_ids: Iterable[int]) -> Dict[int, Set[int]]:
+    """주간 보고서 id별로 연결된 상세 업무 id 집합을 반환합니다. (연결 테이블 기본키만 읽음)"""
+    links: Dict[int, Set[int]] = defaultdict(set)
+
+    for chunk in id_chunks(report_ids):
+        rows = db.query(
+            weekly_report_detailed_tasks.c.weekly_report_id, weekly_report_detailed_tasks.c.detailed_task_id
+        ).filter(weekly_report_detailed_tasks.c.weekly_report_id.in_(chunk))
+        for report_id, task_id in rows:
+            links[report_id].add(task_id)
+
+    return links
+
+
+def replace_links(db: Session, desired: Mapping[int, Iterable[int]]) -> Dict[int, dict]:
+    """보고서별 연결 업무를 desired({보고서 id: 업무 id 목록})와 같게 맞춥니다. (커밋은 호출자)
+
+    바뀐 연결만 executemany INSERT/DELETE 하므로 비용은 전체 연결 수가 아니라 변경된 연결 수에 비례합니다.
+    보고서별 {previous_count, current_count, added, removed}를 반환합니다.
+    """
+    desired = {report_id: set(task_ids) for report_id, task_ids in desired.items()}
+    existing = linked_task_ids_by_report(db, desired)
+
+    to_insert, to_delete, summary = [], [], {}
+    for report_id, task_ids in desired.items():
+        current = existing.get(report_id, set())
+        added = sorted(task_ids - current)
+        removed = sorted(current - task_ids)
+        to_insert.extend({"weekly_report_id": report_id, "detailed_task_id": task_id} for task_id in added)
+        to_delete.extend({"report_id": report_id, "task_id": task_id} for task_id in removed)
+        summary[report_id] = {
+            "previous_count": len(current),
+            "current_count": len(task_ids),
+            "added": added,
+            "removed": removed,
+        }
+
+    if to_delete:
+        db.execute(
+            delete(weekly_report_detailed_tasks).where(
+                weekly_report_detailed_tasks.c.weekly_report_id == bindparam("report_id"),
+                weekly_report_detailed_tasks.c.detailed_task_id == bindparam("task_id"),
+            ),
+            to_delete,
+        )
+    if to_insert:
+        db.execute(insert(weekly_report_detailed_tasks), to_insert)
+
+    return summary
@@ -0,0 +1,311 @@
+"""
+WBS 일정 엔진
+
+1) 집계(rollup): 말단 태스크의 시작/종료일과 진행률을 상위 태스크로 올려 rollup_* 컬럼에 저장합니다.
+   진행률은 말단 기간(일)으로 가중 평균합니다. 태스크 하나가 바뀌면 자신과 상위 경로(tree_path)의
+   태스크만 다시 계산하므로 비용은 트리 깊이에 비례합니다.
+2) 일정 분석(compute_schedule): 선후행 관계(WBSDependencyDB, Finish-to-Start + lag)로
+   전진/후진 계산을 해 태스크별 가장 이른/늦은 시작·종료일(ES/EF/LS/LF), 총 여유(slack), 주공정(critical path)을 구합니다.
+   상위 태스크가 선후행 관계에 있으면 그 하위 말단 태스크 전체에 적용합니다.
+   (상위 태스크는 시작/종료 노드로 두어 관계 하나가 간선 하나가 되도록 함 → 비용은 태스크 수 + 관계 수에 비례)
+"""
+
+from collections import defaultdict, deque
+from datetime import date
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from models import WBSDependencyDB, WBSTaskDB
+from services.wbs_tree import path_ids
+
+
+class InvalidDependencyError(ValueError):
+    pass
+
+
+def _duration(task: WBSTaskDB) -> int:
+    return max((task.end_date - task.start_date).days + 1, 1)
+
+
+def _set_leaf_rollup(task: WBSTaskDB):
+    task.rollup_start_date = task.start_date
+    task.rollup_end_date = task.end_date
+    task.rollup_progress = float(task.progress or 0)
+    task.rollup_weight = _duration(task)
+
+
+def _refresh_node(db: Session, task: WBSTaskDB):
+    """직계 하위 태스크의 집계 값으로 task의 집계 값을 다시 계산합니다. 하위 태스크가 없으면 자신의 값."""
+    start, end, weight, weighted_progress, child_count = (
+        db.query(
+            func.min(WBSTaskDB.rollup_start_date),
+            func.max(WBSTaskDB.rollup_end_date),
+            func.sum(WBSTaskDB.rollup_weight),
+            func.sum(WBSTaskDB.rollup_progress * WBSTaskDB.rollup_weight),
+            func.count(WBSTaskDB.id),
+        )
+        .filter(WBSTaskDB.parent_id == task.id)
+        .one()
+    )
+    if not child_count:
+        _set_leaf_rollup(task)
+    else:
+        task.rollup_start_date = start
+        task.rollup_end_date = end
+        task.rollup_weight = weight or 0
+        task.rollup_progress = round(weighted_progress / weight, 2) if weight else 0.0
+    # 다음 상위 태스크 집계 쿼리가 방금 값을 읽도록 반영 (autoflush=False)
+    db.flush()
+
+
+def refresh_ancestors(db: Session, tree_path: Optional[str], include_self: bool = False):
+    """경로에 있는 상위 태스크들을 아래에서 위로 다시 집계합니다. (삭제/이동 전 경로에도 사용)"""
+    if not tree_path:
+        return
+    ids = path_ids(tree_path)
+    if not include_self:
+        ids = ids[:-1]
+    for task_id in reversed(ids):
+        task = db.get(WBSTaskDB, task_id)
+        if task is not None:
+            _refresh_node(db, task)
+
+
+def refresh_task(db: Session, task: WBSTaskDB):
+    """task와 그 상위 태스크들의 집계 값을 갱신합니다. (커밋은 호출자)"""
+    db.flush()
+    refresh_ancestors(db, task.tree_path, include_self=True)
+
+
+def refresh_paths(db: Session, tree_paths: Iterable[Optional[str]]):
+    """여러 경로(이동 전/후)의 상위 태스크들을 한 번씩만, 깊은 것부터 다시 집계합니다. (일괄 이동용)"""
+    db.flush()
+    task_ids = {task_id for tree_path in tree_paths if tree_path for task_id in path_ids(tree_path)[:-1]}
+    tasks = [task for task in (db.get(WBSTaskDB, task_id) for task_id in task_ids) if task is not None]
+    for task in sorted(tasks, key=lambda t: t.tree_depth or 0, reverse=True):
+        _refresh_node(db, task)
+
+
+def rebuild_project(db: Session, project_id: int) -> int:
+    """프로젝트 전체 집계 값을 아래에서 위로 다시 계산합니다. (기존 데이터 채우기/일괄 변경 후 정리용)"""
+    tasks = db.query(WBSTaskDB).filter(WBSTaskDB.project_id == project_id).all()
+    children: Dict[int, List[WBSTaskDB]] = defaultdict(list)
+    for task in tasks:
+        if task.parent_id is not None:
+            children[task.parent_id].append(task)
+
+    values: Dict[int, Tuple[date, date, float, int]] = {}
+    for task in sorted(tasks, key=lambda t: t.tree_depth or 0, reverse=True):
+        child_values = [values[child.id] for child in children.get(task.id, []) if child.id in values]
+        if not child_values:
+            values[task.id] = (task.start_date, task.end_date, float(task.progress or 0), _duration(task))
+            continue
+        weight = sum(value[3] for value in child_values)
+        progress = sum(value[2] * value[3] for value in child_values) / weight if weight else 0.0
+        values[task.id] = (
+            min(value[0] for value in child_values),
+            max(value[1] for value in child_values),
+            round(progress, 2),
+            weight,
+        )
+
+    rows = [
+        {"id": task_id, "rollup_start_date": v[0], "rollup_end_date": v[1], "rollup_progress": v[2], "rollup_weight": v[3]}
+        for task_id, v in values.items()
+    ]
+    if rows:
+        db.execute(update(WBSTaskDB), rows)
+    return len(rows)
+
+
+def backfill_missing_rollups(db: Session) -> int:
+    """집계 값이 비어 있는 태스크가 있는 프로젝트만 다시 계산하고 커밋합니다."""
+    project_ids = [
+        row[0] for row in db.query(WBSTaskDB.project_id).filter(WBSTaskDB.rollup_weight.is_(None)).distinct()
+    ]
+    updated = sum(rebuild_project(db, project_id) for project_id in project_ids)
+    if project_ids:
+        db.commit()
+    return updated
+
+
+# --------------------------------------------------------------------------
+# 선후행 관계 / 주공정 분석
+# --------------------------------------------------------------------------
+
+
+def _start_node(task_id: int, summary_ids) -> Hashable:
+    return ("start", task_id) if task_id in summary_ids else task_id
+
+
+def _finish_node(task_id: int, summary_ids) -> Hashable:
+    return ("finish", task_id) if task_id in summary_ids else task_id
+
+
+def _schedule_graph(tasks: List[WBSTaskDB], dependencies: Iterable[Tuple[int, int, int]]):
+    """일정 계산용 그래프 {노드: [(후행 노드, lag)]}를 만듭니다.
+
+    말단 태스크는 태스크 id 노드 하나, 상위 태스크는 기간 0인 시작/종료 노드(("start", id), ("finish", id))로 나타냅니다.
+    상위 시작 → 직계 하위 시작, 직계 하위 종료 → 상위 종료 간선으로 트리를 잇고,
+    선후행 관계는 선행의 종료 노드 → 후행의 시작 노드 간선 하나로 둡니다.
+    (상위 태스크 간 관계를 하위 말단 쌍마다 펼치지 않으므로 간선 수는 태스크 수 + 관계 수에 비례)
+    """
+    summary_ids = {task.parent_id for task in tasks if task.parent_id is not None}
+    leaves = [task for task in tasks if task.id not in summary_ids]
+
+    nodes: List[Hashable] = [leaf.id for leaf in leaves]
+    for summary_id in summary_ids:
+        nodes.extend((("start", summary_id), ("finish", summary_id)))
+
+    edges: Dict[Hashable, List[Tuple[Hashable, int]]] = defaultdict(list)
+    for task in tasks:
+        if task.parent_id is not None and task.parent_id in summary_ids:
+            edges[("start", task.parent_id)].append((_start_node(task.id, summary_ids), 0))
+            edges[_finish_node(task.id, summary_ids)].append((("finish", task.parent_id), 0))
+    for predecessor_id, successor_id, lag_days in dependencies:
+        edges[_finish_node(predecessor_id, summary_ids)].append((_start_node(successor_id, summary_ids), lag_days or 0))
+    return leaves, nodes, edges
+
+
+def _topological_order(nodes: List[Hashable], edges) -> Optional[List[Hashable]]:
+    """그래프 노드의 위상 정렬 순서. 순환이 있으면 None."""
+    indegree = {node: 0 for node in nodes}
+    for successors in edges.values():
+        for successor, _ in successors:
+            indegree[successor] += 1
+
+    queue = deque(node for node in nodes if indegree[node] == 0)
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for successor, _ in edges.get(node, []):
+            indegree[successor] -= 1
+            if indegree[successor] == 0:
+                queue.append(successor)
+    return order if len(order) == len(nodes) else None
+
+
+def _project_dependencies(db: Session, project_id: int) -> List[Tuple[int, int, int]]:
+    return db.query(WBSDependencyDB.predecessor_id, WBSDependencyDB.successor_id, WBSDependencyDB.lag_days).filter(
+        WBSDependencyDB.project_id == project_id
+    ).all()
+
+
+def validate_dependency(db: Session, predecessor: WBSTaskDB, successor: WBSTaskDB):
+    """선후행 관계를 추가할 수 있는지 확인합니다. 불가능하면 InvalidDependencyError."""
+    if predecessor.project_id != successor.project_id:
+        raise InvalidDependencyError("같은 프로젝트의 태스크끼리만 선후행 관계를 지정할 수 있습니다.")
+    if predecessor.tree_path.startswith(successor.tree_path) or successor.tree_path.startswith(predecessor.tree_path):
+        raise InvalidDependencyError("상위/하위 관계인 태스크끼리는 선후행 관계를 지정할 수 없습니다.")
+
+    tasks = db.query(WBSTaskDB).filter(WBSTaskDB.project_id == predecessor.project_id).all()
+    dependencies = _project_dependencies(db, predecessor.project_id) + [(predecessor.id, successor.id, 0)]
+    _, nodes, edges = _schedule_graph(tasks, dependencies)
+    if _topological_order(nodes, edges) is None:
+        raise InvalidDependencyError("선후행 관계에 순환이 생깁니다.")
+
+
+def compute_schedule(db: Session, project_id: int) -> dict:
+    """프로젝트 WBS의 가장 이른/늦은 일정, 여유, 주공정을 계산합니다. (WBSScheduleResponse 형태)"""
+    tasks = db.query(WBSTaskDB).filter(WBSTaskDB.project_id == project_id).order_by(WBSTaskDB.tree_path).all()
+    if not tasks:
+        return {"project_id": project_id, "tasks": [], "critical_path": []}
+
+    leaves, graph_nodes, edges = _schedule_graph(tasks, _project_dependencies(db, project_id))
+    order = _topological_order(graph_nodes, edges)
+    if order is None:
+        raise InvalidDependencyError("선후행 관계에 순환이 있어 일정을 계산할 수 없습니다.")
+
+    # 날짜는 서수(ordinal), 종료는 다음 날(배타적 경계)로 계산 → 기간 0인 상위 시작/종료 노드도 같은 식으로 처리
+    durations = {leaf.id: _duration(leaf) for leaf in leaves}
+    start_dates = {leaf.id: leaf.start_date.toordinal() for leaf in leaves}
+
+    predecessors: Dict[Hashable, List[Tuple[Hashable, int]]] = defaultdict(list)
+    for predecessor, successors in edges.items():
+        for successor, lag_days in successors:
+            predecessors[successor].append((predecessor, lag_days))
+
+    # 전진 계산: 시작일 제약(말단의 계획 시작일)과 선행 노드 종료 + lag 중 늦은 날
+    early_start, early_end = {}, {}
+    for node in order:
+        candidates = [
+            early_end[predecessor] + lag_days
+            for predecessor, lag_days in predecessors.get(node, [])
+            if early_end[predecessor] is not None
+        ]
+        if node in start_dates:
+            candidates.append(start_dates[node])
+        start = max(candidates) if candidates else None  # 선행도 하위도 없는 상위 시작 노드
+        early_start[node] = start
+        early_end[node] = None if start is None else start + durations.get(node, 0)
+
+    # 후진 계산: 프로젝트 종료와 후행 노드 시작 - lag 중 이른 날
+    project_end = max(early_end[leaf.id] for leaf in leaves)
+    late_start = {}
+    for node in reversed(order):
+        end = min([project_end] + [late_start[successor] - lag_days for successor, lag_days in edges.get(node, [])])
+        late_start[node] = end - durations.get(node, 0)
+
+    # 상위 태스크 값은 하위 값에서 아래→위로 모음 (말단: (ES, EF, LS, LF, slack))
+    children: Dict[int, List[int]] = defaultdict(list)
+    for task in tasks:
+        if task.parent_id is not None:
+            children[task.parent_id].append(task.id)
+    values: Dict[int, Tuple[int, int, int, int, int]] = {}
+    for task in sorted(tasks, key=lambda t: t.tree_depth or 0, reverse=True):
+        if task.id in durations:
+            es, ls = early_start[task.id], late_start[task.id]
+            values[task.id] = (es, es + durations[task.id] - 1, ls, ls + durations[task.id] - 1, ls - es)
+            continue
+        child_values = [values[child_id] for child_id in children[task.id] if child_id in values]
+        values[task.id] = (
+            min(value[0] for value in child_values),
+            max(value[1] for value in child_values),
+            min(value[2] for value in child_values),
+            max(value[3] for value in child_values),
+            min(value[4] for value in child_values),
+        )
+
+    nodes = []
+    for task in tasks:
+        es, ef, ls, lf, slack = values[task.id]
+        nodes.append(
+            {
+                "id": task.id,
+                "parent_id": task.parent_id,
+                "start_date": task.rollup_start_date or task.start_date,
+                "end_date": task.rollup_end_date or task.end_date,
+                "progress": task.rollup_progress if task.rollup_progress is not None else float(task.progress or 0),
+                "early_start": date.fromordinal(es),
+                "early_finish": date.fromordinal(ef),
+                "late_start": date.fromordinal(ls),
+                "late_finish": date.fromordinal(lf),
+                "slack_days": slack,
+                "is_critical": slack <= 0,
+            }
+        )
+
+    task_ids = {task.id for task in tasks}
+    roots = [task for task in tasks if task.parent_id is None or task.parent_id not in task_ids]
+    total_weight = sum(root.rollup_weight or _duration(root) for root in roots)
+    progress = (
+        sum((root.rollup_progress or 0) * (root.rollup_weight or _duration(root)) for root in roots) / total_weight
+        if total_weight
+        else 0.0
+    )
+
+    critical_path = sorted(
+        (leaf.id for leaf in leaves if values[leaf.id][4] <= 0),
+        key=lambda leaf_id: (values[leaf_id][0], values[leaf_id][1]),
+    )
+    return {
+        "project_id": project_id,
+        "start_date": date.fromordinal(min(early_start[leaf.id] for leaf in leaves)),
+        "end_date": date.fromordinal(project_end - 1),
+        "progress": round(progress, 2),
+        "critical_path": critical_path,
+        "tasks": nodes,
+    }
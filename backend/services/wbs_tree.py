@@ -0,0 +1,342 @@
+"""
+WBS 계층 조회/이동/삭제
+
+각 태스크는 최상위부터 자신까지의 "정렬키.id/" 구간을 이어 붙인 구체화 경로(tree_path)와
+깊이(tree_depth)를 가집니다. 구간은 고정 폭 숫자라 문자열 순서가 곧 형제 정렬 순서입니다.
+
+- 깊이 우선 순서 전체/하위 트리 조회: (project_id, tree_path) 인덱스 범위 스캔 한 번
+- 하위 트리 삭제: 같은 범위에 대한 DELETE 한 번
+- 상위 경로: 경로에 들어 있는 id로 한 번에 조회
+- 기간(뷰포트) 조회: (project_id, start_date, end_date) 인덱스로 겹치는 태스크를 찾고 상위 경로만 덧붙임
+- 순환 검사: 새 부모의 경로가 자신의 경로로 시작하는지 비교
+- 순서 변경(place): 형제 정렬키를 SORT_KEY_GAP 간격으로 띄워 두고 두 형제 사이 값으로 끼워 넣음
+  → 빈 값이 없을 때만 형제 전체 번호를 다시 매김
+
+깊이 제한 조회는 경계 아래 노드를 읽지 않도록 parent_id 재귀 CTE를 사용합니다.
+경로는 생성(assign_path)·이동/정렬 변경(move) 시 이 모듈에서 갱신하며,
+경로가 비어 있는 기존 데이터는 rebuild_paths로 채웁니다.
+"""
+
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import String, delete, exists, func, literal, or_, select, update
+from sqlalchemy.orm import Session, aliased
+
+from models import WBSDependencyDB, WBSTaskDB
+
+# 재귀 깊이 상한 (잘못된 데이터에 순환이 있어도 CTE가 끝나도록)
+MAX_WBS_DEPTH = 64
+
+# 음수 sort_order도 고정 폭 문자열 순서가 숫자 순서와 같도록 더하는 값 (32비트 정수 범위)
+SORT_KEY_OFFSET = 2**31
+# 경로 구간 문자(숫자, ".", "/")보다 큰 문자 → 접두사 범위의 상한
+_PREFIX_UPPER = "~"
+# 형제 사이에 끼워 넣을 수 있도록 정렬키를 띄우는 간격
+SORT_KEY_GAP = 1024
+
+
+class InvalidMoveError(ValueError):
+    pass
+
+
+def path_segment(sort_order: Optional[int], task_id: int) -> str:
+    return f"{(sort_order or 0) + SORT_KEY_OFFSET:010d}.{task_id:010d}/"
+
+
+def path_ids(tree_path: str) -> List[int]:
+    """경로에 들어 있는 태스크 id를 최상위부터 순서대로 반환합니다."""
+    return [int(segment.split(".")[1]) for segment in tree_path.rstrip("/").split("/")]
+
+
+def _in_subtree(tree_path: str):
+    """tree_path로 시작하는(자신 포함) 행 조건 → 인덱스 범위 스캔"""
+    return WBSTaskDB.tree_path >= tree_path, WBSTaskDB.tree_path < tree_path + _PREFIX_UPPER
+
+
+def _subtree_cte(project_id: Optional[int], root_id: Optional[int], depth: Optional[int]):
+    """시작 노드(root_id 또는 프로젝트 최상위 노드들)부터 depth 단계까지의 (id, level) CTE"""
+    if root_id is not None:
+        base = select(WBSTaskDB.id, literal(1).label("level")).where(WBSTaskDB.id == root_id)
+    else:
+        base = select(WBSTaskDB.id, literal(1).label("level")).where(
+            WBSTaskDB.project_id == project_id, WBSTaskDB.parent_id.is_(None)
+        )
+
+    subtree = base.cte("wbs_subtree", recursive=True)
+    child = aliased(WBSTaskDB)
+    max_level = min(depth, MAX_WBS_DEPTH) if depth else MAX_WBS_DEPTH
+    return subtree.union_all(
+        select(child.id, subtree.c.level + 1)
+        .join(subtree, child.parent_id == subtree.c.id)
+        .where(subtree.c.level < max_level)
+    )
+
+
+def fetch_subtree(
+    db: Session, project_id: int, root: Optional[WBSTaskDB] = None, depth: Optional[int] = None
+) -> List[Tuple[WBSTaskDB, bool]]:
+    """하위 트리 노드와 각 노드의 하위 태스크 존재 여부를 깊이 우선 순서의 (task, has_children) 목록으로 반환합니다.
+
+    root가 없으면 프로젝트 전체, depth가 없으면 끝까지 조회합니다.
+    depth로 잘린 경계 노드도 has_children으로 펼칠 수 있는지 알 수 있습니다.
+    """
+    if depth is None:
+        query = db.query(WBSTaskDB).filter(WBSTaskDB.project_id == project_id)
+        if root is not None:
+            query = query.filter(*_in_subtree(root.tree_path))
+        tasks = query.order_by(WBSTaskDB.tree_path).all()
+        parent_ids = {task.parent_id for task in tasks}
+        return [(task, task.id in parent_ids) for task in tasks]
+
+    subtree = _subtree_cte(project_id, root.id if root is not None else None, depth)
+    grandchild = aliased(WBSTaskDB)
+    has_children = exists().where(grandchild.parent_id == WBSTaskDB.id).label("has_children")
+
+    return [
+        (task, bool(flag))
+        for task, flag in db.query(WBSTaskDB, has_children)
+        .join(subtree, WBSTaskDB.id == subtree.c.id)
+        .order_by(WBSTaskDB.tree_path)
+    ]
+
+
+def fetch_window(
+    db: Session,
+    project_id: int,
+    window_start: Optional[date],
+    window_end: Optional[date],
+    root: Optional[WBSTaskDB] = None,
+) -> List[Tuple[WBSTaskDB, bool]]:
+    """[window_start, window_end] 기간과 겹치는 태스크와 그 상위 태스크들을 깊이 우선 순서의 (task, has_children)로 반환합니다.
+
+    기간 밖의 하위 태스크는 읽지 않으므로 결과 크기는 프로젝트 규모가 아니라 보이는 기간에 비례합니다.
+    """
+    grandchild = aliased(WBSTaskDB)
+    has_children = exists().where(grandchild.parent_id == WBSTaskDB.id).label("has_children")
+
+    query = db.query(WBSTaskDB, has_children).filter(WBSTaskDB.project_id == project_id)
+    if window_end is not None:
+        query = query.filter(WBSTaskDB.start_date <= window_end)
+    if window_start is not None:
+        query = query.filter(WBSTaskDB.end_date >= window_start)
+    if root is not None:
+        query = query.filter(*_in_subtree(root.tree_path))
+    rows = [(task, bool(flag)) for task, flag in query]
+
+    # 화면에 계층을 그릴 수 있도록 상위 경로 추가 (상위 태스크는 항상 하위 태스크가 있음)
+    found_ids = {task.id for task, _ in rows}
+    ancestor_ids = {ancestor_id for task, _ in rows if task.tree_path for ancestor_id in path_ids(task.tree_path)}
+    if root is not None:
+        ancestor_ids -= set(path_ids(root.tree_path)[:-1])
+    ancestor_ids -= found_ids
+    if ancestor_ids:
+        rows.extend((task, True) for task in db.query(WBSTaskDB).filter(WBSTaskDB.id.in_(ancestor_ids)))
+
+    rows.sort(key=lambda row: row[0].tree_path or "")
+    return rows
+
+
+def ancestor_path(db: Session, task_id: int) -> List[WBSTaskDB]:
+    """최상위 노드부터 task_id 자신까지의 경로를 반환합니다. (태스크가 없으면 빈 목록)"""
+    task = db.query(WBSTaskDB).filter(WBSTaskDB.id == task_id).first()
+    if not task:
+        return []
+    if not task.tree_path:
+        return [task]  # 경로를 계산할 수 없는 태스크 (부모 순환 등 잘못된 데이터)
+    return db.query(WBSTaskDB).filter(WBSTaskDB.id.in_(path_ids(task.tree_path))).order_by(WBSTaskDB.tree_depth).all()
+
+
+def subtree_ids(task: WBSTaskDB):
+    """task와 모든 하위 태스크의 id를 고르는 SELECT 문 (경로 인덱스 범위 스캔)"""
+    return select(WBSTaskDB.id).where(WBSTaskDB.project_id == task.project_id, *_in_subtree(task.tree_path))
+
+
+def subtree_dependency_ids(task: WBSTaskDB):
+    """task 하위 트리의 태스크에 걸린 선후행 관계 id를 고르는 SELECT 문"""
+    ids = subtree_ids(task)
+    return select(WBSDependencyDB.id).where(
+        or_(WBSDependencyDB.predecessor_id.in_(ids), WBSDependencyDB.successor_id.in_(ids))
+    )
+
+
+def delete_subtree(db: Session, task: WBSTaskDB) -> int:
+    """task와 모든 하위 태스크를 한 번의 DELETE로 삭제하고 삭제된 행 수를 반환합니다. (커밋은 호출자)
+
+    삭제되는 태스크에 걸린 선후행 관계도 함께 삭제합니다.
+    """
+    db.execute(
+        delete(WBSDependencyDB)
+        .where(WBSDependencyDB.id.in_(subtree_dependency_ids(task)))
+        .execution_options(synchronize_session=False)
+    )
+    result = db.execute(
+        delete(WBSTaskDB)
+        .where(WBSTaskDB.project_id == task.project_id, *_in_subtree(task.tree_path))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def assign_path(db: Session, task: WBSTaskDB, parent: Optional[WBSTaskDB] = None):
+    """새로 추가한 태스크의 경로를 채웁니다. id가 필요하므로 flush 후 호출합니다."""
+    if task.id is None:
+        db.flush()
+    task.tree_path = (parent.tree_path if parent is not None else "") + path_segment(task.sort_order, task.id)
+    task.tree_depth = (parent.tree_depth if parent is not None else 0) + 1
+
+
+def check_move(task: WBSTaskDB, parent: Optional[WBSTaskDB]):
+    """task를 parent 아래로 옮길 수 있는지 확인합니다. 다른 프로젝트이거나 순환이 생기면 InvalidMoveError."""
+    if parent is None:
+        return
+    if parent.project_id != task.project_id:
+        raise InvalidMoveError("다른 프로젝트의 태스크를 상위 태스크로 지정할 수 없습니다.")
+    if parent.tree_path.startswith(task.tree_path):
+        raise InvalidMoveError("자기 자신이나 하위 태스크를 상위 태스크로 지정할 수 없습니다.")
+
+
+def move(db: Session, task: WBSTaskDB, parent: Optional[WBSTaskDB], sort_order: Optional[int]):
+    """task의 부모/정렬 순서를 바꾸고 자신과 하위 트리 전체의 경로를 UPDATE 한 번으로 갱신합니다. (커밋은 호출자)"""
+    check_move(task, parent)
+
+    old_path = task.tree_path
+    new_path = (parent.tree_path if parent is not None else "") + path_segment(sort_order, task.id)
+    new_depth = (parent.tree_depth if parent is not None else 0) + 1
+
+    if new_path != old_path:
+        db.execute(
+            update(WBSTaskDB)
+            .where(WBSTaskDB.project_id == task.project_id, *_in_subtree(old_path))
+            .values(
+                tree_path=literal(new_path) + func.substr(WBSTaskDB.tree_path, len(old_path) + 1),
+                tree_depth=WBSTaskDB.tree_depth + (new_depth - task.tree_depth),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        # 세션에 이미 올라온 하위 태스크는 갱신된 경로를 다시 읽도록 만료
+        for instance in db.identity_map.values():
+            if isinstance(instance, WBSTaskDB) and instance is not task and (instance.tree_path or "").startswith(old_path):
+                db.expire(instance, ["tree_path", "tree_depth"])
+
+    task.parent_id = parent.id if parent is not None else None
+    task.sort_order = sort_order
+    task.tree_path = new_path
+    task.tree_depth = new_depth
+
+
+def _siblings(db: Session, project_id: int, parent: Optional[WBSTaskDB]) -> List[WBSTaskDB]:
+    parent_filter = WBSTaskDB.parent_id == parent.id if parent is not None else WBSTaskDB.parent_id.is_(None)
+    return (
+        db.query(WBSTaskDB)
+        .filter(WBSTaskDB.project_id == project_id, parent_filter)
+        .order_by(WBSTaskDB.sort_order, WBSTaskDB.id)
+        .all()
+    )
+
+
+def _key_between(lower: Optional[int], upper: Optional[int]) -> Optional[int]:
+    """두 정렬키 사이의 값. 끼워 넣을 자리가 없으면 None."""
+    if lower is None and upper is None:
+        key = 0
+    elif lower is None:
+        key = upper - SORT_KEY_GAP
+    elif upper is None:
+        key = lower + SORT_KEY_GAP
+    elif upper - lower >= 2:
+        key = (lower + upper) // 2
+    else:
+        return None
+    return key if -SORT_KEY_OFFSET <= key < SORT_KEY_OFFSET else None
+
+
+def place(
+    db: Session,
+    task: WBSTaskDB,
+    parent: Optional[WBSTaskDB],
+    after: Optional[WBSTaskDB] = None,
+    before: Optional[WBSTaskDB] = None,
+) -> List[WBSTaskDB]:
+    """task를 parent 아래 after 바로 뒤(또는 before 바로 앞, 둘 다 없으면 맨 뒤)로 옮깁니다. (커밋은 호출자)
+
+    보통은 task 하나의 정렬키만 바꾸고, 두 형제 사이에 빈 키가 없을 때만 형제 전체를 SORT_KEY_GAP 간격으로
+    다시 매깁니다. 정렬키가 바뀐 태스크 목록을 반환합니다.
+    """
+    check_move(task, parent)
+    db.flush()  # 앞서 옮긴 태스크가 형제 목록에 반영되도록 (autoflush=False)
+    siblings = [sibling for sibling in _siblings(db, task.project_id, parent) if sibling.id != task.id]
+
+    positions = {sibling.id: index for index, sibling in enumerate(siblings)}
+    for anchor in (after, before):
+        if anchor is not None and anchor.id not in positions:
+            raise InvalidMoveError("기준 태스크가 같은 상위 태스크 아래에 있지 않습니다.")
+    if after is not None and before is not None and positions[after.id] + 1 != positions[before.id]:
+        raise InvalidMoveError("after/before 태스크가 서로 이웃한 형제가 아닙니다.")
+
+    if after is not None:
+        index = positions[after.id] + 1
+    elif before is not None:
+        index = positions[before.id]
+    else:
+        index = len(siblings)
+
+    lower = (siblings[index - 1].sort_order or 0) if index > 0 else None
+    upper = (siblings[index].sort_order or 0) if index < len(siblings) else None
+    key = _key_between(lower, upper)
+    if key is not None:
+        move(db, task, parent, key)
+        return [task]
+
+    # 빈 키가 없음 → 형제 전체를 간격을 두고 다시 매김 (키가 그대로인 형제는 건드리지 않음)
+    changed = []
+    for position, sibling in enumerate(siblings[:index] + [task] + siblings[index:]):
+        sort_order = (position + 1) * SORT_KEY_GAP
+        if sibling is task or sibling.sort_order != sort_order:
+            move(db, sibling, parent, sort_order)
+            changed.append(sibling)
+    return changed
+
+
+def rebuild_paths(db: Session, project_ids: Optional[Iterable[int]] = None) -> int:
+    """parent_id 관계로부터 경로/깊이를 다시 계산합니다. (기존 데이터 채우기, 일괄 삽입 후 정리용)
+
+    부모가 존재하지 않는 태스크는 최상위로 취급합니다. 갱신한 행 수를 반환합니다. (커밋은 호출자)
+    """
+    segment = func.printf(
+        "%010d.%010d/", func.coalesce(WBSTaskDB.sort_order, 0) + SORT_KEY_OFFSET, WBSTaskDB.id, type_=String
+    )
+    parent = aliased(WBSTaskDB)
+    base = select(WBSTaskDB.id, segment.label("tree_path"), literal(1).label("tree_depth")).where(
+        or_(WBSTaskDB.parent_id.is_(None), ~exists().where(parent.id == WBSTaskDB.parent_id))
+    )
+    if project_ids is not None:
+        base = base.where(WBSTaskDB.project_id.in_(list(project_ids)))
+
+    paths = base.cte("wbs_paths", recursive=True)
+    child = aliased(WBSTaskDB)
+    child_segment = func.printf(
+        "%010d.%010d/", func.coalesce(child.sort_order, 0) + SORT_KEY_OFFSET, child.id, type_=String
+    )
+    paths = paths.union_all(
+        select(child.id, paths.c.tree_path.concat(child_segment), paths.c.tree_depth + 1)
+        .join(paths, child.parent_id == paths.c.id)
+        .where(paths.c.tree_depth < MAX_WBS_DEPTH)
+    )
+
+    rows = [
+        {"id": task_id, "tree_path": tree_path, "tree_depth": tree_depth}
+        for task_id, tree_path, tree_depth in db.execute(select(paths.c.id, paths.c.tree_path, paths.c.tree_depth))
+    ]
+    if rows:
+        db.execute(update(WBSTaskDB), rows)
+    return len(rows)
+
+
+def backfill_missing_paths(db: Session) -> int:
+    """경로가 비어 있는 태스크가 있는 프로젝트만 다시 계산하고 커밋합니다."""
+    project_ids = [row[0] for row in db.query(WBSTaskDB.project_id).filter(WBSTaskDB.tree_path.is_(None)).distinct()]
+    if not project_ids:
+        return 0
+    updated = rebuild_paths(db, project_ids)
+    db.commit()
+    return updated
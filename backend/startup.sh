@@ -43,7 +43,14 @@ except Exception as e:
 # 환경별 서버 실행
 if [ "$ENVIRONMENT" = "production" ]; then
     echo "🏭 프로덕션 모드: Gunicorn 서버 시작"
+
+    # 📈 워커별 지표 파일 디렉토리 (/metrics에서 모든 워커 값을 합산, 재시작 시 이전 값 제거)
+    export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus_multiproc}
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
     exec gunicorn main:app \
+        --config gunicorn.conf.py \
         --workers $WORKERS \
         --worker-class uvicorn.workers.UvicornWorker \
         --bind $HOST:$PORT \
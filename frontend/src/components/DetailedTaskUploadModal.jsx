@@ -6,6 +6,7 @@ const DetailedTaskUploadModal = ({ isOpen, onClose, onSuccess }) => {
   const [loading, setLoading] = useState(false);
   const [validationResult, setValidationResult] = useState(null);
   const [uploadResult, setUploadResult] = useState(null);
+  const [importJob, setImportJob] = useState(null); // 백그라운드 일괄 등록 작업 진행 상황
   const [step, setStep] = useState('select'); // 'select', 'validate', 'upload', 'result'
   const fileInputRef = useRef(null);
 
@@ -14,6 +15,7 @@ const DetailedTaskUploadModal = ({ isOpen, onClose, onSuccess }) => {
     setFile(null);
     setValidationResult(null);
     setUploadResult(null);
+    setImportJob(null);
     setStep('select');
     if (fileInputRef.current) {
       fileInputRef.current.value = '';
@@ -63,14 +65,33 @@ const DetailedTaskUploadModal = ({ isOpen, onClose, onSuccess }) => {
 
     setLoading(true);
     setStep('upload');
+    setImportJob(null);
     
     try {
-      const response = await detailedTaskAPI.importDetailedTasks(file);
-      setUploadResult(response.data);
+      const job = await detailedTaskAPI.importDetailedTasks(file, setImportJob);
+      if (job.status === 'failed') {
+        setUploadResult({
+          success: false,
+          message: job.error,
+          error: job.error
+        });
+        setStep('error');
+        return;
+      }
+
+      setUploadResult({
+        success: true,
+        data: {
+          successful_imports: job.successful_rows,
+          failed_imports: job.failed_rows,
+          total_rows: job.total_rows,
+          failed_details: job.failures
+        }
+      });
       setStep('result');
       
       // 성공 시 부모 컴포넌트에 알림
-      if (response.data.success && onSuccess) {
+      if (onSuccess) {
         onSuccess();
       }
     } catch (err) {
@@ -280,7 +301,11 @@ const DetailedTaskUploadModal = ({ isOpen, onClose, onSuccess }) => {
               <div className="text-center py-8">
                 <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-green-600 mx-auto mb-4"></div>
                 <div className="text-lg font-medium text-gray-900">파일 업로드 중...</div>
-                <div className="text-sm text-gray-500">데이터를 시스템에 등록하고 있습니다.</div>
+                <div className="text-sm text-gray-500">
+                  {importJob && importJob.total_rows > 0
+                    ? `데이터를 시스템에 등록하고 있습니다. (${importJob.processed_rows}/${importJob.total_rows}행)`
+                    : '데이터를 시스템에 등록하고 있습니다.'}
+                </div>
               </div>
             )}
 
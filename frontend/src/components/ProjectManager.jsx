@@ -21,6 +21,7 @@ const ProjectManager = () => {
   const [uploadStep, setUploadStep] = useState('select'); // select -> validate -> confirm -> result
   const [validationResult, setValidationResult] = useState(null);
   const [uploadResult, setUploadResult] = useState(null);
+  const [importJob, setImportJob] = useState(null); // 백그라운드 일괄 등록 작업 진행 상황
   const [uploadGuide, setUploadGuide] = useState(null);
 
   // 필터 및 정렬 상태
@@ -127,8 +128,14 @@ const ProjectManager = () => {
 
     try {
       setLoading(true);
-      const response = await projectAPI.importProjects(uploadFile);
-      setUploadResult(response.data);
+      setImportJob(null);
+      const job = await projectAPI.importProjects(uploadFile, setImportJob);
+      setUploadResult({
+        success: job.status === 'completed',
+        message: job.error || '파일 임포트 중 오류가 발생했습니다.',
+        imported_count: job.successful_rows,
+        error_count: job.failed_rows
+      });
       setUploadStep('result');
       loadProjects();
     } catch (error) {
@@ -656,7 +663,11 @@ const ProjectManager = () => {
                       disabled={!validationResult.valid || loading}
                       className="px-4 py-2 bg-blue-600 text-white rounded-lg hover:bg-blue-700 disabled:opacity-50 disabled:cursor-not-allowed transition-colors"
                     >
-                      {loading ? '업로드 중...' : '업로드 실행'}
+                      {loading
+                        ? importJob
+                          ? `업로드 중... (${importJob.processed_rows}/${importJob.total_rows})`
+                          : '업로드 중...'
+                        : '업로드 실행'}
                     </button>
                   </div>
                 </div>
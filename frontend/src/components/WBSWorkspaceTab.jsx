@@ -195,7 +195,8 @@ const WBSWorkspaceTab = ({ project }) => {
             if (draggedId === dropTargetTask.id) return;
 
             try {
-                await wbsTaskAPI.updateTask(draggedId, { parent_id: dropTargetTask.id });
+                // 대상 업무의 마지막 하위 업무로 이동 (정렬키는 서버에서 배정)
+                await wbsTaskAPI.bulkMove([{ task_id: draggedId, parent_id: dropTargetTask.id }]);
                 fetchTasks();
             } catch (err) {
                 console.error("Drag drop error:", err);
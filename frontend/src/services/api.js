@@ -13,10 +13,29 @@ const api = axios.create({
 
 // WBS 태스크 API 함수들
 export const wbsTaskAPI = {
-  getTasks: (projectId) => api.get(`/wbs-tasks/${projectId}`),
+  // params: { root, depth } 부분 트리 / { from, to } 간트 차트에 보이는 기간만
+  getTasks: (projectId, params = {}) => api.get(`/wbs-tasks/${projectId}`, { params }),
   createTask: (taskData) => api.post('/wbs-tasks/', taskData),
   updateTask: (taskId, taskData) => api.put(`/wbs-tasks/${taskId}`, taskData),
   deleteTask: (taskId) => api.delete(`/wbs-tasks/${taskId}`),
+  // moves: [{ task_id, parent_id, after_id, before_id }] 여러 태스크 이동/순서 변경을 한 번에 (한 트랜잭션)
+  bulkMove: (moves) => api.post('/wbs-tasks/bulk-move', { moves }),
+};
+
+// 파일 일괄 등록 백그라운드 작업 API 함수들
+export const importJobAPI = {
+  // { job_id, status, total_rows, processed_rows, successful_rows, failed_rows, failures, error }
+  getJob: (jobId) => api.get(`/import-jobs/${jobId}`),
+
+  // 작업이 끝날 때까지(completed/failed) 상태를 조회해 마지막 상태를 반환합니다. onProgress(job)로 진행 상황 전달
+  waitForJob: async (jobId, onProgress, intervalMs = 1000) => {
+    for (;;) {
+      const { data: job } = await importJobAPI.getJob(jobId);
+      if (onProgress) onProgress(job);
+      if (job.status === 'completed' || job.status === 'failed') return job;
+      await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    }
+  },
 };
 
 // 프로젝트 관리 API 함수들
@@ -71,15 +90,17 @@ export const projectAPI = {
     });
   },
   
-  // 프로젝트 일괄 등록
-  importProjects: (file) => {
+  // 프로젝트 일괄 등록 (백그라운드 작업으로 접수 후 완료될 때까지 상태 조회, 완료된 작업 상태를 반환)
+  importProjects: async (file, onProgress) => {
     const formData = new FormData();
     formData.append('file', file);
-    return api.post('/projects/upload/import', formData, {
+    const response = await api.post('/projects/upload/import', formData, {
+      params: { background: true },
       headers: {
         'Content-Type': 'multipart/form-data',
       },
     });
+    return importJobAPI.waitForJob(response.data.data.job_id, onProgress);
   },
   
   // 템플릿 다운로드 URL 생성
@@ -209,15 +230,17 @@ export const detailedTaskAPI = {
     });
   },
   
-  // 상세 업무 일괄 등록
-  importDetailedTasks: (file) => {
+  // 상세 업무 일괄 등록 (백그라운드 작업으로 접수 후 완료될 때까지 상태 조회, 완료된 작업 상태를 반환)
+  importDetailedTasks: async (file, onProgress) => {
     const formData = new FormData();
     formData.append('file', file);
-    return api.post('/detailed-tasks/upload/import', formData, {
+    const response = await api.post('/detailed-tasks/upload/import', formData, {
+      params: { background: true },
       headers: {
         'Content-Type': 'multipart/form-data',
       },
     });
+    return importJobAPI.waitForJob(response.data.data.job_id, onProgress);
   },
   
   // 템플릿 가이드 정보 조회
@@ -251,6 +274,36 @@ export const exportAPI = {
   },
 };
 
+// 변경 이벤트 구독 (Server-Sent Events) / 변경분 동기화
+export const changesAPI = {
+  // 전체 목록을 받기 전에 현재 버전을 받아 두고, 다음에는 getChanges(version)으로 바뀐 것만 받음
+  getVersion: () => api.get('/changes/version'),
+  // { version, has_more, [entity]: { upserted: [...], deleted: [id] } } / 410이면 전체 재조회
+  getChanges: (since, params = {}) => api.get('/changes/', { params: { since, ...params } }),
+  // filters: { entities: 'wbs_task,wbs_dependency', project_id }
+  // onChange(event): { id, entity, action, entity_id, project_id, at }
+  // onReset(): 끊긴 동안의 변경을 이어받을 수 없을 때 → 화면 데이터 다시 조회
+  // 재접속과 Last-Event-ID 전송은 브라우저 EventSource가 자동으로 처리합니다. 반환값.close()로 구독 해제
+  subscribe: (filters = {}, onChange, onReset) => {
+    const params = new URLSearchParams();
+    Object.entries(filters).forEach(([key, value]) => {
+      if (value !== undefined && value !== null && value !== '') params.append(key, value);
+    });
+    const source = new EventSource(`${API_BASE_URL}/changes/stream?${params.toString()}`);
+    source.onmessage = (event) => onChange(JSON.parse(event.data));
+    if (onReset) source.addEventListener('reset', () => onReset());
+    return source;
+  },
+};
+
+// 전문 검색 API 함수들
+export const searchAPI = {
+  // params: { types: 'weekly_report,detailed_task', project, limit } / snippet의 일치 부분은 <mark>로 표시
+  search: (q, params = {}) => api.get('/search/', { params: { q, ...params } }),
+  // kind: 'project' | 'manager' | 'stage' | 'assignee' / params: { limit, fuzzy }
+  typeahead: (kind, q = '', params = {}) => api.get(`/search/typeahead/${kind}`, { params: { q, ...params } }),
+};
+
 // 유틸리티 함수들
 export const utilsAPI = {
   // 정확한 주차 계산 (ISO 8601 기준)